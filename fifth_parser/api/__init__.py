@@ -1,13 +1,25 @@
-"""Expose API view modules.
+"""Discover API view modules.
 
-Import and make available all view modules within the api package.
+View modules of all api subpackages are imported on demand, when the
+application is built, so importing the package itself stays cheap.
 """
 
 from importlib import import_module
 from pkgutil import iter_modules
 
-__all__ = [
-    import_module(f"{__name__}.{module.name}.views").__name__
-    for module in iter_modules(__path__)
-    if module.ispkg
-]
+
+def import_all_views() -> list[str]:
+    """Import view modules of all api subpackages.
+
+    Importing a view module registers its endpoints on the routers from
+    ``fifth_parser.api.urls``.
+
+    Returns:
+        list[str]: Names of the imported view modules.
+
+    """
+    return [
+        import_module(f"{__name__}.{module.name}.views").__name__
+        for module in iter_modules(__path__)
+        if module.ispkg
+    ]
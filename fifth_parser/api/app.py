@@ -1,22 +1,40 @@
-"""Define FastAPI application, with Redis for caching on app's startup.
+"""Define FastAPI application, with a cache backend set up on app's startup.
 
 This module contains the FastAPI application definition with including of all
-routes and the Redis client for caching endpoints on startup.
+routes and the cache backend for caching endpoints on startup, Redis or a
+local one, depending on settings. The most common dynamics queries are
+preloaded into the cache in the background. If scheduled ingest is enabled,
+the parser also runs in the background of the server and preloads them
+again after every run.
 """
 
+from asyncio import Task, create_task
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 from fastapi import FastAPI
 from fastapi_cache import FastAPICache
-from redis.asyncio.client import Redis
 
-# import all view modules from the api subpackages, not via * cuz it cause a
-# weird error with wrong path, I tried to fix it, but it didn't work so __all__
-from fifth_parser.api import __all__ as all_views  # noqa: F401
-from fifth_parser.api.custom_logs import LoggingRedisBackend
-from fifth_parser.config import get_redis_url, get_settings
+from fifth_parser.api import import_all_views
+from fifth_parser.api.cache_backends import create_cache_backend
+from fifth_parser.api.compression import (
+    CompressionMiddleware,
+    get_compressed_body_cache,
+)
+from fifth_parser.api.conditional import (
+    ConditionalRequestMiddleware,
+    generation_key_builder,
+    get_dataset_generation,
+)
+from fifth_parser.config import get_settings
+from fifth_parser.db import DBManager, get_db_manager
+
+from .trades.views import warm_up_dynamics_cache
+from .urls import ALL_ROUTERS, trades
 
-from .urls import ALL_ROUTERS
+if TYPE_CHECKING:
+    from fastapi_cache.backends import Backend
 
 
 @asynccontextmanager
@@ -27,12 +45,35 @@ async def startup(_: FastAPI) -> AbstractAsyncContextManager:
         AsyncContextManager: Async context manager.
 
     """
-    redis: Redis = Redis.from_url(get_redis_url())
-    FastAPICache.init(LoggingRedisBackend(redis), prefix="cache")
+    db_manager: DBManager = get_db_manager()
+    cache_backend: Backend = create_cache_backend()
+    FastAPICache.init(
+        cache_backend,
+        prefix="cache",
+        key_builder=generation_key_builder,
+    )
+    cache_warmup: Task = create_task(warm_up_dynamics_cache())
+    scheduled_ingest: Task | None = None
+    if get_settings().INGEST_SCHEDULE_INTERVAL:
+        # imported only when enabled, the parser isn't needed for serving
+        ingest = import_module("fifth_parser.ingest")
+        scheduled_ingest = create_task(
+            ingest.run_scheduled_ingest(
+                get_settings().INGEST_SCHEDULE_INTERVAL,
+                on_run_finished=warm_up_dynamics_cache,
+            ),
+        )
     try:
         yield
     finally:
-        await redis.close()
+        cache_warmup.cancel()
+        if scheduled_ingest is not None:
+            scheduled_ingest.cancel()
+        await cache_backend.close()
+        await db_manager.dispose()
+        get_db_manager.cache_clear()
+        get_dataset_generation.cache_clear()
+        get_compressed_body_cache.cache_clear()
 
 
 app = FastAPI(
@@ -47,5 +88,9 @@ app = FastAPI(
     },
 )
 
+import_all_views()
 for router in ALL_ROUTERS:
     app.include_router(router)
+# the last added middleware is the outermost one, compression needs the ETag
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ConditionalRequestMiddleware, paths=(trades.prefix,))
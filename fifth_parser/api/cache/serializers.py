@@ -0,0 +1,28 @@
+"""Define serializers for metrics of the API cache."""
+
+from pydantic import BaseModel
+
+
+class RedisPoolSerializer(BaseModel):
+    """Represent metrics of the Redis connection pool of a process.
+
+    Attributes:
+        max_connections: Maximum number of connections in the pool.
+        created_connections: Number of connections opened by the pool.
+        in_use_connections: Number of connections currently in use.
+        idle_connections: Number of opened connections waiting for use.
+        acquired: Number of connections acquired from the pool.
+        acquire_time_avg: Average seconds spent acquiring a connection.
+        acquire_time_max: Longest acquiring of a connection in seconds.
+        parser: Name of the parser of Redis replies.
+
+    """
+
+    max_connections: int
+    created_connections: int
+    in_use_connections: int
+    idle_connections: int
+    acquired: int
+    acquire_time_avg: float
+    acquire_time_max: float
+    parser: str
@@ -0,0 +1,37 @@
+"""Define API endpoints for monitoring of the API cache."""
+
+from fastapi import HTTPException, status
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+
+from fifth_parser.api.urls import cache_metrics
+
+from .serializers import RedisPoolSerializer
+
+
+@cache_metrics.get(
+    "/pool",
+    response_model=RedisPoolSerializer,
+    summary="Metrics of the Redis connection pool",
+    description="Returns size and usage of the Redis connection pool of the "
+    "worker process which served the request. Not found if the cache "
+    "backend isn't Redis.",
+    name="get_redis_pool_metrics",
+)
+async def get_redis_pool_metrics() -> RedisPoolSerializer:
+    """Get metrics of the Redis connection pool.
+
+    Returns:
+        RedisPoolSerializer: Serialized metrics of the pool.
+
+    Raises:
+        HTTPException: If the cache backend isn't Redis.
+
+    """
+    backend = FastAPICache.get_backend()
+    if not isinstance(backend, RedisBackend):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Cache backend has no Redis connection pool.",
+        )
+    return RedisPoolSerializer(**backend.redis.connection_pool.metrics())
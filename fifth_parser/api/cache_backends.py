@@ -0,0 +1,447 @@
+"""Provide cache backends of the API which don't need a Redis server.
+
+The backend is selected with the ``CACHE_BACKEND`` setting:
+
+- ``redis``: Redis server, shared by all hosts;
+- ``memory``: memory of the worker process, with TTL and LRU eviction under
+  a cap on the total size of values;
+- ``sqlite``: SQLite database file, shared by worker processes of a host.
+
+All backends support the same operations as ``LoggingRedisBackend``,
+including multi-key ones, and can be closed on shutdown.
+"""
+
+import sqlite3
+from asyncio import to_thread
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from math import ceil
+from pathlib import Path
+from threading import Lock
+from time import monotonic, time
+
+from fastapi_cache.backends import Backend
+
+from fifth_parser.api.custom_logs import LoggingRedisBackend
+from fifth_parser.api.redis_pool import create_redis_client
+from fifth_parser.config import CacheBackendType, get_settings
+
+
+class MemoryBackend(Backend):
+    """Cache values in memory of the process.
+
+    Expired entries are dropped when they are read, or evicted as the least
+    recently used ones when the total size of values exceeds the limit.
+    The backend is used from the event loop only, so it needs no locks.
+
+    Attributes:
+        max_size: Maximum total size of cached values in bytes.
+        size: Current total size of cached values in bytes.
+
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum total size of cached values in bytes.
+
+        """
+        self.max_size: int = max_size
+        self.size: int = 0
+        # values with monotonic time of their expiration
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = (
+            OrderedDict()
+        )
+
+    def _get_entry(self, key: str) -> tuple[bytes, float | None] | None:
+        """Get a not expired entry and mark it as recently used.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            tuple[bytes, float | None] | None: Value and its expiration
+                time, or None if there is no such entry.
+
+        """
+        entry: tuple[bytes, float | None] | None = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= monotonic():
+            self._delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _delete(self, key: str) -> bool:
+        """Delete an entry.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            bool: Whether the entry existed.
+
+        """
+        entry: tuple[bytes, float | None] | None = self._entries.pop(
+            key,
+            None,
+        )
+        if entry is None:
+            return False
+        self.size -= len(entry[0])
+        return True
+
+    def _set(self, key: str, value: bytes, expire: int | None) -> None:
+        """Set an entry, evicting the least recently used ones.
+
+        Args:
+            key: Key of the entry.
+            value: Value of the entry.
+            expire: Seconds after which the entry expires.
+
+        """
+        self._delete(key)
+        if len(value) > self.max_size:
+            return
+        self._entries[key] = (value, monotonic() + expire if expire else None)
+        self.size += len(value)
+        while self.size > self.max_size:
+            _, (evicted_value, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted_value)
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        """Get the value of a key with its remaining time to live.
+
+        Args:
+            key: Key of the cache entry.
+
+        Returns:
+            tuple[int, bytes | None]: Seconds to live, -1 if the entry
+                doesn't expire, and the value, None for a missing entry.
+
+        """
+        entry: tuple[bytes, float | None] | None = self._get_entry(key)
+        if entry is None:
+            return 0, None
+        value, expires_at = entry
+        if expires_at is None:
+            return -1, value
+        return ceil(expires_at - monotonic()), value
+
+    async def get(self, key: str) -> bytes | None:
+        """Get the value of a key.
+
+        Args:
+            key: Key of the cache entry.
+
+        Returns:
+            bytes | None: Value, None for a missing entry.
+
+        """
+        entry: tuple[bytes, float | None] | None = self._get_entry(key)
+        return entry[0] if entry is not None else None
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get values of several keys.
+
+        Args:
+            keys: Keys of the cache entries.
+
+        Returns:
+            list[bytes | None]: Values in the order of keys, None for
+                missing entries.
+
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        expire: int | None = None,
+    ) -> None:
+        """Set the value of a key.
+
+        Args:
+            key: Key of the cache entry.
+            value: Value of the cache entry.
+            expire: Seconds after which the entry expires.
+
+        """
+        self._set(key, value, expire)
+
+    async def set_many(
+        self,
+        items: Mapping[str, bytes],
+        expire: int | None = None,
+    ) -> None:
+        """Set values of several keys.
+
+        Args:
+            items: Values of the cache entries by their keys.
+            expire: Seconds after which the entries expire.
+
+        """
+        for key, value in items.items():
+            self._set(key, value, expire)
+
+    async def clear(
+        self,
+        namespace: str | None = None,
+        key: str | None = None,
+    ) -> int:
+        """Delete all entries of a namespace or a single entry.
+
+        Args:
+            namespace: Prefix of keys of the entries.
+            key: Key of the entry, used if there is no namespace.
+
+        Returns:
+            int: Number of deleted entries.
+
+        """
+        if namespace:
+            keys: list[str] = [
+                entry_key
+                for entry_key in self._entries
+                if entry_key.startswith(f"{namespace}:")
+            ]
+            for entry_key in keys:
+                self._delete(entry_key)
+            return len(keys)
+        if key:
+            return int(self._delete(key))
+        return 0
+
+    async def close(self) -> None:
+        """Delete all entries."""
+        self._entries.clear()
+        self.size = 0
+
+
+class SQLiteBackend(Backend):
+    """Cache values in a SQLite database shared by processes of a host.
+
+    The database is in WAL mode, so readers of all worker processes don't
+    block each other and a writer. Queries run in a thread, so the event
+    loop isn't blocked while SQLite waits for a lock of another process.
+    Expired entries are not returned and are deleted periodically.
+
+    Attributes:
+        path: Path of the database file.
+
+    """
+
+    PURGE_INTERVAL: int = 1000
+
+    def __init__(self, path: Path) -> None:
+        """Open the database and create the cache table if needed.
+
+        Args:
+            path: Path of the database file.
+
+        """
+        self.path: Path = path
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            timeout=5,
+            check_same_thread=False,
+        )
+        # the connection is used by threads of the default executor
+        self._lock: Lock = Lock()
+        self._writes: int = 0
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)",
+            )
+
+    def _select(self, keys: Sequence[str]) -> dict[str, tuple]:
+        """Select not expired entries.
+
+        Args:
+            keys: Keys of the cache entries.
+
+        Returns:
+            dict[str, tuple]: Values and Unix time of their expiration by
+                their keys.
+
+        """
+        # only placeholders of the keys are put into the query
+        placeholders: str = ", ".join("?" * len(keys))
+        query: str = (
+            "SELECT key, value, expires_at FROM cache "  # noqa: S608
+            f"WHERE key IN ({placeholders}) "
+            "AND (expires_at IS NULL OR expires_at > ?)"
+        )
+        with self._lock:
+            rows: list[tuple] = self._connection.execute(
+                query,
+                (*keys, time()),
+            ).fetchall()
+        return {key: (value, expires_at) for key, value, expires_at in rows}
+
+    def _insert(self, items: Mapping[str, bytes], expire: int | None) -> None:
+        """Insert or replace entries and delete expired ones periodically.
+
+        Args:
+            items: Values of the cache entries by their keys.
+            expire: Seconds after which the entries expire.
+
+        """
+        expires_at: float | None = time() + expire if expire else None
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()],
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_INTERVAL == 0:
+                self._connection.execute(
+                    "DELETE FROM cache WHERE expires_at <= ?",
+                    (time(),),
+                )
+
+    def _delete(self, namespace: str | None, key: str | None) -> int:
+        """Delete all entries of a namespace or a single entry.
+
+        Args:
+            namespace: Prefix of keys of the entries.
+            key: Key of the entry, used if there is no namespace.
+
+        Returns:
+            int: Number of deleted entries.
+
+        """
+        with self._lock, self._connection:
+            if namespace:
+                prefix: str = f"{namespace}:"
+                return self._connection.execute(
+                    "DELETE FROM cache WHERE substr(key, 1, ?) = ?",
+                    (len(prefix), prefix),
+                ).rowcount
+            if key:
+                return self._connection.execute(
+                    "DELETE FROM cache WHERE key = ?",
+                    (key,),
+                ).rowcount
+        return 0
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        """Get the value of a key with its remaining time to live.
+
+        Args:
+            key: Key of the cache entry.
+
+        Returns:
+            tuple[int, bytes | None]: Seconds to live, -1 if the entry
+                doesn't expire, and the value, None for a missing entry.
+
+        """
+        entries: dict[str, tuple] = await to_thread(self._select, [key])
+        if key not in entries:
+            return 0, None
+        value, expires_at = entries[key]
+        if expires_at is None:
+            return -1, value
+        return ceil(expires_at - time()), value
+
+    async def get(self, key: str) -> bytes | None:
+        """Get the value of a key.
+
+        Args:
+            key: Key of the cache entry.
+
+        Returns:
+            bytes | None: Value, None for a missing entry.
+
+        """
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get values of several keys with a single query.
+
+        Args:
+            keys: Keys of the cache entries.
+
+        Returns:
+            list[bytes | None]: Values in the order of keys, None for
+                missing entries.
+
+        """
+        if not keys:
+            return []
+        entries: dict[str, tuple] = await to_thread(self._select, keys)
+        return [entries[key][0] if key in entries else None for key in keys]
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        expire: int | None = None,
+    ) -> None:
+        """Set the value of a key.
+
+        Args:
+            key: Key of the cache entry.
+            value: Value of the cache entry.
+            expire: Seconds after which the entry expires.
+
+        """
+        await self.set_many({key: value}, expire)
+
+    async def set_many(
+        self,
+        items: Mapping[str, bytes],
+        expire: int | None = None,
+    ) -> None:
+        """Set values of several keys in a single transaction.
+
+        Args:
+            items: Values of the cache entries by their keys.
+            expire: Seconds after which the entries expire.
+
+        """
+        if items:
+            await to_thread(self._insert, items, expire)
+
+    async def clear(
+        self,
+        namespace: str | None = None,
+        key: str | None = None,
+    ) -> int:
+        """Delete all entries of a namespace or a single entry.
+
+        Args:
+            namespace: Prefix of keys of the entries.
+            key: Key of the entry, used if there is no namespace.
+
+        Returns:
+            int: Number of deleted entries.
+
+        """
+        return await to_thread(self._delete, namespace, key)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def create_cache_backend() -> Backend:
+    """Create the cache backend selected in settings.
+
+    Returns:
+        Backend: Cache backend for FastAPICache, it has to be closed on
+            shutdown.
+
+    """
+    if get_settings().CACHE_BACKEND is CacheBackendType.MEMORY:
+        return MemoryBackend(get_settings().CACHE_MEMORY_MAX_SIZE)
+    if get_settings().CACHE_BACKEND is CacheBackendType.SQLITE:
+        return SQLiteBackend(get_settings().CACHE_SQLITE_PATH)
+    return LoggingRedisBackend(create_redis_client())
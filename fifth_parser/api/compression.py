@@ -0,0 +1,268 @@
+"""Compress JSON responses of the API with Brotli or gzip.
+
+Trades payloads are large and very repetitive, so they shrink severalfold.
+Responses smaller than ``COMPRESSION_MINIMUM_SIZE`` are sent as is. Bodies of
+responses with an ETag (set by the conditional request middleware) are
+compressed once and kept in a bounded in-process cache, so repeated requests
+get pre-compressed bytes without calling the endpoint again. Bodies larger
+than ``COMPRESSION_THREAD_MIN_SIZE`` are compressed in a worker thread, so
+they don't block the event loop. Brotli is used if the ``brotli`` package
+is installed, gzip otherwise.
+"""
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from gzip import compress as gzip_compress
+from threading import Lock
+
+from anyio.to_thread import run_sync
+from fastapi import Request, Response, status
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from fifth_parser.api.conditional import ETAG_SCOPE_KEY
+from fifth_parser.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# preferred encodings go first
+SUPPORTED_ENCODINGS: tuple[str, ...] = (
+    ("br", "gzip") if brotli is not None else ("gzip",)
+)
+
+
+def compress(body: bytes, encoding: str, level: int | None = None) -> bytes:
+    """Compress a response body.
+
+    Args:
+        body: Response body.
+        encoding: Content encoding, one of SUPPORTED_ENCODINGS.
+        level: Compression level (quality for Brotli), defaults to the
+            level from settings.
+
+    Returns:
+        bytes: Compressed body.
+
+    """
+    if encoding == "br":
+        return brotli.compress(
+            body,
+            mode=brotli.MODE_TEXT,
+            quality=level or get_settings().COMPRESSION_BROTLI_QUALITY,
+        )
+    return gzip_compress(
+        body,
+        compresslevel=level or get_settings().COMPRESSION_LEVEL,
+    )
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Choose the preferred supported encoding accepted by the client.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header.
+
+    Returns:
+        str | None: Content encoding, or None if the client doesn't accept
+            any supported one.
+
+    """
+    accepted: set[str] = set()
+    for coding in accept_encoding.lower().split(","):
+        name, _, parameters = coding.strip().partition(";")
+        # "q=0" means the coding is not acceptable
+        if parameters.replace(" ", "") not in {"q=0", "q=0.0", "q=0.00"}:
+            accepted.add(name.strip())
+    return next(
+        (
+            encoding
+            for encoding in SUPPORTED_ENCODINGS
+            if encoding in accepted or "*" in accepted
+        ),
+        None,
+    )
+
+
+class CompressedBodyCache:
+    """Keep compressed bodies of the most recent responses.
+
+    Attributes:
+        max_size: Maximum total size of cached bodies in bytes.
+        size: Current total size of cached bodies in bytes.
+
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum total size of cached bodies in bytes.
+
+        """
+        self.max_size: int = max_size
+        self.size: int = 0
+        self._bodies: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def get(self, etag: str, encoding: str) -> bytes | None:
+        """Get the compressed body of a response.
+
+        Args:
+            etag: Strong ETag of the uncompressed response.
+            encoding: Content encoding of the body.
+
+        Returns:
+            bytes | None: Compressed body, or None if it isn't cached.
+
+        """
+        with self._lock:
+            body: bytes | None = self._bodies.get((etag, encoding))
+            if body is not None:
+                self._bodies.move_to_end((etag, encoding))
+            return body
+
+    def set(self, etag: str, encoding: str, body: bytes) -> None:
+        """Cache the compressed body, evicting the least recently used.
+
+        Args:
+            etag: Strong ETag of the uncompressed response.
+            encoding: Content encoding of the body.
+            body: Compressed body.
+
+        """
+        if len(body) > self.max_size:
+            return
+        with self._lock:
+            previous_body: bytes | None = self._bodies.pop(
+                (etag, encoding),
+                None,
+            )
+            if previous_body is not None:
+                self.size -= len(previous_body)
+            self._bodies[etag, encoding] = body
+            self.size += len(body)
+            while self.size > self.max_size:
+                _, evicted_body = self._bodies.popitem(last=False)
+                self.size -= len(evicted_body)
+
+    def clear(self) -> None:
+        """Remove all cached bodies."""
+        with self._lock:
+            self._bodies.clear()
+            self.size = 0
+
+
+@lru_cache
+def get_compressed_body_cache() -> CompressedBodyCache:
+    """Return cache of compressed bodies shared by the whole process.
+
+    Returns:
+        CompressedBodyCache: Cache of compressed response bodies.
+
+    """
+    return CompressedBodyCache(get_settings().COMPRESSION_CACHE_MAX_SIZE)
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compress JSON responses, reusing cached compressed bodies.
+
+    Must be added before the conditional request middleware, so it runs
+    inside of it and gets the ETag of the request.
+    """
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """Serve a compressed response if the client accepts it.
+
+        Args:
+            request: Incoming request.
+            call_next: Function calling the next ASGI application.
+
+        Returns:
+            Response: Compressed response, or the response of the endpoint
+                as is.
+
+        """
+        encoding: str | None = choose_encoding(
+            request.headers.get("accept-encoding", ""),
+        )
+        if encoding is None:
+            return await call_next(request)
+
+        etag: str | None = request.scope.get(ETAG_SCOPE_KEY)
+        if etag is not None:
+            cached_body: bytes | None = get_compressed_body_cache().get(
+                etag,
+                encoding,
+            )
+            if cached_body is not None:
+                return self._compressed_response(
+                    cached_body,
+                    encoding,
+                    status.HTTP_200_OK,
+                    MutableHeaders({"Content-Type": "application/json"}),
+                )
+
+        response: Response = await call_next(request)
+        if (
+            response.status_code != status.HTTP_200_OK
+            or "content-encoding" in response.headers
+            or not response.headers.get("content-type", "").startswith(
+                "application/json",
+            )
+        ):
+            return response
+
+        body: bytes = b"".join(
+            [chunk async for chunk in response.body_iterator],
+        )
+        if len(body) < get_settings().COMPRESSION_MINIMUM_SIZE:
+            return Response(
+                body,
+                status_code=response.status_code,
+                headers=response.headers,
+            )
+        compressed_body: bytes = (
+            await run_sync(compress, body, encoding)
+            if len(body) >= get_settings().COMPRESSION_THREAD_MIN_SIZE
+            else compress(body, encoding)
+        )
+        if etag is not None:
+            get_compressed_body_cache().set(etag, encoding, compressed_body)
+        return self._compressed_response(
+            compressed_body,
+            encoding,
+            response.status_code,
+            MutableHeaders(raw=response.headers.raw),
+        )
+
+    @staticmethod
+    def _compressed_response(
+        body: bytes,
+        encoding: str,
+        status_code: int,
+        headers: MutableHeaders,
+    ) -> Response:
+        """Build a response with a compressed body.
+
+        Args:
+            body: Compressed body.
+            encoding: Content encoding of the body.
+            status_code: Status code of the response.
+            headers: Headers of the uncompressed response.
+
+        Returns:
+            Response: Response with Content-Encoding and Vary headers.
+
+        """
+        del headers["content-length"]
+        headers["Content-Encoding"] = encoding
+        headers.add_vary_header("Accept-Encoding")
+        return Response(body, status_code=status_code, headers=headers)
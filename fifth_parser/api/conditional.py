@@ -0,0 +1,224 @@
+"""Support HTTP conditional requests with ETags of the dataset generation.
+
+The dataset generation is the last loaded trading day with the number of
+stored rows, it changes only when the ingest loads new data. ETags of
+responses are derived from the generation and the query, so a request with
+a matching ``If-None-Match`` gets ``304 Not Modified`` without touching
+Redis or Postgres. The generation is kept in memory of the process and
+refreshed from the calendar of trading days at most once per
+``DATASET_GENERATION_TTL`` seconds, or as soon as the scheduled ingest of the
+same process writes new data.
+"""
+
+from asyncio import Lock
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from hashlib import blake2b
+from time import monotonic
+
+from fastapi import Request, Response, status
+from fastapi_cache import default_key_builder
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+from fifth_parser.api.utils import calculate_cache_time
+from fifth_parser.config import get_settings
+from fifth_parser.db import get_db_manager
+
+# key of the request scope with the ETag of the response
+ETAG_SCOPE_KEY = "etag"
+
+
+class DatasetGeneration:
+    """Keep the last known dataset generation of the process."""
+
+    def __init__(self) -> None:
+        """Initialize the generation as expired."""
+        self._value: str | None = None
+        self._expires_at: float = 0.0
+        self._lock: Lock = Lock()
+
+    async def get(self) -> str:
+        """Get the dataset generation, refreshing it if it's expired.
+
+        Returns:
+            str: Generation in form of "<last trading day>:<rows count>".
+
+        """
+        if self._value is None or monotonic() >= self._expires_at:
+            async with self._lock:
+                # another request could refresh it while we were waiting
+                if self._value is None or monotonic() >= self._expires_at:
+                    totals = await get_db_manager().get_trading_days_totals()
+                    self._value = (
+                        f"{totals['last_date']}:{totals['rows_count']}"
+                    )
+                    self._expires_at = (
+                        monotonic() + get_settings().DATASET_GENERATION_TTL
+                    )
+        return self._value
+
+    def invalidate(self) -> None:
+        """Expire the generation, so it's refreshed on the next request."""
+        self._expires_at = 0.0
+
+
+@lru_cache
+def get_dataset_generation() -> DatasetGeneration:
+    """Return dataset generation shared by the whole process.
+
+    Returns:
+        DatasetGeneration: Dataset generation of the process.
+
+    """
+    return DatasetGeneration()
+
+
+async def generation_key_builder(
+    func: Callable,
+    namespace: str = "",
+    *,
+    request: Request | None = None,
+    response: Response | None = None,
+    args: tuple,
+    kwargs: dict,
+) -> str:
+    """Build a cache key which changes with the dataset generation.
+
+    Cached responses of an old generation are not served after the ingest
+    loads new data, so a cached body always matches its ETag.
+
+    Args:
+        func: Cached endpoint function.
+        namespace: Namespace of the cache key.
+        request: Request to the endpoint.
+        response: Response of the endpoint.
+        args: Positional arguments of the endpoint.
+        kwargs: Keyword arguments of the endpoint.
+
+    Returns:
+        str: Cache key of the response.
+
+    """
+    cache_key: str = default_key_builder(
+        func,
+        namespace,
+        request=request,
+        response=response,
+        args=args,
+        kwargs=kwargs,
+    )
+    return f"{cache_key}:{await get_dataset_generation().get()}"
+
+
+def build_etag(generation: str, request: Request) -> str:
+    """Build a strong ETag of the response to a request.
+
+    Args:
+        generation: Current dataset generation.
+        request: Request to the endpoint.
+
+    Returns:
+        str: Quoted ETag of the generation, path and query parameters.
+
+    """
+    query: str = "&".join(
+        f"{name}={value}"
+        for name, value in sorted(request.query_params.multi_items())
+    )
+    digest: str = blake2b(
+        f"{generation}|{request.url.path}|{query}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check if an ETag matches the If-None-Match header.
+
+    Args:
+        etag: Quoted ETag of the response.
+        if_none_match: Value of the If-None-Match header.
+
+    Returns:
+        bool: True if the header contains the ETag or "*". Comparison is
+            weak, as required for If-None-Match.
+
+    """
+    client_etags: set[str] = {
+        client_etag.strip().removeprefix("W/")
+        for client_etag in if_none_match.split(",")
+    }
+    return "*" in client_etags or etag in client_etags
+
+
+class ConditionalRequestMiddleware(BaseHTTPMiddleware):
+    """Answer conditional GET requests to the given paths with ETags.
+
+    Attributes:
+        paths: Path prefixes of endpoints which support conditional
+            requests.
+
+    """
+
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...]) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+            paths: Path prefixes of endpoints which support conditional
+                requests.
+
+        """
+        super().__init__(app)
+        self.paths: tuple[str, ...] = paths
+
+    async def dispatch(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """Return 304 if the client has the current response already.
+
+        Args:
+            request: Incoming request.
+            call_next: Function calling the next ASGI application.
+
+        Returns:
+            Response: Empty 304 response or the response of the endpoint
+                with ETag and Cache-Control headers.
+
+        """
+        if request.method not in {"GET", "HEAD"} or not (
+            request.url.path.startswith(self.paths)
+        ):
+            return await call_next(request)
+
+        etag: str = build_etag(
+            await get_dataset_generation().get(),
+            request,
+        )
+        # new data are published with the daily bulletin
+        headers: dict[str, str] = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={calculate_cache_time()}",
+        }
+        # inner middlewares, e.g. compression, can cache by the ETag, it's
+        # kept in the scope of the request, because the state can be shared
+        # by requests
+        request.scope[ETAG_SCOPE_KEY] = etag
+        if_none_match: str | None = request.headers.get("if-none-match")
+        if if_none_match is not None and etag_matches(etag, if_none_match):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=headers,
+            )
+
+        response: Response = await call_next(request)
+        if response.status_code == status.HTTP_200_OK:
+            if "content-encoding" in response.headers:
+                # the compressed representation isn't byte-identical, but
+                # it's semantically equivalent, so it gets the weak ETag
+                headers["ETag"] = f"W/{etag}"
+            response.headers.update(headers)
+        return response
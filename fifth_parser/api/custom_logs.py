@@ -4,10 +4,12 @@ Extends the standard RedisBackend to add logging functionality for cache
 operations.
 
 Logs all method calls with their arguments for debugging and monitoring
-purposes.
+purposes. Also adds multi-key operations, which read or write many cache
+entries in a single round trip to Redis.
 """
 
 import logging
+from collections.abc import Mapping, Sequence
 from functools import wraps
 from typing import Any
 
@@ -36,7 +38,8 @@ class LoggingRedisBackend(RedisBackend):
 
         """
         attr_or_method = super().__getattribute__(attr_name)
-        if callable(attr_or_method):
+        # special attributes like __class__ are used by isinstance checks
+        if callable(attr_or_method) and not attr_name.startswith("__"):
 
             @wraps(attr_or_method)
             async def wrapper(*args: list, **kwargs: dict) -> Any:
@@ -55,3 +58,42 @@ class LoggingRedisBackend(RedisBackend):
 
             return wrapper
         return attr_or_method
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        """Get values of several keys in a single round trip.
+
+        Args:
+            keys: Keys of the cache entries.
+
+        Returns:
+            list[bytes | None]: Values in the order of keys, None for
+                missing entries.
+
+        """
+        if not keys:
+            return []
+        return await self.redis.mget(keys)
+
+    async def set_many(
+        self,
+        items: Mapping[str, bytes],
+        expire: int | None = None,
+    ) -> None:
+        """Set several keys in a single round trip.
+
+        Args:
+            items: Values of the cache entries by their keys.
+            expire: Seconds after which the entries expire.
+
+        """
+        if not items:
+            return
+        # MSET can't set expiration, so SETs are pipelined without MULTI
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        """Close the Redis client together with its connection pool."""
+        await self.redis.close(close_connection_pool=True)
@@ -5,19 +5,19 @@ from typing import TYPE_CHECKING, Annotated
 
 from fastapi import Query
 from fastapi_cache.decorator import cache
-from sqlalchemy.sql.expression import ColumnOperators
 
 from fifth_parser.api.urls import dates
 from fifth_parser.api.utils import calculate_cache_time
 from fifth_parser.config import get_settings
-from fifth_parser.main import db_manager
-from fifth_parser.models import SpimexTradingResults
+from fifth_parser.db import get_db_manager
 
 from .serializers import DatesSerializer
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from sqlalchemy import RowMapping
+
 
 @dates.get(
     "/",
@@ -39,6 +39,9 @@ async def get_dates(
 ) -> DatesSerializer:
     """Get dates of the last trading results.
 
+    Dates are read from the calendar of trading days maintained by the
+    ingest, so trading results themselves are not scanned.
+
     Args:
         number_of_days (int): Number of days to retrieve
             trading results for.
@@ -48,16 +51,7 @@ async def get_dates(
 
     """
     last_accepted_date: date = date.today() - timedelta(days=number_of_days)
-    result: Sequence[
-        SpimexTradingResults
-    ] = await db_manager.get_spimex_trading_results(
-        columns=[SpimexTradingResults.date],
-        conditions={
-            SpimexTradingResults.date: [
-                (ColumnOperators.__ge__, last_accepted_date),
-            ],
-        },
-        only_unique=True,
-        order_by=SpimexTradingResults.date,
+    result: Sequence[RowMapping] = await get_db_manager().get_trading_days(
+        last_accepted_date,
     )
     return DatesSerializer(dates=result)
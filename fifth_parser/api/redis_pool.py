@@ -0,0 +1,157 @@
+"""Create the pooled Redis client used for caching of the API.
+
+Connections are taken from a bounded pool, so a burst of requests waits for
+a free connection instead of opening new sockets without limit. Waiting
+requests get connections in order of arrival, so none of them starves under
+load. Connections idle for longer than ``REDIS_HEALTH_CHECK_INTERVAL``
+seconds are checked with PING before use and TCP keepalive is enabled, so
+connections silently dropped by the network are replaced. Replies are parsed
+by hiredis if it's installed. The pool also counts how long connections are
+acquired for, which is exposed with its size by the cache pool endpoint.
+"""
+
+from asyncio import Semaphore, timeout
+from time import perf_counter
+
+from redis.asyncio.client import Redis
+from redis.asyncio.connection import (
+    AbstractConnection,
+    ConnectionPool,
+    DefaultParser,
+)
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from fifth_parser.config import get_redis_url, get_settings
+
+
+class FairConnectionPool(ConnectionPool):
+    """Extend ConnectionPool with fair waiting for connections and metrics.
+
+    Attributes:
+        timeout: Seconds to wait for a free connection before failing.
+        acquired: Number of connections acquired from the pool.
+        acquire_time: Total seconds spent acquiring connections, including
+            waits for a free one and connecting of new ones.
+        max_acquire_time: Longest acquiring of a connection in seconds.
+
+    """
+
+    def __init__(self, timeout: float | None = None, **kwargs: object) -> None:
+        """Initialize the pool and its metrics.
+
+        Args:
+            timeout: Seconds to wait for a free connection before failing,
+                waits forever if not set.
+            **kwargs: Arguments of ConnectionPool.
+
+        """
+        super().__init__(**kwargs)
+        self.timeout: float | None = timeout
+        self.acquired: int = 0
+        self.acquire_time: float = 0.0
+        self.max_acquire_time: float = 0.0
+
+    def reset(self) -> None:
+        """Forget all connections, e.g. after a fork, and free all slots."""
+        super().reset()
+        # the parent pool fails instead of waiting if all connections are in
+        # use, the semaphore makes requests wait in order of arrival
+        self._slots: Semaphore = Semaphore(self.max_connections)
+        # connections returned by get_connection, which hold a slot
+        self._leased_connections: set[AbstractConnection] = set()
+
+    async def get_connection(
+        self,
+        command_name: str,
+        *keys: object,
+        **options: object,
+    ) -> AbstractConnection:
+        """Wait for a free slot of the pool and get a connection.
+
+        Args:
+            command_name: Name of the command the connection is used for.
+            *keys: Keys of the command.
+            **options: Options of the command.
+
+        Returns:
+            AbstractConnection: Connection ready to send a command.
+
+        Raises:
+            RedisConnectionError: If no connection is freed in time.
+
+        """
+        start: float = perf_counter()
+        try:
+            async with timeout(self.timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            msg = "No connection available."
+            raise RedisConnectionError(msg) from None
+        try:
+            connection: AbstractConnection = await super().get_connection(
+                command_name,
+                *keys,
+                **options,
+            )
+        except BaseException:
+            # the parent pool releases a connection it failed to prepare,
+            # which frees no slot, as only returned connections hold one
+            self._slots.release()
+            raise
+        self._leased_connections.add(connection)
+        elapsed: float = perf_counter() - start
+        self.acquired += 1
+        self.acquire_time += elapsed
+        self.max_acquire_time = max(self.max_acquire_time, elapsed)
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        """Release the connection back to the pool and free its slot.
+
+        Args:
+            connection: Connection acquired from the pool.
+
+        """
+        leased: bool = connection in self._leased_connections
+        self._leased_connections.discard(connection)
+        await super().release(connection)
+        if leased:
+            self._slots.release()
+
+    def metrics(self) -> dict[str, int | float | str]:
+        """Collect size and usage metrics of the pool.
+
+        Returns:
+            dict[str, int | float | str]: Metrics of the pool, see
+                ``RedisPoolSerializer`` for their description.
+
+        """
+        return {
+            "max_connections": self.max_connections,
+            "created_connections": self._created_connections,
+            "in_use_connections": len(self._in_use_connections),
+            "idle_connections": len(self._available_connections),
+            "acquired": self.acquired,
+            "acquire_time_avg": (
+                self.acquire_time / self.acquired if self.acquired else 0.0
+            ),
+            "acquire_time_max": self.max_acquire_time,
+            "parser": DefaultParser.__name__,
+        }
+
+
+def create_redis_client() -> Redis:
+    """Create Redis client with a connection pool configured from settings.
+
+    Returns:
+        Redis: Redis client, its pool has to be closed together with it.
+
+    """
+    pool: FairConnectionPool = FairConnectionPool.from_url(
+        get_redis_url(),
+        max_connections=get_settings().REDIS_MAX_CONNECTIONS,
+        timeout=get_settings().REDIS_POOL_TIMEOUT,
+        health_check_interval=get_settings().REDIS_HEALTH_CHECK_INTERVAL,
+        socket_keepalive=get_settings().REDIS_SOCKET_KEEPALIVE,
+    )
+    return Redis(connection_pool=pool)
@@ -2,7 +2,10 @@
 
 from datetime import date, datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from fifth_parser.config import get_settings
+from fifth_parser.db import MatchMode
 
 
 class SpimexTradingResultSerializer(BaseModel):
@@ -27,3 +30,54 @@ class SpimexTradingResultsSerializer(BaseModel):
     """Represent a list of Spimex trading results."""
 
     trades: list[SpimexTradingResultSerializer]
+
+
+class SpimexTradingResultsBucketSerializer(BaseModel):
+    """Represent Spimex trading results aggregated over a time bucket."""
+
+    bucket: date
+    rows: int
+    volume_sum: int
+    volume_avg: float
+    volume_min: int
+    volume_max: int
+    total_sum: int
+    total_avg: float
+    total_min: int
+    total_max: int
+    count_sum: int
+    count_avg: float
+    count_min: int
+    count_max: int
+
+
+class SpimexTradingResultsSeriesSerializer(BaseModel):
+    """Represent a time series of aggregated Spimex trading results."""
+
+    series: list[SpimexTradingResultsBucketSerializer]
+
+
+class DynamicsQuerySerializer(BaseModel):
+    """Represent filters of a single dynamics query in a batch."""
+
+    start_date: date
+    end_date: date
+    oil_id: str | None = Field(default=None, max_length=4)
+    delivery_type_id: str | None = Field(default=None, max_length=1)
+    delivery_basis_id: str | None = Field(default=None, max_length=3)
+    match_mode: MatchMode = MatchMode.CONTAINS
+
+
+class BatchDynamicsQuerySerializer(BaseModel):
+    """Represent a batch of dynamics queries."""
+
+    queries: list[DynamicsQuerySerializer] = Field(
+        min_length=1,
+        max_length=get_settings().BATCH_MAX_QUERIES,
+    )
+
+
+class BatchDynamicsSerializer(BaseModel):
+    """Represent results of a batch of dynamics queries, in query order."""
+
+    results: list[SpimexTradingResultsSerializer]
@@ -1,52 +1,142 @@
 """Implement API endpoints for trading results."""
 
-from datetime import date
+import logging
+from asyncio import Semaphore, gather
+from datetime import date, timedelta
+from hashlib import blake2b
 from typing import Annotated
 
 from fastapi import Query
+from fastapi_cache import FastAPICache
 from fastapi_cache.decorator import cache
+from sqlalchemy import Column
 from sqlalchemy.sql.expression import ColumnOperators
+from termcolor import colored
 
-from fifth_parser.api.trades.serializers import SpimexTradingResultsSerializer
+from fifth_parser.api.conditional import get_dataset_generation
+from fifth_parser.api.trades.serializers import (
+    BatchDynamicsQuerySerializer,
+    BatchDynamicsSerializer,
+    DynamicsQuerySerializer,
+    SpimexTradingResultsSerializer,
+    SpimexTradingResultsSeriesSerializer,
+)
 from fifth_parser.api.urls import trades
 from fifth_parser.api.utils import calculate_cache_time
 from fifth_parser.config import get_settings
-from fifth_parser.main import db_manager
+from fifth_parser.db import MatchMode, TimeBucket, get_db_manager
 from fifth_parser.models import SpimexTradingResults
 
 
+def get_id_conditions(
+    oil_id: str | None,
+    delivery_type_id: str | None,
+    delivery_basis_id: str | None,
+    *,
+    match_mode: MatchMode = MatchMode.CONTAINS,
+) -> dict[Column, list[tuple]]:
+    """Build conditions for filters by IDs of trading results.
+
+    Filters which are not given add no conditions.
+
+    Args:
+        oil_id(str | None): Filter by oil ID.
+        delivery_type_id(str | None): Filter by delivery type ID.
+        delivery_basis_id(str | None): Filter by delivery basis ID.
+        match_mode(MatchMode): How the filters match the IDs.
+
+    Returns:
+        dict[Column, list[tuple]]: Conditions for DBManager queries.
+
+    """
+    filters: dict[Column, str | None] = {
+        SpimexTradingResults.oil_id: oil_id,
+        SpimexTradingResults.delivery_type_id: delivery_type_id,
+        SpimexTradingResults.delivery_basis_id: delivery_basis_id,
+    }
+    return {
+        column: [match_mode.condition(value)]
+        for column, value in filters.items()
+        if value is not None
+    }
+
+
+def get_dynamics_conditions(
+    start_date: date,
+    end_date: date,
+    oil_id: str | None,
+    delivery_type_id: str | None,
+    delivery_basis_id: str | None,
+    *,
+    match_mode: MatchMode = MatchMode.CONTAINS,
+) -> dict[Column, list[tuple]]:
+    """Build conditions for filters of trading results dynamics.
+
+    Args:
+        start_date(date): Start date of the range.
+        end_date(date): End date of the range.
+        oil_id(str | None): Filter by oil ID.
+        delivery_type_id(str | None): Filter by delivery type ID.
+        delivery_basis_id(str | None): Filter by delivery basis ID.
+        match_mode(MatchMode): How the filters match the IDs.
+
+    Returns:
+        dict[Column, list[tuple]]: Conditions for DBManager queries.
+
+    """
+    return {
+        SpimexTradingResults.date: [
+            (ColumnOperators.__ge__, start_date),
+            (ColumnOperators.__le__, end_date),
+        ],
+        **get_id_conditions(
+            oil_id,
+            delivery_type_id,
+            delivery_basis_id,
+            match_mode=match_mode,
+        ),
+    }
+
+
 @trades.get(
     "/",
     response_model=SpimexTradingResultsSerializer,
     summary="Trading results",
     description="This endpoint has pagination with 'page' query parameter and "
     "can be filtered by fields: 'oil_id', 'delivery_type_id' and "
-    "'delivery_basis_id'.",
+    "'delivery_basis_id', matched according to 'match_mode'.",
     name="get_trading_results",
 )
 @cache(expire=calculate_cache_time())
 async def get_trading_results(
     oil_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=4,
             description="Filter by oil ID.",
         ),
-    ] = "%",
+    ] = None,
     delivery_type_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=1,
             description="Filter by delivery type ID.",
         ),
-    ] = "%",
+    ] = None,
     delivery_basis_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=3,
             description="Filter by delivery basis ID.",
         ),
-    ] = "%",
+    ] = None,
+    match_mode: Annotated[
+        MatchMode,
+        Query(
+            description="How ID filters match: 'contains' (case-insensitive "
+            "substring), 'exact' or 'prefix'.",
+        ),
+    ] = MatchMode.CONTAINS,
     page: Annotated[
         int,
         Query(
@@ -58,27 +148,23 @@ async def get_trading_results(
     """Get trading results with filtering and pagination.
 
     Args:
-        oil_id(str): Filter by oil ID.
-        delivery_type_id(str): Filter by delivery type ID.
-        delivery_basis_id(str): Filter by delivery basis ID.
+        oil_id(str | None): Filter by oil ID.
+        delivery_type_id(str | None): Filter by delivery type ID.
+        delivery_basis_id(str | None): Filter by delivery basis ID.
+        match_mode(MatchMode): How the filters match the IDs.
         page(int): Page number for pagination.
 
     Returns:
         Serialized trading results.
 
     """
-    result = await db_manager.get_spimex_trading_results(
-        conditions={
-            SpimexTradingResults.oil_id: [
-                (ColumnOperators.icontains, oil_id),
-            ],
-            SpimexTradingResults.delivery_type_id: [
-                (ColumnOperators.ilike, delivery_type_id),
-            ],
-            SpimexTradingResults.delivery_basis_id: [
-                (ColumnOperators.icontains, delivery_basis_id),
-            ],
-        },
+    result = await get_db_manager().get_spimex_trading_results(
+        conditions=get_id_conditions(
+            oil_id,
+            delivery_type_id,
+            delivery_basis_id,
+            match_mode=match_mode,
+        ),
         limit=get_settings().PAGE_SIZE,
         order_by=SpimexTradingResults.date,
         order_desc=True,
@@ -92,63 +178,305 @@ async def get_trading_results(
     response_model=SpimexTradingResultsSerializer,
     summary="Dynamics of trading results related to specific date range",
     description="Can be filtered by fields: 'oil_id', 'delivery_type_id' and "
-    "'delivery_basis_id'.",
+    "'delivery_basis_id', matched according to 'match_mode'.",
     name="get_dynamics",
 )
 @cache(expire=calculate_cache_time())
-async def get_dynamics(
+async def get_dynamics(  # noqa: PLR0917
     start_date: date,
     end_date: date,
     oil_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=4,
             description="Filter by oil ID.",
         ),
-    ] = "%",
+    ] = None,
     delivery_type_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=1,
             description="Filter by delivery type ID.",
         ),
-    ] = "%",
+    ] = None,
     delivery_basis_id: Annotated[
-        str,
+        str | None,
         Query(
             max_length=3,
             description="Filter by delivery basis ID.",
         ),
-    ] = "%",
+    ] = None,
+    match_mode: Annotated[
+        MatchMode,
+        Query(
+            description="How ID filters match: 'contains' (case-insensitive "
+            "substring), 'exact' or 'prefix'.",
+        ),
+    ] = MatchMode.CONTAINS,
 ) -> SpimexTradingResultsSerializer:
     """Get trading results dynamics for a date range.
 
     Args:
         start_date(date): Start date of the range.
         end_date(date): End date of the range.
-        oil_id(str): Filter by oil ID.
-        delivery_type_id(str): Filter by delivery type ID.
-        delivery_basis_id(str): Filter by delivery basis ID.
+        oil_id(str | None): Filter by oil ID.
+        delivery_type_id(str | None): Filter by delivery type ID.
+        delivery_basis_id(str | None): Filter by delivery basis ID.
+        match_mode(MatchMode): How the filters match the IDs.
 
     Returns:
         Serialized trading results.
 
     """
-    result = await db_manager.get_spimex_trading_results(
-        conditions={
-            SpimexTradingResults.date: [
-                (ColumnOperators.__ge__, start_date),
-                (ColumnOperators.__le__, end_date),
-            ],
-            SpimexTradingResults.oil_id: [
-                (ColumnOperators.icontains, oil_id),
-            ],
-            SpimexTradingResults.delivery_type_id: [
-                (ColumnOperators.ilike, delivery_type_id),
-            ],
-            SpimexTradingResults.delivery_basis_id: [
-                (ColumnOperators.icontains, delivery_basis_id),
-            ],
-        },
+    result = await get_db_manager().get_spimex_trading_results(
+        conditions=get_dynamics_conditions(
+            start_date,
+            end_date,
+            oil_id,
+            delivery_type_id,
+            delivery_basis_id,
+            match_mode=match_mode,
+        ),
     )
     return SpimexTradingResultsSerializer(trades=result)
+
+
+@trades.get(
+    "/dynamics/series",
+    response_model=SpimexTradingResultsSeriesSerializer,
+    summary="Aggregated dynamics of trading results as a time series",
+    description="Returns one row per day, week or month ('bucket' query "
+    "parameter) with sum, average, minimum and maximum of volume, total and "
+    "count. Can be filtered by fields: 'oil_id', 'delivery_type_id' and "
+    "'delivery_basis_id', matched according to 'match_mode'.",
+    name="get_dynamics_series",
+)
+@cache(expire=calculate_cache_time())
+async def get_dynamics_series(  # noqa: PLR0917
+    start_date: date,
+    end_date: date,
+    bucket: Annotated[
+        TimeBucket,
+        Query(
+            description="Size of the time buckets.",
+        ),
+    ] = TimeBucket.DAY,
+    oil_id: Annotated[
+        str | None,
+        Query(
+            max_length=4,
+            description="Filter by oil ID.",
+        ),
+    ] = None,
+    delivery_type_id: Annotated[
+        str | None,
+        Query(
+            max_length=1,
+            description="Filter by delivery type ID.",
+        ),
+    ] = None,
+    delivery_basis_id: Annotated[
+        str | None,
+        Query(
+            max_length=3,
+            description="Filter by delivery basis ID.",
+        ),
+    ] = None,
+    match_mode: Annotated[
+        MatchMode,
+        Query(
+            description="How ID filters match: 'contains' (case-insensitive "
+            "substring), 'exact' or 'prefix'.",
+        ),
+    ] = MatchMode.CONTAINS,
+) -> SpimexTradingResultsSeriesSerializer:
+    """Get trading results for a date range aggregated by time buckets.
+
+    Args:
+        start_date(date): Start date of the range.
+        end_date(date): End date of the range.
+        bucket(TimeBucket): Size of the time buckets.
+        oil_id(str | None): Filter by oil ID.
+        delivery_type_id(str | None): Filter by delivery type ID.
+        delivery_basis_id(str | None): Filter by delivery basis ID.
+        match_mode(MatchMode): How the filters match the IDs.
+
+    Returns:
+        Serialized time series of aggregated trading results.
+
+    """
+    result = await get_db_manager().get_trading_results_series(
+        bucket=bucket,
+        conditions=get_dynamics_conditions(
+            start_date,
+            end_date,
+            oil_id,
+            delivery_type_id,
+            delivery_basis_id,
+            match_mode=match_mode,
+        ),
+    )
+    return SpimexTradingResultsSeriesSerializer(series=result)
+
+
+def get_dynamics_cache_key(
+    query: DynamicsQuerySerializer,
+    generation: str,
+) -> str:
+    """Build cache key of a single batch query.
+
+    Results of every query are cached separately, so the same query is
+    served from the cache in any batch.
+
+    Args:
+        query: Filters of the dynamics query.
+        generation: Current dataset generation.
+
+    Returns:
+        str: Cache key of the query results.
+
+    """
+    query_hash: str = blake2b(
+        query.model_dump_json().encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f"{FastAPICache.get_prefix()}:batch:{query_hash}:{generation}"
+
+
+async def query_dynamics(
+    query: DynamicsQuerySerializer,
+    semaphore: Semaphore,
+) -> SpimexTradingResultsSerializer:
+    """Get trading results dynamics of a single batch query from database.
+
+    Args:
+        query: Filters of the dynamics query.
+        semaphore: Semaphore limiting concurrent database queries.
+
+    Returns:
+        SpimexTradingResultsSerializer: Serialized trading results.
+
+    """
+    async with semaphore:
+        result = await get_db_manager().get_spimex_trading_results(
+            conditions=get_dynamics_conditions(**query.model_dump()),
+        )
+    return SpimexTradingResultsSerializer(trades=result)
+
+
+@trades.post(
+    "/batch",
+    response_model=BatchDynamicsSerializer,
+    summary="Dynamics of trading results for several filters at once",
+    description="Accepts a list of dynamics queries with the same filters "
+    "as the dynamics endpoint and returns their results in the same order. "
+    "Queries are executed concurrently and cached separately.",
+    name="get_batch_dynamics",
+)
+async def get_batch_dynamics(
+    batch: BatchDynamicsQuerySerializer,
+) -> BatchDynamicsSerializer:
+    """Get trading results dynamics for a batch of queries.
+
+    Cached results of all queries are read with a single round trip to the
+    cache, and results of the missed ones are written back with another.
+
+    Args:
+        batch(BatchDynamicsQuerySerializer): Queries with filters.
+
+    Returns:
+        Serialized trading results of every query.
+
+    """
+    generation: str = await get_dataset_generation().get()
+    cache_keys: list[str] = [
+        get_dynamics_cache_key(query, generation) for query in batch.queries
+    ]
+    # repeated queries of the batch are executed once
+    unique_queries: dict[str, DynamicsQuerySerializer] = dict(
+        zip(cache_keys, batch.queries, strict=True),
+    )
+    backend = FastAPICache.get_backend()
+    results: dict[str, SpimexTradingResultsSerializer] = {
+        cache_key: SpimexTradingResultsSerializer.model_validate_json(cached)
+        for cache_key, cached in zip(
+            unique_queries,
+            await backend.get_many(list(unique_queries)),
+            strict=True,
+        )
+        if cached is not None
+    }
+    missed_queries: dict[str, DynamicsQuerySerializer] = {
+        cache_key: query
+        for cache_key, query in unique_queries.items()
+        if cache_key not in results
+    }
+    semaphore = Semaphore(get_settings().BATCH_CONCURRENCY)
+    missed_results: list[SpimexTradingResultsSerializer] = await gather(
+        *(
+            query_dynamics(query, semaphore)
+            for query in missed_queries.values()
+        ),
+    )
+    fresh_results: dict[str, SpimexTradingResultsSerializer] = dict(
+        zip(missed_queries, missed_results, strict=True),
+    )
+    await backend.set_many(
+        {
+            cache_key: result.model_dump_json().encode()
+            for cache_key, result in fresh_results.items()
+        },
+        calculate_cache_time(),
+    )
+    results.update(fresh_results)
+    return BatchDynamicsSerializer(
+        results=[results[cache_key] for cache_key in cache_keys],
+    )
+
+
+async def warm_up_dynamics_cache() -> int:
+    """Preload cached results of the most common dynamics queries.
+
+    Dynamics of the whole market for ``CACHE_WARMUP_PERIODS`` days up to
+    the last trading day are written to the cache with a single
+    ``set_many`` round trip, under the same keys as batch queries, so the
+    first batch requests of a new dataset generation are cache hits. An
+    error is logged and doesn't stop the caller.
+
+    Returns:
+        int: Number of preloaded queries.
+
+    """
+    periods: list[int] = get_settings().CACHE_WARMUP_PERIODS
+    if not periods:
+        return 0
+    try:
+        totals = await get_db_manager().get_trading_days_totals()
+        if totals["last_date"] is None:
+            return 0
+        generation: str = await get_dataset_generation().get()
+        queries: dict[str, DynamicsQuerySerializer] = {}
+        for period in periods:
+            query = DynamicsQuerySerializer(
+                start_date=totals["last_date"] - timedelta(days=period - 1),
+                end_date=totals["last_date"],
+            )
+            queries[get_dynamics_cache_key(query, generation)] = query
+        semaphore = Semaphore(get_settings().BATCH_CONCURRENCY)
+        results: list[SpimexTradingResultsSerializer] = await gather(
+            *(query_dynamics(query, semaphore) for query in queries.values()),
+        )
+        await FastAPICache.get_backend().set_many(
+            {
+                cache_key: result.model_dump_json().encode()
+                for cache_key, result in zip(queries, results, strict=True)
+            },
+            calculate_cache_time(),
+        )
+    except Exception:
+        logging.exception(colored("Cache warm-up failed", "red"))
+        return 0
+    logging.info(
+        colored(f"Preloaded {len(queries)} dynamics queries", "green"),
+    )
+    return len(queries)
@@ -12,6 +12,11 @@ trades = APIRouter(
     tags=["Trade"],
 )
 
+cache_metrics = APIRouter(
+    prefix="/cache",
+    tags=["Cache"],
+)
+
 
 ALL_ROUTERS = [
     obj for _, obj in locals().items() if isinstance(obj, APIRouter)
@@ -0,0 +1,77 @@
+"""Benchmark cold start of the API with ``python -X importtime``.
+
+Imports the FastAPI application in fresh interpreters, the same way a new
+uvicorn worker does, and checks that the import fits into the cold start
+budget and doesn't pull in the heavy parser dependencies.
+
+Usage:
+    python -m fifth_parser.benchmarks.cold_start --runs 5 --budget-ms 1500
+"""
+
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from subprocess import run
+
+APP_MODULE = "fifth_parser.api.app"
+PARSER_ONLY_MODULES = ("pandas", "aiohttp", "bs4")
+
+
+def measure_import_time(module: str = APP_MODULE) -> dict[str, int]:
+    """Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module: Name of the module to import.
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds of every
+            module imported along the way.
+
+    """
+    result = run(  # noqa: S603 it's our own interpreter with constant args
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def main() -> None:
+    """Run the benchmark and exit with 1 if the budget is exceeded."""
+    argument_parser = ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument("--runs", type=int, default=5)
+    argument_parser.add_argument("--budget-ms", type=float, default=1500)
+    arguments = argument_parser.parse_args()
+
+    runs: list[dict[str, int]] = [
+        measure_import_time() for _ in range(arguments.runs)
+    ]
+    cold_start_ms: float = median(times[APP_MODULE] for times in runs) / 1000
+    print(f"Median cold start of {APP_MODULE}: {cold_start_ms:.1f} ms")
+    print("Slowest imports:")
+    for name, cumulative in sorted(
+        runs[-1].items(),
+        key=lambda item: item[1],
+        reverse=True,
+    )[1:11]:
+        print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+
+    failed: bool = False
+    if leaked := [name for name in PARSER_ONLY_MODULES if name in runs[-1]]:
+        print(f"Parser-only modules imported by the API: {leaked}")
+        failed = True
+    if cold_start_ms > arguments.budget_ms:
+        print(f"Cold start budget of {arguments.budget_ms} ms is exceeded")
+        failed = True
+    sys.exit(int(failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark compression of trades payloads of the API.
+
+Builds ``/trades/dynamics``-like JSON payloads of several sizes, with names
+repeated the same way as in the real data, and compresses them with every
+supported encoding at several levels. Prints bytes on wire, compression
+ratio and CPU time per response, to pick the levels and the minimum size
+for the compression middleware.
+
+Usage:
+    python -m fifth_parser.benchmarks.compression --rows 10 100 1000 10000
+"""
+
+from argparse import ArgumentParser
+from datetime import UTC, date, datetime, timedelta
+from random import Random
+from statistics import median
+from time import perf_counter
+
+from fifth_parser.api.compression import SUPPORTED_ENCODINGS, compress
+from fifth_parser.api.trades.serializers import SpimexTradingResultsSerializer
+
+LEVELS: dict[str, tuple[int, ...]] = {"gzip": (1, 6, 9), "br": (1, 5, 9)}
+
+
+def build_payload(rows: int, seed: int = 0) -> bytes:
+    """Build JSON of trading results like the API returns.
+
+    Args:
+        rows: Number of trading results in the payload.
+        seed: Seed of the random data.
+
+    Returns:
+        bytes: JSON payload.
+
+    """
+    random = Random(seed)  # noqa: S311 not used for security
+    products: list[tuple[str, str]] = [
+        (f"A{index:03}NVY060F", f"Бензин (АИ-92-К5) Product {index}")  # noqa: RUF001
+        for index in range(50)
+    ]
+    bases: list[str] = [f"ст. Delivery Basis {index}" for index in range(20)]
+    now: datetime = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    trades: list[dict] = []
+    for index in range(rows):
+        product_id, product_name = random.choice(products)
+        trades.append(
+            {
+                "exchange_product_id": product_id,
+                "exchange_product_name": product_name,
+                "oil_id": product_id[:4],
+                "delivery_basis_id": product_id[4:7],
+                "delivery_basis_name": random.choice(bases),
+                "delivery_type_id": product_id[-1],
+                "volume": random.randint(60, 6000),
+                "total": random.randint(10**5, 10**8),
+                "count": random.randint(1, 50),
+                "date": date(2025, 1, 1) - timedelta(days=index % 365),
+                "created_on": now,
+                "updated_on": now,
+                "id": index,
+            },
+        )
+    return (
+        SpimexTradingResultsSerializer(trades=trades)
+        .model_dump_json()
+        .encode()
+    )
+
+
+def measure(body: bytes, encoding: str, level: int, runs: int) -> tuple:
+    """Compress a payload several times and measure it.
+
+    Args:
+        body: Payload to compress.
+        encoding: Content encoding.
+        level: Compression level.
+        runs: Number of compressions, the median time is taken.
+
+    Returns:
+        tuple: Compressed size in bytes and median time in milliseconds.
+
+    """
+    timings: list[float] = []
+    compressed_body: bytes = b""
+    for _ in range(runs):
+        start: float = perf_counter()
+        compressed_body = compress(body, encoding, level)
+        timings.append(perf_counter() - start)
+    return len(compressed_body), median(timings) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table per payload size."""
+    argument_parser = ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000],
+    )
+    argument_parser.add_argument("--runs", type=int, default=5)
+    arguments = argument_parser.parse_args()
+
+    print(
+        f"{'rows':>7}{'encoding':>10}{'level':>7}{'bytes':>11}"
+        f"{'ratio':>8}{'ms':>9}{'MiB/s':>9}",
+    )
+    for rows in arguments.rows:
+        body: bytes = build_payload(rows)
+        print(f"{rows:>7}{'identity':>10}{'-':>7}{len(body):>11}")
+        for encoding in SUPPORTED_ENCODINGS:
+            for level in LEVELS[encoding]:
+                size, milliseconds = measure(
+                    body,
+                    encoding,
+                    level,
+                    arguments.runs,
+                )
+                print(
+                    f"{rows:>7}{encoding:>10}{level:>7}{size:>11}"
+                    f"{len(body) / size:>8.1f}{milliseconds:>9.2f}"
+                    f"{len(body) / 2**20 / (milliseconds / 1000):>9.1f}",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark cache reads from Redis under concurrent requests.
+
+Simulates concurrent API requests which read cached responses from Redis,
+once with a default unbounded connection pool and once with the pool
+configured from settings, and prints latency percentiles and throughput for
+every concurrency level. Also compares reading of a batch of keys with
+separate GETs and with a single pipelined round trip.
+
+Usage:
+    python -m fifth_parser.benchmarks.redis_cache --concurrency 1 16 128
+"""
+
+from argparse import ArgumentParser
+from asyncio import gather, run
+from statistics import quantiles
+from time import perf_counter
+
+from redis.asyncio.client import Redis
+from redis.asyncio.connection import DefaultParser
+
+from fifth_parser.api.custom_logs import LoggingRedisBackend
+from fifth_parser.api.redis_pool import create_redis_client
+from fifth_parser.config import get_redis_url
+
+KEY_PREFIX: str = "benchmark:redis_cache"
+
+
+def count_connections(redis: Redis) -> int:
+    """Count connections opened by the pool of a client.
+
+    Args:
+        redis: Redis client.
+
+    Returns:
+        int: Number of opened connections.
+
+    """
+    return redis.connection_pool._created_connections  # noqa: SLF001
+
+
+async def measure_gets(
+    redis: Redis,
+    concurrency: int,
+    requests: int,
+    keys: list[str],
+) -> tuple[float, float, float]:
+    """Read cached values with concurrent clients.
+
+    Args:
+        redis: Redis client.
+        concurrency: Number of concurrent clients.
+        requests: Number of reads of every client.
+        keys: Keys of cached values.
+
+    Returns:
+        tuple[float, float, float]: Median and 99th percentile latency in
+            milliseconds and reads per second.
+
+    """
+    latencies: list[float] = []
+
+    async def read(client_index: int) -> None:
+        for index in range(requests):
+            start: float = perf_counter()
+            await redis.get(keys[(client_index + index) % len(keys)])
+            latencies.append(perf_counter() - start)
+
+    start: float = perf_counter()
+    await gather(*(read(client_index) for client_index in range(concurrency)))
+    elapsed: float = perf_counter() - start
+    percentiles: list[float] = quantiles(latencies, n=100)
+    return (
+        percentiles[49] * 1000,
+        percentiles[98] * 1000,
+        len(latencies) / elapsed,
+    )
+
+
+async def measure_batch(redis: Redis, keys: list[str], runs: int) -> tuple:
+    """Read a batch of keys with separate GETs and with a single round trip.
+
+    Args:
+        redis: Redis client.
+        keys: Keys of the batch.
+        runs: Number of reads of the batch.
+
+    Returns:
+        tuple: Average milliseconds per batch for both ways.
+
+    """
+    backend = LoggingRedisBackend(redis)
+    start: float = perf_counter()
+    for _ in range(runs):
+        for key in keys:
+            await redis.get(key)
+    separate: float = (perf_counter() - start) / runs * 1000
+    start = perf_counter()
+    for _ in range(runs):
+        # called through the class, so the call isn't logged
+        await LoggingRedisBackend.get_many(backend, keys)
+    pipelined: float = (perf_counter() - start) / runs * 1000
+    return separate, pipelined
+
+
+async def benchmark(
+    concurrency_levels: list[int],
+    requests: int,
+    value_size: int,
+) -> None:
+    """Run the benchmark and print its results.
+
+    Args:
+        concurrency_levels: Numbers of concurrent clients.
+        requests: Number of reads of every client.
+        value_size: Size in bytes of cached values.
+
+    """
+    keys: list[str] = [f"{KEY_PREFIX}:{index}" for index in range(50)]
+    clients: dict[str, Redis] = {
+        "default": Redis.from_url(get_redis_url()),
+        "pooled": create_redis_client(),
+    }
+    await clients["pooled"].mset(dict.fromkeys(keys, b"x" * value_size))
+    print(f"parser: {DefaultParser.__name__}")
+    print(
+        f"{'pool':>8}{'clients':>9}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'reads/s':>10}{'conns':>7}",
+    )
+    try:
+        for concurrency in concurrency_levels:
+            for name, redis in clients.items():
+                median, p99, throughput = await measure_gets(
+                    redis,
+                    concurrency,
+                    requests,
+                    keys,
+                )
+                print(
+                    f"{name:>8}{concurrency:>9}{median:>9.2f}{p99:>9.2f}"
+                    f"{throughput:>10.0f}{count_connections(redis):>7}",
+                )
+        separate, pipelined = await measure_batch(clients["pooled"], keys, 20)
+        print(
+            f"batch of {len(keys)} keys: {separate:.2f} ms with separate "
+            f"GETs, {pipelined:.2f} ms in a single round trip",
+        )
+    finally:
+        await clients["pooled"].delete(*keys)
+        for redis in clients.values():
+            await redis.close(close_connection_pool=True)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    argument_parser = ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 16, 128, 512],
+    )
+    argument_parser.add_argument("--requests", type=int, default=200)
+    argument_parser.add_argument("--value-size", type=int, default=20_000)
+    arguments = argument_parser.parse_args()
+    run(
+        benchmark(
+            arguments.concurrency,
+            arguments.requests,
+            arguments.value_size,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
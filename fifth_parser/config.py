@@ -3,6 +3,8 @@
 from datetime import date
 from enum import StrEnum
 from functools import lru_cache
+from pathlib import Path
+from tempfile import gettempdir
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -40,6 +42,21 @@ class AdditionalColumns(StrEnum):
     DATE = "Дата Торгов"
 
 
+class CacheBackendType(StrEnum):
+    """Define available backends for caching of the API.
+
+    Attributes:
+        REDIS: Redis server, shared by all hosts.
+        MEMORY: Memory of every worker process.
+        SQLITE: SQLite file, shared by worker processes of a host.
+
+    """
+
+    REDIS = "redis"
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
 class Settings(BaseSettings):
     """Define application settings.
 
@@ -52,15 +69,71 @@ class Settings(BaseSettings):
         SECRET_KEY: Secret key for application.
         DEBUG: Debug mode flag.
         LOG_LEVEL: Log level for application.
+        CACHE_BACKEND: Backend for caching of the API.
+        CACHE_MEMORY_MAX_SIZE: Maximum total size in bytes of cached values
+            per process for the memory cache backend.
+        CACHE_SQLITE_PATH: Path of the database file for the SQLite cache
+            backend.
         REDIS_HOST: Host for Redis.
         REDIS_PORT: Port for Redis.
         REDIS_LOGICAL_DB: Logical database for Redis.
+        REDIS_MAX_CONNECTIONS: Maximum number of connections in the Redis
+            pool of a process.
+        REDIS_POOL_TIMEOUT: Seconds to wait for a free connection of the
+            Redis pool before failing.
+        REDIS_HEALTH_CHECK_INTERVAL: Seconds after which an idle Redis
+            connection is checked with PING before use.
+        REDIS_SOCKET_KEEPALIVE: Enable TCP keepalive for Redis connections.
         START_DATE: Start date for data fetching.
         DOMAIN: Domain for SPIMEX website.
         START_URL: Start URL for data fetching.
         CSS_PATH_TO_EXCEL_LINKS: CSS path to excel links.
         ROWS_TO_SKIP: Number of rows to skip from the start of the file.
         PAGE_SIZE: Page size for API trades results.
+        INGEST_WORKERS: Number of concurrent bulletin downloaders per
+            process.
+        INGEST_PARSERS: Number of threads parsing Excel files.
+        INGEST_WRITERS: Number of concurrent DB writers.
+        INGEST_QUEUE_SIZE: Size of the bounded queues between pipeline
+            stages.
+        INGEST_WRITE_BATCH_SIZE: Maximum number of bulletins saved in one
+            transaction.
+        INGEST_POLL_INTERVAL: Seconds to wait for new jobs while bulletins
+            are still being discovered.
+        INGEST_MAX_ATTEMPTS: Maximum number of attempts for a single
+            bulletin before it stays failed.
+        INGEST_JOB_TIMEOUT: Seconds after which an in-flight job of a
+            crashed worker can be claimed again.
+        INGEST_RUN_LOG_PATH: Path of the JSONL log with per-stage spans of
+            ingest runs, disabled if not set.
+        INGEST_SCHEDULE_INTERVAL: Seconds between ingest runs in the
+            background of the API server, disabled if not set.
+        INGEST_FULL_CRAWL: Fetch every listing page back to the start date
+            in scheduled runs instead of stopping at bulletins discovered by
+            a completed crawl.
+        API_HOST: Host for the API server.
+        API_PORT: Port for the API server.
+        API_WORKERS: Number of uvicorn worker processes.
+        BATCH_MAX_QUERIES: Maximum number of queries in a batch request.
+        BATCH_CONCURRENCY: Maximum number of queries of a batch request
+            executed concurrently.
+        CACHE_WARMUP_PERIODS: Lengths in days of the whole market dynamics
+            periods, ending at the last trading day, which are preloaded
+            into the cache at startup and after every scheduled ingest run.
+            Empty list disables the warm-up.
+        DATASET_GENERATION_TTL: Seconds for which the API trusts its last
+            known dataset generation, used for ETags of responses. Bounds
+            staleness of data loaded by another process, the scheduled
+            ingest of the API process expires it right away.
+        COMPRESSION_MINIMUM_SIZE: Minimum size in bytes of a response body
+            to be compressed.
+        COMPRESSION_LEVEL: Compression level of gzip.
+        COMPRESSION_BROTLI_QUALITY: Compression quality of Brotli.
+        COMPRESSION_CACHE_MAX_SIZE: Maximum total size in bytes of cached
+            compressed response bodies per process.
+        COMPRESSION_THREAD_MIN_SIZE: Minimum size in bytes of a response
+            body to be compressed in a worker thread instead of the event
+            loop.
         FASTAPI_TITLE: Title for FastAPI application.
         FASTAPI_SUMMARY: Summary for FastAPI application.
         FASTAPI_DESCRIPTION: Description for FastAPI application.
@@ -82,9 +155,16 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     DEBUG: bool
     LOG_LEVEL: str
-    REDIS_HOST: str
-    REDIS_PORT: int
-    REDIS_LOGICAL_DB: int
+    CACHE_BACKEND: CacheBackendType = CacheBackendType.REDIS
+    CACHE_MEMORY_MAX_SIZE: int = 64 * 2**20
+    CACHE_SQLITE_PATH: Path = Path(gettempdir()) / "fifth_parser_cache.db"
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_LOGICAL_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_POOL_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_KEEPALIVE: bool = True
 
     START_DATE: date = date(2023, 1, 1)
     DOMAIN: str = "https://spimex.com"
@@ -95,6 +175,30 @@ class Settings(BaseSettings):
     )
     ROWS_TO_SKIP: int = 6
     PAGE_SIZE: int = 10  # just like in source site
+    INGEST_WORKERS: int = 4
+    INGEST_PARSERS: int = 2
+    INGEST_WRITERS: int = 2
+    INGEST_QUEUE_SIZE: int = 8
+    INGEST_WRITE_BATCH_SIZE: int = 4
+    INGEST_POLL_INTERVAL: float = 1.0
+    INGEST_MAX_ATTEMPTS: int = 3
+    INGEST_JOB_TIMEOUT: int = 600
+    INGEST_RUN_LOG_PATH: Path | None = None
+    INGEST_SCHEDULE_INTERVAL: int | None = None
+    INGEST_FULL_CRAWL: bool = False
+
+    API_HOST: str = "0.0.0.0"
+    API_PORT: int = 8000
+    API_WORKERS: int = 1
+    BATCH_MAX_QUERIES: int = 50
+    BATCH_CONCURRENCY: int = 4
+    CACHE_WARMUP_PERIODS: list[int] = [1, 7, 30]
+    DATASET_GENERATION_TTL: int = 60
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_MAX_SIZE: int = 32 * 2**20
+    COMPRESSION_THREAD_MIN_SIZE: int = 64 * 2**10
 
     FASTAPI_TITLE: str = "SPIMEX Trades Parser API"
     FASTAPI_SUMMARY: str = (
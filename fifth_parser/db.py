@@ -1,22 +1,135 @@
 """Module for managing database interactions."""
 
-from collections.abc import Sequence
+# needed because pandas is imported only for type hints, to keep it out of
+# the API process, which never gets DataFrames
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date, timedelta
+from enum import StrEnum
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
-from pandas import DataFrame
-from sqlalchemy import Column, RowMapping, desc, select
+from sqlalchemy import (
+    Column,
+    Date,
+    RowMapping,
+    and_,
+    cast,
+    desc,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.sql.expression import ColumnElement, ColumnOperators
 
-from .config import AdditionalColumns, NeededColumns, get_db_url
-from .models import SpimexTradingResults
+from .config import (
+    AdditionalColumns,
+    NeededColumns,
+    get_db_url,
+    get_settings,
+)
+from .models import (
+    DeliveryBasisName,
+    ExchangeProductName,
+    IngestDiscovery,
+    IngestJob,
+    IngestJobState,
+    NameDimensionMixin,
+    SpimexTradingResults,
+    TradingDay,
+    get_partition_ddl,
+    get_partition_name,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from pandas import DataFrame
     from sqlalchemy.engine import Result
-    from sqlalchemy.sql.expression import ColumnOperators
+
+# columns of trading results with names joined from the dictionary tables
+TRADING_RESULTS_COLUMNS: list[Column] = [
+    *(
+        column
+        for column in SpimexTradingResults.__table__.columns
+        if not column.foreign_keys
+    ),
+    ExchangeProductName.name.label("exchange_product_name"),
+    DeliveryBasisName.name.label("delivery_basis_name"),
+]
+
+# name fields of trading results rows and their dictionary tables
+NAME_DIMENSIONS: dict[str, type[NameDimensionMixin]] = {
+    "exchange_product_name": ExchangeProductName,
+    "delivery_basis_name": DeliveryBasisName,
+}
+
+
+class TimeBucket(StrEnum):
+    """Define time buckets for aggregated trading results series.
+
+    Values are ``date_trunc`` field names of PostgreSQL.
+
+    Attributes:
+        DAY: One bucket per trading day.
+        WEEK: One bucket per week, starting on Monday.
+        MONTH: One bucket per month.
+
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class MatchMode(StrEnum):
+    """Define how string filters match values of columns.
+
+    Attributes:
+        CONTAINS: Case-insensitive substring match, can't use indexes.
+        EXACT: Equality, can use B-tree indexes.
+        PREFIX: Case-sensitive prefix match, can use B-tree indexes with
+            ``varchar_pattern_ops``.
+
+    """
+
+    CONTAINS = "contains"
+    EXACT = "exact"
+    PREFIX = "prefix"
+
+    def condition(self, value: str) -> tuple:
+        """Build an (operator, value) condition matching the value.
+
+        Args:
+            value: Value of the filter.
+
+        Returns:
+            tuple: Condition for DBManager queries.
+
+        """
+        if self is MatchMode.EXACT:
+            return ColumnOperators.__eq__, value
+        if self is MatchMode.PREFIX:
+            # the whole pattern is a single parameter instead of concatenation
+            # in SQL, so the planner can turn the prefix into an index range
+            escaped_value: str = (
+                value.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            return ColumnOperators.like, f"{escaped_value}%"
+        return ColumnOperators.icontains, value
 
 
 class DBManager:
@@ -24,9 +137,20 @@ class DBManager:
 
     def __init__(self, engine: AsyncEngine = None) -> None:
         """Initialize instance and create async session maker in attributes."""
+        self.engine: AsyncEngine = engine or create_async_engine(
+            get_db_url(),
+            echo=True,
+        )
         self.session_maker: async_sessionmaker = async_sessionmaker(
-            engine if engine else create_async_engine(get_db_url(), echo=True),
+            self.engine,
         )
+        self.name_keys: dict[type[NameDimensionMixin], dict[str, int]] = {
+            model: {} for model in NAME_DIMENSIONS.values()
+        }
+
+    async def dispose(self) -> None:
+        """Close all connections of the engine's pool."""
+        await self.engine.dispose()
 
     async def check_if_data_exists(self) -> bool:
         """Check if any data exists in the database.
@@ -41,7 +165,11 @@ class DBManager:
             )
             return result.first() is not None
 
-    async def add_new_data(self, df: DataFrame) -> None:
+    async def add_new_data(
+        self,
+        df: DataFrame,
+        ingest_job: Mapping | None = None,
+    ) -> int:
         """Insert new trading results into the database.
 
         Process data from a DataFrame and insert it into the database.
@@ -49,36 +177,560 @@ class DBManager:
         Args:
             df: DataFrame with SPIMEX trading results. Columns must
                 match the SpimexTradingResults model fields.
+            ingest_job: Claimed ingest job the data belongs to, with its id
+                and attempts. If given, the job is marked as loaded in the
+                same transaction, so a crash can't leave the data saved but
+                the job pending.
+
+        Returns:
+            int: Number of inserted rows.
+
+        """
+        return await self.add_new_data_batch([(df, ingest_job)])
+
+    async def add_new_data_batch(
+        self,
+        batch: list[tuple[DataFrame, Mapping | None]],
+    ) -> int:
+        """Insert trading results of several bulletins in one transaction.
+
+        Rows are built from whole DataFrame columns at once and inserted
+        with a single executemany, instead of creating ORM objects row by
+        row. Product and delivery basis names are replaced with keys of
+        their dictionary tables, and the calendar of trading days is
+        updated in the same transaction.
+
+        Ingest jobs are locked with ``FOR UPDATE`` before the insert. Data
+        of jobs which are already loaded, or were reclaimed by another
+        worker after a timeout (their attempts changed), is skipped, so two
+        workers holding the same job never both save its rows.
+
+        Args:
+            batch: List of (DataFrame, ingest job) tuples. DataFrame
+                columns must match the SpimexTradingResults model fields,
+                the job is a claimed job mapping with id and attempts, or
+                None if the data has no ingest job.
+
+        Returns:
+            int: Number of inserted rows.
 
         """
-        trading_results: list = []
+        bulletins: list[tuple[list[dict], Mapping | None]] = [
+            (self._to_trading_results(df), ingest_job)
+            for df, ingest_job in batch
+        ]
+        await self.ensure_partitions(
+            row["date"] for rows, _ in bulletins for row in rows
+        )
+        for name_field, model in NAME_DIMENSIONS.items():
+            name_keys: dict[str, int] = await self.resolve_name_keys(
+                model,
+                {row[name_field] for rows, _ in bulletins for row in rows},
+            )
+            for rows, _ in bulletins:
+                for row in rows:
+                    row[f"{name_field}_id"] = name_keys[row.pop(name_field)]
+        ingest_jobs: list[Mapping] = [
+            ingest_job for _, ingest_job in bulletins if ingest_job is not None
+        ]
         async with self.session_maker() as session:
-            for _, row in df.iterrows():
-                result: SpimexTradingResults = SpimexTradingResults(
-                    exchange_product_id=row[
-                        NeededColumns.EXCHANGE_PRODUCT_ID.value
-                    ],
-                    exchange_product_name=row[
-                        NeededColumns.EXCHANGE_PRODUCT_NAME.value
-                    ],
-                    oil_id=row[NeededColumns.EXCHANGE_PRODUCT_ID.value][:4],
-                    delivery_basis_id=row[
-                        NeededColumns.EXCHANGE_PRODUCT_ID.value
-                    ][4:7],
-                    delivery_basis_name=row[
-                        NeededColumns.DELIVERY_BASIS_NAME.value
+            held_job_ids: set[int] = set()
+            if ingest_jobs:
+                result: Result = await session.execute(
+                    select(IngestJob.id)
+                    .where(or_(*map(self._is_held, ingest_jobs)))
+                    .order_by(IngestJob.id)
+                    .with_for_update(),
+                )
+                held_job_ids = set(result.scalars().all())
+            trading_results: list[dict] = [
+                row
+                for rows, ingest_job in bulletins
+                if ingest_job is None or ingest_job["id"] in held_job_ids
+                for row in rows
+            ]
+            if trading_results:
+                await session.execute(
+                    insert(SpimexTradingResults),
+                    trading_results,
+                )
+                await self._add_trading_days(
+                    session,
+                    Counter(row["date"] for row in trading_results),
+                )
+            if held_job_ids:
+                await session.execute(
+                    update(IngestJob)
+                    .where(IngestJob.id.in_(held_job_ids))
+                    .values(
+                        state=IngestJobState.LOADED,
+                        error=None,
+                        finished_on=func.now(),
+                    ),
+                )
+            await session.commit()
+        return len(trading_results)
+
+    @staticmethod
+    def _is_held(ingest_job: Mapping) -> ColumnElement[bool]:
+        """Build a condition matching a job still held by its claimer.
+
+        The number of attempts is bumped on every claim, so it works as a
+        claim token: if it changed, the job was reclaimed by another worker.
+
+        Args:
+            ingest_job: Claimed ingest job with its id and attempts.
+
+        Returns:
+            ColumnElement[bool]: Condition for the IngestJob table.
+
+        """
+        return and_(
+            IngestJob.id == ingest_job["id"],
+            IngestJob.attempts == ingest_job["attempts"],
+            IngestJob.state != IngestJobState.LOADED,
+        )
+
+    @staticmethod
+    async def _add_trading_days(
+        session: AsyncSession,
+        rows_counts: Counter[date],
+    ) -> None:
+        """Add inserted rows to the calendar of trading days.
+
+        Args:
+            session: Session of the transaction inserting trading results.
+            rows_counts: Number of inserted rows per trading date.
+
+        """
+        sql_query = insert(TradingDay).values(
+            [
+                {"date": trade_date, "rows_count": rows_count}
+                for trade_date, rows_count in sorted(rows_counts.items())
+            ],
+        )
+        await session.execute(
+            sql_query.on_conflict_do_update(
+                index_elements=[TradingDay.date],
+                set_={
+                    "rows_count": TradingDay.rows_count
+                    + sql_query.excluded.rows_count,
+                    "ingested_on": func.now(),
+                },
+            ),
+        )
+
+    async def ensure_partitions(self, dates: Iterable[date]) -> None:
+        """Create monthly SpimexTradingResults partitions for given dates.
+
+        Attached partitions are looked up in the catalog on every call, as a
+        partition can be detached at any time, e.g. to archive a month.
+        Missing partitions are created, and detached ones attached back, in
+        their own short transaction under an advisory lock, so concurrent
+        writers don't race on creating the same partition.
+
+        Args:
+            dates: Dates of the trading results which are going to be saved.
+
+        """
+        months: dict[str, date] = {
+            get_partition_name(trade_date): trade_date for trade_date in dates
+        }
+        if not months:
+            return
+        async with self.session_maker() as session:
+            partitions: dict[str, bool] = await self._get_partitions(
+                session,
+                months,
+            )
+            if all(partitions.get(name) for name in months):
+                return
+            await session.execute(
+                select(
+                    func.pg_advisory_xact_lock(
+                        func.hashtext(SpimexTradingResults.__tablename__),
+                    ),
+                ),
+            )
+            # another writer could have created them while waiting for the lock
+            partitions = await self._get_partitions(session, months)
+            for name, month in sorted(months.items()):
+                if not partitions.get(name):
+                    await session.execute(
+                        get_partition_ddl(month, attach=name in partitions),
+                    )
+            await session.commit()
+
+    @staticmethod
+    async def _get_partitions(
+        session: AsyncSession,
+        names: Iterable[str],
+    ) -> dict[str, bool]:
+        """Find existing partition tables and whether they are attached.
+
+        Args:
+            session: Session to query the catalog in.
+            names: Names of the partition tables.
+
+        Returns:
+            dict[str, bool]: Whether the table is attached to the trading
+                results, by names of existing tables.
+
+        """
+        result: Result = await session.execute(
+            text(
+                "SELECT child.relname, inherits.inhrelid IS NOT NULL "
+                "FROM pg_class AS child "
+                "LEFT JOIN pg_inherits AS inherits "
+                "ON inherits.inhrelid = child.oid "
+                "AND inherits.inhparent = CAST(:parent AS regclass) "
+                "WHERE child.relname = ANY(:names) "
+                "AND pg_table_is_visible(child.oid)",
+            ),
+            {
+                "parent": SpimexTradingResults.__tablename__,
+                "names": list(names),
+            },
+        )
+        return dict(result.tuples().all())
+
+    async def resolve_name_keys(
+        self,
+        model: type[NameDimensionMixin],
+        names: set[str],
+    ) -> dict[str, int]:
+        """Get keys of names from a dictionary table, adding missing names.
+
+        Keys are cached in memory, so the database is queried only for
+        names which weren't seen by this manager yet. New names are added
+        in their own short transaction in a stable order, so concurrent
+        writers adding the same names don't deadlock.
+
+        Args:
+            model: Dictionary table of the names.
+            names: Names which keys are needed.
+
+        Returns:
+            dict[str, int]: Cached keys of all known names, including the
+                requested ones.
+
+        """
+        name_keys: dict[str, int] = self.name_keys[model]
+        missing_names: list[str] = sorted(names - name_keys.keys())
+        if not missing_names:
+            return name_keys
+        async with self.session_maker() as session:
+            await session.execute(
+                insert(model)
+                .values([{"name": name} for name in missing_names])
+                .on_conflict_do_nothing(index_elements=[model.name]),
+            )
+            result: Result = await session.execute(
+                select(model.name, model.id).where(
+                    model.name.in_(missing_names),
+                ),
+            )
+            name_keys.update(result.all())
+            await session.commit()
+        return name_keys
+
+    @staticmethod
+    def _to_trading_results(df: DataFrame) -> list[dict]:
+        """Convert DataFrame of a bulletin to SpimexTradingResults rows.
+
+        Args:
+            df: DataFrame with SPIMEX trading results.
+
+        Returns:
+            list[dict]: Rows with SpimexTradingResults fields as keys, with
+                product and delivery basis names instead of their keys.
+
+        """
+        product_ids = df[NeededColumns.EXCHANGE_PRODUCT_ID.value].astype(str)
+        columns: dict[str, list] = {
+            "exchange_product_id": product_ids.tolist(),
+            "exchange_product_name": df[
+                NeededColumns.EXCHANGE_PRODUCT_NAME.value
+            ]
+            .astype(str)
+            .tolist(),
+            "oil_id": product_ids.str[:4].tolist(),
+            "delivery_basis_id": product_ids.str[4:7].tolist(),
+            "delivery_basis_name": df[NeededColumns.DELIVERY_BASIS_NAME.value]
+            .astype(str)
+            .tolist(),
+            "delivery_type_id": product_ids.str[-1].tolist(),
+            "volume": df[NeededColumns.VOLUME.value].map(int).tolist(),
+            "total": df[NeededColumns.TOTAL.value]
+            .map(lambda total: round(float(total)))
+            .tolist(),
+            "count": df[NeededColumns.COUNT.value].map(int).tolist(),
+            "date": df[AdditionalColumns.DATE.value].tolist(),
+        }
+        return [
+            dict(zip(columns, row, strict=True))
+            for row in zip(*columns.values(), strict=True)
+        ]
+
+    async def add_ingest_jobs(self, jobs: list[tuple[str, date]]) -> int:
+        """Add newly discovered bulletins to the ingest job queue.
+
+        Bulletins which are already in the queue are skipped. Bulletins for
+        dates which already have trading results (e.g. loaded before the
+        queue existed) are added as loaded, so they are not parsed again.
+
+        Args:
+            jobs: List of (link, trade_date) tuples of discovered bulletins.
+
+        Returns:
+            int: Number of jobs which were actually added.
+
+        """
+        if not jobs:
+            return 0
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                select(TradingDay.date).where(
+                    TradingDay.date.in_(
+                        {trade_date for _, trade_date in jobs},
+                    ),
+                ),
+            )
+            loaded_dates: set[date] = set(result.scalars().all())
+            result = await session.execute(
+                insert(IngestJob)
+                .values(
+                    [
+                        {
+                            "link": link,
+                            "trade_date": trade_date,
+                            "state": IngestJobState.LOADED
+                            if trade_date in loaded_dates
+                            else IngestJobState.PENDING,
+                            "attempts": 0,
+                        }
+                        for link, trade_date in jobs
                     ],
-                    delivery_type_id=row[
-                        NeededColumns.EXCHANGE_PRODUCT_ID.value
-                    ][-1],
-                    volume=int(row[NeededColumns.VOLUME.value]),
-                    total=round(float(row[NeededColumns.TOTAL.value])),
-                    count=int(row[NeededColumns.COUNT.value]),
-                    date=row[AdditionalColumns.DATE.value],
                 )
-                trading_results.append(result)
-        session.add_all(trading_results)
-        await session.commit()
+                .on_conflict_do_nothing(index_elements=[IngestJob.link])
+                .returning(IngestJob.id),
+            )
+            added_jobs: int = len(result.all())
+            await session.commit()
+            return added_jobs
+
+    async def get_discovery_progress(self) -> RowMapping | dict:
+        """Get progress of the discovery of bulletins on listing pages.
+
+        Returns:
+            RowMapping | dict: Mapping with discovered_until, crawl_until
+                and next_page, all None if nothing was discovered yet.
+
+        """
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                select(
+                    IngestDiscovery.discovered_until,
+                    IngestDiscovery.crawl_until,
+                    IngestDiscovery.next_page,
+                ).where(IngestDiscovery.id == 1),
+            )
+            progress: RowMapping | None = result.mappings().first()
+        return progress or {
+            "discovered_until": None,
+            "crawl_until": None,
+            "next_page": None,
+        }
+
+    async def save_discovery_progress(
+        self,
+        *,
+        discovered_until: date | None,
+        crawl_until: date | None,
+        next_page: int | None,
+    ) -> None:
+        """Save progress of the discovery of bulletins on listing pages.
+
+        Args:
+            discovered_until: Newest bulletin date of the last completed
+                crawl.
+            crawl_until: Newest bulletin date of the crawl in progress.
+            next_page: Listing page to resume the crawl in progress from,
+                None if the crawl is completed.
+
+        """
+        values: dict = {
+            "discovered_until": discovered_until,
+            "crawl_until": crawl_until,
+            "next_page": next_page,
+            "updated_on": func.now(),
+        }
+        async with self.session_maker() as session:
+            await session.execute(
+                insert(IngestDiscovery)
+                .values(id=1, **values)
+                .on_conflict_do_update(
+                    index_elements=[IngestDiscovery.id],
+                    set_=values,
+                ),
+            )
+            await session.commit()
+
+    async def claim_ingest_job(self) -> RowMapping | None:
+        """Claim the next ingest job for the current worker.
+
+        The job is selected with ``FOR UPDATE SKIP LOCKED``, so concurrent
+        workers, even from different processes, never claim the same job.
+        Pending jobs, failed jobs with attempts left and in-flight jobs whose
+        worker stopped updating them (crashed) can be claimed.
+
+        Returns:
+            RowMapping | None: Mapping with id, link, trade_date and
+                attempts of the claimed job, or None if there is nothing
+                to claim. The attempts identify this claim of the job.
+
+        """
+        settings = get_settings()
+        stale_before = func.now() - timedelta(
+            seconds=settings.INGEST_JOB_TIMEOUT,
+        )
+        has_attempts_left = IngestJob.attempts < settings.INGEST_MAX_ATTEMPTS
+        claimable_job = (
+            select(IngestJob.id)
+            .where(
+                or_(
+                    IngestJob.state == IngestJobState.PENDING,
+                    and_(
+                        IngestJob.state == IngestJobState.FAILED,
+                        has_attempts_left,
+                    ),
+                    and_(
+                        IngestJob.state.in_(
+                            [
+                                IngestJobState.DOWNLOADING,
+                                IngestJobState.PARSED,
+                            ],
+                        ),
+                        IngestJob.updated_on < stale_before,
+                        has_attempts_left,
+                    ),
+                ),
+            )
+            .order_by(desc(IngestJob.trade_date))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                update(IngestJob)
+                .where(IngestJob.id == claimable_job)
+                .values(
+                    state=IngestJobState.DOWNLOADING,
+                    attempts=IngestJob.attempts + 1,
+                    started_on=func.now(),
+                )
+                .returning(
+                    IngestJob.id,
+                    IngestJob.link,
+                    IngestJob.trade_date,
+                    IngestJob.attempts,
+                ),
+            )
+            job: RowMapping | None = result.mappings().first()
+            await session.commit()
+            return job
+
+    async def set_ingest_job_state(
+        self,
+        ingest_job: Mapping,
+        state: IngestJobState,
+        error: str | None = None,
+    ) -> bool:
+        """Move an ingest job to another state.
+
+        The job is updated only while it is still held by the caller, so a
+        worker whose job was reclaimed after a timeout can't move it back.
+
+        Args:
+            ingest_job: Claimed ingest job with its id and attempts.
+            state: New state of the job.
+            error: Error of the failed attempt, if any.
+
+        Returns:
+            bool: Whether the job was still held and was updated.
+
+        """
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                update(IngestJob)
+                .where(self._is_held(ingest_job))
+                .values(state=state, error=error),
+            )
+            await session.commit()
+            return bool(result.rowcount)
+
+    async def touch_ingest_jobs(self, ingest_jobs: Iterable[Mapping]) -> None:
+        """Refresh the update time of in-flight ingest jobs.
+
+        Called whenever jobs move between the ingest queues, so jobs which
+        wait in a queue behind slow workers aren't taken for jobs of a
+        crashed worker and reclaimed after the timeout.
+
+        Args:
+            ingest_jobs: Claimed ingest jobs with their ids and attempts.
+
+        """
+        conditions: list[ColumnElement[bool]] = [
+            self._is_held(ingest_job) for ingest_job in ingest_jobs
+        ]
+        if not conditions:
+            return
+        async with self.session_maker() as session:
+            await session.execute(
+                update(IngestJob)
+                .where(or_(*conditions))
+                .values(updated_on=func.now()),
+            )
+            await session.commit()
+
+    async def get_trading_days_totals(self) -> RowMapping:
+        """Get the last loaded trading day and the number of stored rows.
+
+        Returns:
+            RowMapping: Mapping with last_date (None if nothing is loaded)
+                and rows_count of all trading days.
+
+        """
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                select(
+                    func.max(TradingDay.date).label("last_date"),
+                    func.coalesce(func.sum(TradingDay.rows_count), 0).label(
+                        "rows_count",
+                    ),
+                ),
+            )
+            return result.mappings().one()
+
+    async def get_trading_days(self, since: date) -> Sequence[RowMapping]:
+        """Get dates of loaded trading days from the calendar.
+
+        Args:
+            since: Earliest date to return.
+
+        Returns:
+            Sequence[RowMapping]: Mappings with date of every trading day
+                since the given date, in ascending order.
+
+        """
+        async with self.session_maker() as session:
+            result: Result = await session.execute(
+                select(TradingDay.date)
+                .where(TradingDay.date >= since)
+                .order_by(TradingDay.date),
+            )
+            return result.mappings().all()
 
     async def get_spimex_trading_results(
         self,
@@ -94,7 +746,9 @@ class DBManager:
         """Get SPIMEX trading results from the database.
 
         Args:
-            columns: List of columns to select. Defaults to all columns.
+            columns: List of columns to select. Defaults to all columns
+                with product and delivery basis names joined from their
+                dictionary tables.
             conditions: Dict of conditions to filter by. Keys are columns,
                 values are lists of (operator, value) tuples.
             only_unique: If True, return only unique rows.
@@ -109,18 +763,14 @@ class DBManager:
 
         """
         async with self.session_maker() as session:
-            needed_columns: list[Column] = columns or [
-                *SpimexTradingResults.__table__.columns,
-            ]
-            conditions: dict = conditions or {}
-
-            all_column_conditions: list[ColumnOperators] = [
-                getattr(column, sql_operator.__name__)(value)
-                for column, list_conditions in conditions.items()
-                for sql_operator, value in list_conditions
-            ]
-
-            sql_query = select(*needed_columns).where(*all_column_conditions)
+            needed_columns: list[Column] = columns or TRADING_RESULTS_COLUMNS
+            sql_query = select(*needed_columns).where(
+                *self._build_conditions(conditions),
+            )
+            if columns is None:
+                sql_query = sql_query.join(
+                    SpimexTradingResults.exchange_product_name_entry,
+                ).join(SpimexTradingResults.delivery_basis_name_entry)
             if only_unique:
                 sql_query = sql_query.distinct()
             if order_by is not None:
@@ -135,3 +785,93 @@ class DBManager:
 
             result: Result = await session.execute(sql_query)
             return result.mappings().all()
+
+    async def get_trading_results_series(
+        self,
+        *,
+        bucket: TimeBucket = TimeBucket.DAY,
+        conditions: dict[Column, list[tuple]] | None = None,
+    ) -> Sequence[RowMapping]:
+        """Get trading results aggregated into a time series.
+
+        Rows are grouped by the start of their time bucket in the database,
+        so one row per bucket is returned instead of all trading results.
+
+        Args:
+            bucket: Size of the time buckets.
+            conditions: Dict of conditions to filter by. Keys are columns,
+                values are lists of (operator, value) tuples.
+
+        Returns:
+            Sequence[RowMapping]: Mappings with the bucket start date, number
+                of trading results and sum, average, minimum and maximum of
+                their volume, total and count, ordered by the bucket.
+
+        """
+        # the bucket is rendered inline, so the same expression can be
+        # matched in the GROUP BY
+        bucket_start = cast(
+            func.date_trunc(
+                literal(bucket.value, literal_execute=True),
+                SpimexTradingResults.date,
+            ),
+            Date,
+        ).label("bucket")
+        aggregated_columns: list = [
+            getattr(func, aggregate)(column).label(
+                f"{column.name}_{aggregate}",
+            )
+            for column in (
+                SpimexTradingResults.volume,
+                SpimexTradingResults.total,
+                SpimexTradingResults.count,
+            )
+            for aggregate in ("sum", "avg", "min", "max")
+        ]
+        sql_query = (
+            select(
+                bucket_start,
+                func.count().label("rows"),
+                *aggregated_columns,
+            )
+            .where(*self._build_conditions(conditions))
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
+        async with self.session_maker() as session:
+            result: Result = await session.execute(sql_query)
+            return result.mappings().all()
+
+    @staticmethod
+    def _build_conditions(
+        conditions: dict[Column, list[tuple]] | None,
+    ) -> list[ColumnOperators]:
+        """Build WHERE clauses from (operator, value) conditions of columns.
+
+        Args:
+            conditions: Dict of conditions to filter by. Keys are columns,
+                values are lists of (operator, value) tuples.
+
+        Returns:
+            list[ColumnOperators]: Clauses to pass to ``where``.
+
+        """
+        return [
+            getattr(column, sql_operator.__name__)(value)
+            for column, list_conditions in (conditions or {}).items()
+            for sql_operator, value in list_conditions
+        ]
+
+
+@lru_cache
+def get_db_manager() -> DBManager:
+    """Return database manager shared by the whole process.
+
+    The engine is created on the first call, e.g. in the lifespan of the
+    API, instead of on import.
+
+    Returns:
+        DBManager: Database manager of the process.
+
+    """
+    return DBManager()
@@ -13,13 +13,39 @@ from aiohttp import ClientSession
 from pandas import DataFrame, read_excel
 
 from .config import AdditionalColumns, NeededColumns, get_settings
+from .instrumentation import IngestStage, stage
 
 
-async def parse_excel_file(link: str, trade_date: date) -> DataFrame:
-    """Download and parse Excel file from given URL, and filter trade data.
+async def download_excel_file(link: str) -> bytes:
+    """Download Excel file from given URL.
 
     Args:
         link: URL string pointing to the Excel file location.
+
+    Returns:
+        Raw content of the Excel file.
+
+    """
+    with stage(IngestStage.FILE_DOWNLOAD, link) as span:
+        async with ClientSession() as session, session.get(link) as response:
+            file_content: bytes = await response.read()
+        span["bytes"] = len(file_content)
+    return file_content
+
+
+def parse_excel_content(
+    file_content: bytes,
+    link: str,
+    trade_date: date,
+) -> DataFrame:
+    """Parse content of Excel file and filter trade data.
+
+    It's CPU-bound, so it's better to run it in a thread to not block the
+    event loop with other downloads.
+
+    Args:
+        file_content: Raw content of the Excel file.
+        link: URL of the Excel file, used for instrumentation only.
         trade_date: Date object representing the date of the Excel file.
 
     Returns:
@@ -34,17 +60,18 @@ async def parse_excel_file(link: str, trade_date: date) -> DataFrame:
         - Keeps only rows where contract quantity is greater than 0
 
     """
-    async with ClientSession() as session, session.get(link) as response:
-        file_object: BytesIO = BytesIO(await response.read())
-        all_values: list[str] = [
-            xls_column_name
-            for _, xls_column_name in NeededColumns.__members__.items()
-        ]
-
+    all_values: list[str] = [
+        xls_column_name
+        for _, xls_column_name in NeededColumns.__members__.items()
+    ]
+    with stage(IngestStage.EXCEL_DECODE, link) as span:
         df: DataFrame = read_excel(
-            file_object,
+            BytesIO(file_content),
             skiprows=get_settings().ROWS_TO_SKIP,
         )
+        span["rows"] = len(df)
+
+    with stage(IngestStage.DATAFRAME_CLEAN, link) as span:
         df.columns = [col.replace("\n", " ").strip() for col in df.columns]
         df: DataFrame = df[all_values]
         df: DataFrame = df.dropna(subset=all_values, how="any")
@@ -53,4 +80,24 @@ async def parse_excel_file(link: str, trade_date: date) -> DataFrame:
         )
         filtered_df: DataFrame = df[df[NeededColumns.COUNT.value] > 0].copy()
         filtered_df.loc[:, AdditionalColumns.DATE.value] = trade_date
-        return filtered_df
+        span["rows"] = len(filtered_df)
+    return filtered_df
+
+
+async def parse_excel_file(link: str, trade_date: date) -> DataFrame:
+    """Download and parse Excel file from given URL, and filter trade data.
+
+    Args:
+        link: URL string pointing to the Excel file location.
+        trade_date: Date object representing the date of the Excel file.
+
+    Returns:
+        DataFrame containing filtered and cleaned trade data with required
+        columns. Only rows with positive number of contracts are included.
+
+    """
+    return parse_excel_content(
+        await download_excel_file(link),
+        link,
+        trade_date,
+    )
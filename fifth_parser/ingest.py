@@ -0,0 +1,359 @@
+"""Ingest pipeline of the application.
+
+This module contains the logic of asynchronous parsing trade data from the
+website and saving it to the database, both for a single run and for
+scheduled runs in the background of the API server.
+"""
+
+import logging
+from asyncio import (
+    Queue,
+    QueueEmpty,
+    Task,
+    TaskGroup,
+    sleep,
+    to_thread,
+    wait,
+)
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from aiohttp import ClientSession
+from pandas import DataFrame
+from sqlalchemy import RowMapping
+from termcolor import colored
+
+from .api.conditional import get_dataset_generation
+from .config import get_settings
+from .db import get_db_manager
+from .excel_parser import download_excel_file, parse_excel_content
+from .html_parser import get_all_xls_links
+from .instrumentation import IngestStage, run_report, stage
+from .models import IngestJobState
+
+
+async def get_page_links(*, full_crawl: bool = False) -> None:
+    """Fetch trade data links from website pages into the ingest job queue.
+
+    Iterates through pages, newest bulletins first, and adds every found
+    excel link as an ingest job. Already known links are skipped by the
+    database. The page to resume from is saved after every page, so an
+    interrupted crawl continues where it stopped on the next run. A crawl
+    is completed at the start date or the last page, and later crawls stop
+    at bulletins older than the newest one seen by the completed crawl, as
+    all of them were discovered already.
+
+    Args:
+        full_crawl: Whether to fetch every page back to the start date from
+            the first one, e.g. to find bulletins removed from the queue.
+
+    """
+    db_manager = get_db_manager()
+    progress = await db_manager.get_discovery_progress()
+    discovered_until: date | None = progress["discovered_until"]
+    counter: int = 1
+    crawl_until: date | None = None
+    if progress["next_page"] and not full_crawl:
+        counter = progress["next_page"]
+        crawl_until = progress["crawl_until"]
+        logging.info(
+            colored(f"Resuming interrupted crawl from page {counter}", "cyan"),
+        )
+    completed: bool = False
+    while not completed:
+        url: str = f"{get_settings().START_URL}?page=page-{counter}"
+        jobs: list[tuple[str, date]] = []
+        logging.info(
+            colored(f"Fetching data from this url: {url}", "magenta"),
+        )
+        with stage(IngestStage.LISTING_FETCH, url) as span:
+            async with (
+                ClientSession() as session,
+                session.get(url) as response,
+            ):
+                span["bytes"] = len(await response.read())
+        with stage(IngestStage.HTML_PARSE, url) as span:
+            # body is already read and cached by the response object
+            containers = await get_all_xls_links(response)
+            span["rows"] = len(containers)
+        if not containers:
+            break
+        for container in containers:
+            date_: list[str] = (
+                container.find("span").get_text().split(".")[::-1]
+            )
+            date_: list[int] = [int(x) for x in date_]
+            trade_date: date = date(*date_)
+            logging.info(
+                colored(f"Took new file from date: {trade_date}", "cyan"),
+            )
+            crawl_until = crawl_until or trade_date
+            if trade_date < get_settings().START_DATE:
+                completed = True
+                logging.warning(
+                    colored("Date is exceed. Exiting...\n", "yellow"),
+                )
+                break
+            if (
+                not full_crawl
+                and discovered_until
+                and trade_date < discovered_until
+            ):
+                completed = True
+                logging.info(
+                    colored("Older bulletins are known. Exiting...", "yellow"),
+                )
+                break
+            link: str = (
+                f"{get_settings().DOMAIN}/{container.find('a').get('href')}"
+            )
+            jobs.append((link, trade_date))
+        added_jobs: int = await db_manager.add_ingest_jobs(jobs)
+        logging.info(
+            colored(f"Added {added_jobs} new jobs to the queue", "green"),
+        )
+        counter += 1
+        if not completed:
+            await db_manager.save_discovery_progress(
+                discovered_until=discovered_until,
+                crawl_until=crawl_until,
+                next_page=counter,
+            )
+    await db_manager.save_discovery_progress(
+        discovered_until=crawl_until or discovered_until,
+        crawl_until=None,
+        next_page=None,
+    )
+
+
+async def fail_ingest_job(job: RowMapping, error: Exception) -> None:
+    """Log the error of an ingest job and mark the job as failed.
+
+    Args:
+        job: Claimed ingest job.
+        error: Error raised while processing the job.
+
+    """
+    logging.error(
+        colored(f"Job for {job['link']} failed with: {error!r}", "red"),
+    )
+    await get_db_manager().set_ingest_job_state(
+        job,
+        IngestJobState.FAILED,
+        error=repr(error),
+    )
+
+
+async def download_ingest_jobs(
+    discovery: Task,
+    downloaded: Queue[tuple[RowMapping, bytes] | None],
+) -> None:
+    """Claim ingest jobs and download their Excel files.
+
+    Runs until there are no more jobs to claim and the discovery of new
+    bulletins is finished. Waits on the bounded queue if parsers are behind.
+
+    Args:
+        discovery: Task which fills the ingest job queue.
+        downloaded: Queue for claimed jobs with content of their files.
+
+    """
+    while True:
+        # checked before claiming, so jobs added right before the end of the
+        # discovery are not missed
+        discovery_finished: bool = discovery.done()
+        job: RowMapping | None = await get_db_manager().claim_ingest_job()
+        if job is None:
+            if discovery_finished:
+                return
+            await sleep(get_settings().INGEST_POLL_INTERVAL)
+            continue
+        logging.info(
+            colored(f"Claimed job for date: {job['trade_date']}", "cyan"),
+        )
+        try:
+            file_content: bytes = await download_excel_file(job["link"])
+        except Exception as error:  # noqa: BLE001
+            await fail_ingest_job(job, error)
+            continue
+        await downloaded.put((job, file_content))
+
+
+async def parse_ingest_jobs(
+    downloaded: Queue[tuple[RowMapping, bytes] | None],
+    parsed: Queue[tuple[RowMapping, DataFrame] | None],
+) -> None:
+    """Parse downloaded Excel files in a thread until the None sentinel.
+
+    Jobs which were reclaimed by another worker while waiting in the queue
+    are dropped, as the new claimer loads them.
+
+    Args:
+        downloaded: Queue with claimed jobs and content of their files.
+        parsed: Queue for jobs with their parsed DataFrames.
+
+    """
+    while (item := await downloaded.get()) is not None:
+        job, file_content = item
+        await get_db_manager().touch_ingest_jobs([job])
+        try:
+            df: DataFrame = await to_thread(
+                parse_excel_content,
+                file_content,
+                job["link"],
+                job["trade_date"],
+            )
+            is_held: bool = await get_db_manager().set_ingest_job_state(
+                job,
+                IngestJobState.PARSED,
+            )
+        except Exception as error:  # noqa: BLE001
+            await fail_ingest_job(job, error)
+            continue
+        if not is_held:
+            logging.warning(
+                colored(
+                    f"Job for {job['link']} was reclaimed. Skipping...",
+                    "yellow",
+                ),
+            )
+            continue
+        await parsed.put((job, df))
+
+
+async def write_ingest_jobs(
+    parsed: Queue[tuple[RowMapping, DataFrame] | None],
+) -> None:
+    """Save parsed jobs to DB in batches until the None sentinel.
+
+    Takes all parsed jobs which are already waiting in the queue, up to the
+    batch size, and saves them in one transaction. If the batch fails, the
+    error is logged and recorded in the span, and jobs are saved one by one,
+    so a single broken bulletin fails only itself. The span counts only rows
+    which were actually written. Once rows are written, the dataset
+    generation of the process is expired, so the API of a scheduled ingest
+    serves new ETags without waiting for DATASET_GENERATION_TTL.
+
+    Args:
+        parsed: Queue with jobs and their parsed DataFrames.
+
+    """
+    finished: bool = False
+    while not finished:
+        if (item := await parsed.get()) is None:
+            return
+        batch: list[tuple[RowMapping, DataFrame]] = [item]
+        while len(batch) < get_settings().INGEST_WRITE_BATCH_SIZE:
+            try:
+                item = parsed.get_nowait()
+            except QueueEmpty:
+                break
+            if item is None:
+                finished = True
+                break
+            batch.append(item)
+        await get_db_manager().touch_ingest_jobs(job for job, _ in batch)
+
+        with stage(IngestStage.DB_INSERT) as span:
+            rows: int = 0
+            try:
+                rows = await get_db_manager().add_new_data_batch(
+                    [(df, job) for job, df in batch],
+                )
+            except Exception as batch_error:
+                logging.exception(
+                    colored(
+                        f"Batch failed, saving {len(batch)} jobs one by one",
+                        "red",
+                    ),
+                )
+                span["error"] = repr(batch_error)
+                for job, df in batch:
+                    try:
+                        rows += await get_db_manager().add_new_data(df, job)
+                    except Exception as error:  # noqa: BLE001
+                        await fail_ingest_job(job, error)
+            span["rows"] = rows
+            span["bulletins"] = len(batch)
+        if rows:
+            # ETags of the API in this process change right away
+            get_dataset_generation().invalidate()
+
+
+async def run_ingest(*, full_crawl: bool = False) -> None:
+    """Discover new bulletins and process the ingest job queue.
+
+    Stages are connected with bounded queues: bulletin discovery fills the
+    ingest job table, downloaders claim jobs from it, parsers decode Excel
+    files in threads and writers save them in batches, so downloads, parsing
+    and DB writes overlap while memory stays bounded. The stages run in a
+    task group, so an error of any stage cancels the others and is raised
+    in an ExceptionGroup instead of leaving them blocked. Timings of every
+    pipeline stage are collected into a run report, which is summarized at
+    the end of the run.
+
+    Args:
+        full_crawl: Whether the discovery fetches every listing page back to
+            the start date instead of stopping at the first known one.
+
+    """
+    settings = get_settings()
+    downloaded: Queue[tuple[RowMapping, bytes] | None] = Queue(
+        settings.INGEST_QUEUE_SIZE,
+    )
+    parsed: Queue[tuple[RowMapping, DataFrame] | None] = Queue(
+        settings.INGEST_QUEUE_SIZE,
+    )
+    with run_report(settings.INGEST_RUN_LOG_PATH):
+        async with TaskGroup() as group:
+            discovery: Task = group.create_task(
+                get_page_links(full_crawl=full_crawl),
+            )
+            downloaders: list[Task] = [
+                group.create_task(download_ingest_jobs(discovery, downloaded))
+                for _ in range(settings.INGEST_WORKERS)
+            ]
+            parsers: list[Task] = [
+                group.create_task(parse_ingest_jobs(downloaded, parsed))
+                for _ in range(settings.INGEST_PARSERS)
+            ]
+            writers: list[Task] = [
+                group.create_task(write_ingest_jobs(parsed))
+                for _ in range(settings.INGEST_WRITERS)
+            ]
+            # wait doesn't raise errors of stages, the group reports them
+            await wait([discovery, *downloaders])
+            for _ in parsers:
+                await downloaded.put(None)
+            await wait(parsers)
+            for _ in writers:
+                await parsed.put(None)
+            await wait(writers)
+
+
+async def run_scheduled_ingest(
+    interval: int,
+    on_run_finished: Callable[[], Awaitable[object]] | None = None,
+) -> None:
+    """Run the ingest pipeline forever with a pause between runs.
+
+    An error of a single run is logged and doesn't stop the schedule. If
+    several processes run the schedule, they share the work through the
+    ingest job queue.
+
+    Args:
+        interval: Seconds to wait after a run before starting the next one.
+        on_run_finished: Coroutine function called after every successful
+            run, e.g. to warm up the cache of the API.
+
+    """
+    while True:
+        logging.info(colored("Starting scheduled ingest run", "cyan"))
+        try:
+            await run_ingest(full_crawl=get_settings().INGEST_FULL_CRAWL)
+        except Exception:
+            logging.exception(colored("Scheduled ingest run failed", "red"))
+        else:
+            if on_run_finished is not None:
+                await on_run_finished()
+        await sleep(interval)
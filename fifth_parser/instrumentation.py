@@ -0,0 +1,224 @@
+"""Instrument the ingest pipeline with per-stage spans and a run report.
+
+Every stage of the pipeline (listing fetch, HTML parse, file download, Excel
+decode, DataFrame clean and DB insert) is wrapped in a span, which records
+its timing, byte and row counts for a bulletin. Spans are collected by the
+run report of the current context, optionally written to a structured JSONL
+run log and summarized in a table at the end of the run, so it's visible if
+a slow run was caused by network, CPU or Postgres.
+"""
+
+import json
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from threading import Lock
+from time import perf_counter, time
+from typing import IO
+from uuid import uuid4
+
+from termcolor import colored
+
+
+class IngestStage(StrEnum):
+    """Define instrumented stages of the ingest pipeline.
+
+    Attributes:
+        LISTING_FETCH: Download of a listing page with bulletin links.
+        HTML_PARSE: Extraction of bulletin links from a listing page.
+        FILE_DOWNLOAD: Download of an Excel bulletin.
+        EXCEL_DECODE: Decoding of an Excel bulletin into a DataFrame.
+        DATAFRAME_CLEAN: Cleaning and filtering of a bulletin DataFrame.
+        DB_INSERT: Insertion of bulletin data into the database.
+
+    """
+
+    LISTING_FETCH = "listing_fetch"
+    HTML_PARSE = "html_parse"
+    FILE_DOWNLOAD = "file_download"
+    EXCEL_DECODE = "excel_decode"
+    DATAFRAME_CLEAN = "dataframe_clean"
+    DB_INSERT = "db_insert"
+
+
+@dataclass
+class Span:
+    """Represent a single finished stage of the pipeline.
+
+    Attributes:
+        name: Name of the pipeline stage.
+        trace_id: ID of the run the span belongs to.
+        span_id: Unique ID of the span.
+        start_time: Unix timestamp of the stage start.
+        duration: Duration of the stage in seconds.
+        attributes: Bulletin, byte and row counts of the stage.
+        error: Representation of the raised error, if any.
+
+    """
+
+    name: str
+    trace_id: str
+    start_time: float
+    duration: float
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+    span_id: str = field(default_factory=lambda: uuid4().hex[:16])
+
+
+class RunReport:
+    """Collect spans of a single ingest run.
+
+    Attributes:
+        run_id: Unique ID of the run, used as trace ID of its spans.
+        spans: All finished spans of the run.
+
+    """
+
+    def __init__(self, log_path: Path | None = None) -> None:
+        """Initialize the report and open the JSONL run log if needed.
+
+        Args:
+            log_path: Path of the JSONL run log, spans are appended to it.
+
+        """
+        self.run_id: str = uuid4().hex
+        self.spans: list[Span] = []
+        # stages can be recorded from threads, e.g. CPU-bound Excel parsing
+        self._lock: Lock = Lock()
+        self._log_file: IO | None = (
+            log_path.open("a", encoding="utf-8") if log_path else None
+        )
+
+    def record(self, span: Span) -> None:
+        """Add a finished span to the report and to the run log.
+
+        Args:
+            span: Finished span of a pipeline stage.
+
+        """
+        with self._lock:
+            self.spans.append(span)
+            if self._log_file is not None:
+                self._log_file.write(
+                    json.dumps(asdict(span), default=str) + "\n",
+                )
+
+    def close(self) -> None:
+        """Flush and close the JSONL run log."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def summary_table(self) -> str:
+        """Build a summary table with totals per pipeline stage.
+
+        Returns:
+            str: Table with span count, errors, total and average time,
+                bytes and rows for every stage that was recorded.
+
+        """
+        header: str = (
+            f"{'stage':<16}{'spans':>7}{'errors':>7}{'total s':>10}"
+            f"{'avg ms':>10}{'max ms':>10}{'MiB':>9}{'rows':>9}"
+        )
+        lines: list[str] = [header, "-" * len(header)]
+        for stage_name in IngestStage:
+            spans: list[Span] = [
+                span for span in self.spans if span.name == stage_name
+            ]
+            if not spans:
+                continue
+            durations: list[float] = [span.duration for span in spans]
+            total_bytes: int = sum(
+                span.attributes.get("bytes", 0) for span in spans
+            )
+            total_rows: int = sum(
+                span.attributes.get("rows", 0) for span in spans
+            )
+            lines.append(
+                f"{stage_name:<16}{len(spans):>7}"
+                f"{sum(span.error is not None for span in spans):>7}"
+                f"{sum(durations):>10.2f}"
+                f"{sum(durations) / len(spans) * 1000:>10.1f}"
+                f"{max(durations) * 1000:>10.1f}"
+                f"{total_bytes / 2**20:>9.2f}{total_rows:>9}",
+            )
+        return "\n".join(lines)
+
+
+_current_report: ContextVar[RunReport | None] = ContextVar(
+    "current_report",
+    default=None,
+)
+
+
+@contextmanager
+def run_report(log_path: Path | None = None) -> Iterator[RunReport]:
+    """Collect spans of the pipeline stages run inside this context.
+
+    Tasks created inside the context inherit the report, so concurrent
+    workers record their spans into the same report. The summary table is
+    logged when the context exits.
+
+    Args:
+        log_path: Path of the JSONL run log, if spans should be written.
+
+    Yields:
+        RunReport: Report of the current run.
+
+    """
+    report: RunReport = RunReport(log_path)
+    token = _current_report.set(report)
+    try:
+        yield report
+    finally:
+        _current_report.reset(token)
+        report.close()
+        logging.info(
+            colored(f"Ingest run report:\n{report.summary_table()}", "blue"),
+        )
+
+
+@contextmanager
+def stage(name: IngestStage, bulletin: str | None = None) -> Iterator[dict]:
+    """Record a span of a pipeline stage into the current run report.
+
+    Does nothing except yielding if there is no active run report, so the
+    instrumented code can be used outside of the ingest run as well.
+
+    Args:
+        name: Name of the pipeline stage.
+        bulletin: Link of the bulletin or page the stage works on.
+
+    Yields:
+        dict: Span attributes, where the stage can put "bytes" and "rows",
+            and "error" with an error it handled without raising.
+
+    """
+    attributes: dict = {"bulletin": bulletin}
+    start_time: float = time()
+    start: float = perf_counter()
+    error: str | None = None
+    try:
+        yield attributes
+    except Exception as exc:
+        error = repr(exc)
+        raise
+    finally:
+        error = error or attributes.pop("error", None)
+        report: RunReport | None = _current_report.get()
+        if report is not None:
+            report.record(
+                Span(
+                    name=name,
+                    trace_id=report.run_id,
+                    start_time=start_time,
+                    duration=perf_counter() - start,
+                    attributes=attributes,
+                    error=error,
+                ),
+            )
@@ -1,76 +1,110 @@
 """Main module for the application.
 
-This module contains the main logic for the application, including
-asynchronous parsing trade data from the website, saving it to the database
-and starting the FastAPI server.
+This module contains the command line interface of the application with
+separate commands for parsing trade data from the website into the database
+and for starting the FastAPI server.
 """
 
 import logging
-from asyncio import Task, as_completed, create_task, run
-from datetime import date
+from argparse import ArgumentParser, Namespace
+from asyncio import run
 from time import time
 
 import uvicorn
-from aiohttp import ClientSession
 from termcolor import colored
 
 from .config import get_settings
-from .db import DBManager
-from .excel_parser import parse_excel_file
-from .html_parser import get_all_xls_links
+from .ingest import run_ingest
 
-db_manager = DBManager()
 
+def parse(arguments: Namespace) -> None:
+    """Parse trade data from the website and save it to the database.
 
-async def get_page_links() -> None:
-    """Fetch and parse trade data from website pages.
+    Args:
+        arguments: Parsed command line arguments with the full crawl flag.
 
-    Iterates through pages, extracts excel links, and saves data to DB.
     """
-    if await db_manager.check_if_data_exists():
-        logging.warning(
-            colored(
-                "Data in DB already exists, exiting without parsing...",
-                "yellow",
-            ),
-        )
-        return
-    counter: int = 1
-    correct_date: bool = True
-    db_tasks: list[Task] = []
-    while correct_date:
-        url: str = f"{get_settings().START_URL}?page=page-{counter}"
-        async with ClientSession() as session, session.get(url) as response:
-            logging.info(
-                colored(f"Fetching data from this url: {url}", "magenta"),
-            )
-            for container in await get_all_xls_links(response):
-                date_: list[str] = (
-                    container.find("span").get_text().split(".")[::-1]
-                )
-                date_: list[int] = [int(x) for x in date_]
-                trade_date: date = date(*date_)
-                logging.info(
-                    colored(f"Took new file from date: {trade_date}", "cyan"),
-                )
-                if trade_date < get_settings().START_DATE:
-                    correct_date = False
-                    logging.warning(
-                        colored("Date is exceed. Exiting...\n", "yellow"),
-                    )
-                    break
-                link: str = (
-                    f"{get_settings().DOMAIN}/"
-                    f"{container.find('a').get('href')}"
-                )
-                task: Task = create_task(
-                    parse_excel_file(link, trade_date),
-                )
-                db_tasks.append(task)
-            async for task in as_completed(db_tasks):
-                await db_manager.add_new_data(task.result())
-            db_tasks.clear()
-            counter += 1
+    logging.info(colored("Starting SPIMEX trade data parser", "cyan"))
+    start_time: float = time()
+    run(run_ingest(full_crawl=arguments.full_crawl))
+    logging.info(
+        colored(
+            text=f"Data successfully collected for "
+            f"{round(time() - start_time, 2)} seconds",
+            color="green",
+            attrs=["bold"],
+        ),
+    )
+
+
+def serve(arguments: Namespace) -> None:
+    """Start the uvicorn server with the FastAPI application.
+
+    Args:
+        arguments: Parsed command line arguments with host, port and number
+            of workers.
+
+    """
+    logging.info(
+        colored(
+            f"Starting uvicorn server with {arguments.workers} workers",
+            "cyan",
+        ),
+    )
+    uvicorn.run(
+        "fifth_parser.api.app:app",
+        host=arguments.host,
+        port=arguments.port,
+        workers=arguments.workers,
+    )
+
+
+def get_argument_parser() -> ArgumentParser:
+    """Build the command line argument parser.
+
+    Returns:
+        ArgumentParser: Parser with 'parse' and 'serve' commands.
+
+    """
+    argument_parser = ArgumentParser(description="SPIMEX trades parser")
+    commands = argument_parser.add_subparsers(required=True)
+
+    parse_command = commands.add_parser(
+        "parse",
+        help="Parse trade data from the website into the database.",
+    )
+    parse_command.add_argument(
+        "--full-crawl",
+        action="store_true",
+        default=get_settings().INGEST_FULL_CRAWL,
+        help="Fetch every listing page back to the start date instead of "
+        "stopping at bulletins discovered by a completed crawl.",
+    )
+    parse_command.set_defaults(handler=parse)
+
+    serve_command = commands.add_parser(
+        "serve",
+        help="Start the API server.",
+    )
+    serve_command.add_argument(
+        "--host",
+        default=get_settings().API_HOST,
+        help="Host to bind the server to.",
+    )
+    serve_command.add_argument(
+        "--port",
+        type=int,
+        default=get_settings().API_PORT,
+        help="Port to bind the server to.",
+    )
+    serve_command.add_argument(
+        "--workers",
+        type=int,
+        default=get_settings().API_WORKERS,
+        help="Number of uvicorn worker processes.",
+    )
+    serve_command.set_defaults(handler=serve)
+    return argument_parser
 
 
 if __name__ == "__main__":
@@ -81,16 +115,5 @@ if __name__ == "__main__":
         style="{",
         level=get_settings().LOG_LEVEL,
     )
-    logging.info(colored("Starting SPIMEX trade data parser", "cyan"))
-    start_time: float = time()
-    run(get_page_links())
-    logging.info(
-        colored(
-            text=f"Data successfully collected for "
-            f"{round(time() - start_time, 2)} seconds, "
-            f"starting uvicorn server now...",
-            color="green",
-            attrs=["bold"],
-        ),
-    )
-    uvicorn.run("fifth_parser.api.app:app", host="0.0.0.0", reload=True)
+    arguments: Namespace = get_argument_parser().parse_args()
+    arguments.handler(arguments)
@@ -0,0 +1,68 @@
+"""Move product and delivery basis names to dictionary tables
+
+Revision ID: 3e8d6b1f0c72
+Revises: 9c1f4e7a2b60
+Create Date: 2026-10-19 14:21:45.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8d6b1f0c72'
+down_revision: Union[str, None] = '9c1f4e7a2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name column of trading results, its dictionary table and comment
+NAME_COLUMNS = (
+    ('exchange_product_name', 'spimex_exchange_product_names', 'Full name of the exchange product.'),
+    ('delivery_basis_name', 'spimex_delivery_basis_names', 'Full name of the delivery basis location.'),
+)
+
+
+def upgrade() -> None:
+    for name_column, dictionary_table, _ in NAME_COLUMNS:
+        op.create_table(dictionary_table,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='The integer primary key for the name.'),
+        sa.Column('name', sa.String(length=255), nullable=False, comment='Unique full name.'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        op.execute(
+            f'INSERT INTO {dictionary_table} (name) '
+            f'SELECT DISTINCT {name_column} FROM spimex_trading_results '
+            f'ORDER BY {name_column}'
+        )
+        op.add_column('spimex_trading_results', sa.Column(f'{name_column}_id', sa.Integer(), nullable=True))
+        op.execute(
+            f'UPDATE spimex_trading_results '
+            f'SET {name_column}_id = {dictionary_table}.id '
+            f'FROM {dictionary_table} '
+            f'WHERE spimex_trading_results.{name_column} = {dictionary_table}.name'
+        )
+        op.alter_column('spimex_trading_results', f'{name_column}_id',
+               existing_type=sa.Integer(),
+               nullable=False,
+               comment=f'Key of the {name_column.replace("_", " ")}.')
+        op.create_foreign_key(None, 'spimex_trading_results', dictionary_table, [f'{name_column}_id'], ['id'])
+        op.drop_column('spimex_trading_results', name_column)
+
+
+def downgrade() -> None:
+    for name_column, dictionary_table, comment in NAME_COLUMNS:
+        op.add_column('spimex_trading_results', sa.Column(name_column, sa.String(length=255), nullable=True, comment=comment))
+        op.execute(
+            f'UPDATE spimex_trading_results '
+            f'SET {name_column} = {dictionary_table}.name '
+            f'FROM {dictionary_table} '
+            f'WHERE spimex_trading_results.{name_column}_id = {dictionary_table}.id'
+        )
+        op.alter_column('spimex_trading_results', name_column,
+               existing_type=sa.String(length=255),
+               nullable=False)
+        op.drop_column('spimex_trading_results', f'{name_column}_id')
+        op.drop_table(dictionary_table)
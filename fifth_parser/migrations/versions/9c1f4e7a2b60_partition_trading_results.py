@@ -0,0 +1,119 @@
+"""Partition trading results by month
+
+Revision ID: 9c1f4e7a2b60
+Revises: 5b7e2c9a41d3
+Create Date: 2026-10-19 11:02:17.904126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1f4e7a2b60'
+down_revision: Union[str, None] = '5b7e2c9a41d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    'exchange_product_id, exchange_product_name, oil_id, delivery_basis_id, '
+    'delivery_basis_name, delivery_type_id, volume, total, count, date, '
+    'created_on, updated_on, id'
+)
+
+
+def trading_results_columns() -> list[sa.Column]:
+    return [
+        sa.Column('exchange_product_id', sa.String(length=255), nullable=False, comment='Unique identifier for the exchange product.'),
+        sa.Column('exchange_product_name', sa.String(length=255), nullable=False, comment='Full name of the exchange product.'),
+        sa.Column('oil_id', sa.String(length=4), nullable=False, comment='4-character identifier for the oil type'),
+        sa.Column('delivery_basis_id', sa.String(length=3), nullable=False, comment='3-character code for delivery basis'),
+        sa.Column('delivery_basis_name', sa.String(length=255), nullable=False, comment='Full name of the delivery basis location.'),
+        sa.Column('delivery_type_id', sa.String(length=1), nullable=False, comment='Single character identifying delivery type'),
+        sa.Column('volume', sa.Integer(), nullable=False, comment='Total trading volume for the product.'),
+        sa.Column('total', sa.Integer(), nullable=False, comment='Total monetary value of trades'),
+        sa.Column('count', sa.Integer(), nullable=False, comment='Number of trades executed'),
+        sa.Column('date', sa.Date(), nullable=False, comment='Date of the trading results'),
+        sa.Column('created_on', sa.DateTime(), nullable=False, comment='Record creation timestamp, auto-set to now'),
+        sa.Column('updated_on', sa.DateTime(), nullable=False, comment='Last update timestamp, auto-set to now'),
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False, comment='The numeric primary key for the model.'),
+    ]
+
+
+def rename_to_old_table() -> None:
+    op.rename_table('spimex_trading_results', 'spimex_trading_results_old')
+    op.execute(
+        'ALTER SEQUENCE spimex_trading_results_id_seq '
+        'RENAME TO spimex_trading_results_old_id_seq'
+    )
+    op.execute(
+        'ALTER TABLE spimex_trading_results_old '
+        'RENAME CONSTRAINT spimex_trading_results_pkey '
+        'TO spimex_trading_results_old_pkey'
+    )
+
+
+def move_rows_from_old_table() -> None:
+    op.execute(
+        f'INSERT INTO spimex_trading_results ({COLUMNS}) '
+        f'SELECT {COLUMNS} FROM spimex_trading_results_old'
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('spimex_trading_results', 'id'), "
+        'coalesce(max(id), 0) + 1, false) FROM spimex_trading_results'
+    )
+    op.drop_table('spimex_trading_results_old')
+
+
+def upgrade() -> None:
+    rename_to_old_table()
+    op.create_table('spimex_trading_results',
+    *trading_results_columns(),
+    sa.PrimaryKeyConstraint('id', 'date'),
+    postgresql_partition_by='RANGE (date)'
+    )
+    op.create_index(op.f('ix_spimex_trading_results_date'), 'spimex_trading_results', ['date'], unique=False)
+    op.execute(
+        'CREATE TABLE spimex_trading_results_default '
+        'PARTITION OF spimex_trading_results DEFAULT'
+    )
+    # monthly partitions for already loaded data, next ones are created by
+    # the ingest before inserting
+    op.execute(
+        """
+        DO $$
+        DECLARE month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(first_month, last_month, '1 month')
+                FROM (
+                    SELECT date_trunc('month', min(date)) AS first_month,
+                           date_trunc('month', max(date)) AS last_month
+                    FROM spimex_trading_results_old
+                ) AS bounds
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE spimex_trading_results_y%sm%s '
+                    'PARTITION OF spimex_trading_results '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYY'),
+                    to_char(month, 'MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    move_rows_from_old_table()
+
+
+def downgrade() -> None:
+    rename_to_old_table()
+    op.create_table('spimex_trading_results',
+    *trading_results_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    move_rows_from_old_table()
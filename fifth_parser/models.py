@@ -7,11 +7,42 @@ primary keys, and the main trading results model.
 Classes:
     Base: The SQLAlchemy declarative base class.
     UuidMixin: Mixin class providing UUID primary key functionality.
+    NameDimensionMixin: Mixin class for dictionaries of repeated names.
+    ExchangeProductName: Dictionary of exchange product names.
+    DeliveryBasisName: Dictionary of delivery basis names.
     SpimexTradingResults: Model for storing SPIMEX trading data.
+    TradingDay: Model for the calendar of loaded trading days.
+    IngestJobState: States of a bulletin in the ingest job queue.
+    IngestJob: Model for the persistent ingest job queue.
+    IngestDiscovery: Model for progress of the discovery of bulletins.
+
+Functions:
+    get_partition_name: Build the name of a monthly trading results partition.
+    get_partition_ddl: Build DDL creating a monthly trading results partition.
 """
 
-from sqlalchemy import BigInteger, Date, DateTime, Integer, String, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from datetime import date
+from enum import StrEnum
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+)
 
 from fourth_db_scheme.sqlalchemy_fix import default_mapped_column
 
@@ -44,6 +75,54 @@ class UuidMixin(Base):
     )
 
 
+class NameDimensionMixin(Base):
+    """Mixin class for dictionaries of names repeated in trading results.
+
+    Trading results reference a name by its small integer key instead of
+    repeating the full name in every row.
+
+    Attributes:
+        id (Mapped[int]): The integer primary key for the name.
+        name (Mapped[str]): Unique full name.
+
+    """
+
+    __abstract__ = True
+    id: Mapped[int] = mapped_column(
+        Integer(),
+        primary_key=True,
+        autoincrement=True,
+        comment="The integer primary key for the name.",
+    )
+    name: Mapped[str] = default_mapped_column(
+        String(255),
+        unique=True,
+        comment="Unique full name.",
+    )
+
+
+class ExchangeProductName(NameDimensionMixin):
+    """Store distinct names of SPIMEX exchange products.
+
+    Table:
+        spimex_exchange_product_names: Stores exchange product names.
+
+    """
+
+    __tablename__ = "spimex_exchange_product_names"
+
+
+class DeliveryBasisName(NameDimensionMixin):
+    """Store distinct names of SPIMEX delivery basis locations.
+
+    Table:
+        spimex_delivery_basis_names: Stores delivery basis names.
+
+    """
+
+    __tablename__ = "spimex_delivery_basis_names"
+
+
 class SpimexTradingResults(UuidMixin):
     """Store SPIMEX trading results data.
 
@@ -53,10 +132,13 @@ class SpimexTradingResults(UuidMixin):
     Attributes:
         id (int): Primary key, automatically generated.
         exchange_product_id (str): Unique identifier for the exchange product.
-        exchange_product_name (str): Full name of the exchange product.
+        exchange_product_name_id (int): Key of the exchange product name.
+        exchange_product_name_entry (ExchangeProductName): Exchange product
+            name.
         oil_id (str): 4-character identifier for the oil type.
         delivery_basis_id (str): 3-character code for delivery basis.
-        delivery_basis_name (str): Full name of the delivery basis location.
+        delivery_basis_name_id (int): Key of the delivery basis name.
+        delivery_basis_name_entry (DeliveryBasisName): Delivery basis name.
         delivery_type_id (str): Single character identifying delivery type.
         volume (int): Total trading volume for the product.
         total (int): Total monetary value of trades.
@@ -66,24 +148,42 @@ class SpimexTradingResults(UuidMixin):
         updated_on (DateTime): Last update timestamp, auto-set to now.
 
     Table:
-        spimex_trading_results: Stores daily SPIMEX trading data.
+        spimex_trading_results: Stores daily SPIMEX trading data, range
+            partitioned by month of the date. Monthly partitions are created
+            by the ingest before inserting data, rows of months without a
+            partition land in the default partition.
 
     Note:
         All string fields use a maximum length of 255 characters except for
         oil_id (4 chars), delivery_basis_id (3 chars), and delivery_type_id
-        (1 char).
+        (1 char). Product and delivery basis names are stored once in their
+        dictionary tables.
 
     """
 
     __tablename__ = "spimex_trading_results"
+    __table_args__ = (
+        # pattern ops serve both equality and prefix (LIKE 'x%') filters
+        Index(
+            "ix_spimex_trading_results_oil_id",
+            "oil_id",
+            postgresql_ops={"oil_id": "varchar_pattern_ops"},
+        ),
+        Index(
+            "ix_spimex_trading_results_delivery_basis_id",
+            "delivery_basis_id",
+            postgresql_ops={"delivery_basis_id": "varchar_pattern_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
     exchange_product_id: Mapped[str] = default_mapped_column(
         String(255),
         comment="Unique identifier for the exchange product.",
     )
-    exchange_product_name: Mapped[str] = default_mapped_column(
-        String(255),
-        comment="Full name of the exchange product.",
+    exchange_product_name_id: Mapped[int] = default_mapped_column(
+        ForeignKey(ExchangeProductName.id),
+        comment="Key of the exchange product name.",
     )
     oil_id: Mapped[str] = default_mapped_column(
         String(4),
@@ -93,9 +193,9 @@ class SpimexTradingResults(UuidMixin):
         String(3),
         comment="3-character code for delivery basis",
     )
-    delivery_basis_name: Mapped[str] = default_mapped_column(
-        String(255),
-        comment="Full name of the delivery basis location.",
+    delivery_basis_name_id: Mapped[int] = default_mapped_column(
+        ForeignKey(DeliveryBasisName.id),
+        comment="Key of the delivery basis name.",
     )
     delivery_type_id: Mapped[str] = default_mapped_column(
         String(1),
@@ -113,8 +213,11 @@ class SpimexTradingResults(UuidMixin):
         Integer(),
         comment="Number of trades executed",
     )
+    # partition key must be a part of the primary key of a partitioned table
     date: Mapped[Date] = default_mapped_column(
         Date(),
+        primary_key=True,
+        index=True,
         comment="Date of the trading results",
     )
     created_on: Mapped[DateTime] = default_mapped_column(
@@ -127,3 +230,243 @@ class SpimexTradingResults(UuidMixin):
         default=func.now(),
         comment="Last update timestamp, auto-set to now",
     )
+
+    exchange_product_name_entry: Mapped[ExchangeProductName] = relationship(
+        lazy="raise",
+    )
+    delivery_basis_name_entry: Mapped[DeliveryBasisName] = relationship(
+        lazy="raise",
+    )
+
+
+def get_partition_name(month: date) -> str:
+    """Build the name of the SpimexTradingResults partition for a month.
+
+    Args:
+        month: Any date of the month.
+
+    Returns:
+        str: Name of the monthly partition table.
+
+    """
+    return f"{SpimexTradingResults.__tablename__}_y{month:%Y}m{month:%m}"
+
+
+def get_partition_ddl(month: date, *, attach: bool = False) -> DDL:
+    """Build DDL creating the SpimexTradingResults partition for a month.
+
+    Args:
+        month: Any date of the month.
+        attach: Whether the table of the partition exists, but was detached,
+            and has to be attached back instead of created.
+
+    Returns:
+        DDL: Statement creating or attaching the monthly partition.
+
+    """
+    start: date = date(month.year, month.month, 1)
+    end: date = (
+        date(start.year + 1, 1, 1)
+        if start.month == 12  # noqa: PLR2004
+        else date(start.year, start.month + 1, 1)
+    )
+    table_name: str = SpimexTradingResults.__tablename__
+    partition_name: str = get_partition_name(start)
+    bounds: str = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    if attach:
+        return DDL(
+            f"ALTER TABLE {table_name} "
+            f"ATTACH PARTITION {partition_name} {bounds}",
+        )
+    return DDL(
+        f"CREATE TABLE IF NOT EXISTS {partition_name} "
+        f"PARTITION OF {table_name} {bounds}",
+    )
+
+
+event.listen(
+    SpimexTradingResults.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT",
+    ),
+)
+
+
+class TradingDay(Base):
+    """Store the calendar of trading days with loaded trading results.
+
+    The calendar is maintained by the ingest in the same transaction as the
+    trading results, so dates can be listed without scanning all trades.
+
+    Attributes:
+        date (Date): Date of the trading day, primary key.
+        rows_count (int): Number of trading results stored for the day.
+        ingested_on (DateTime): Timestamp of the last load for the day.
+
+    Table:
+        spimex_trading_days: Stores one row per loaded trading day.
+
+    """
+
+    __tablename__ = "spimex_trading_days"
+
+    date: Mapped[Date] = mapped_column(
+        Date(),
+        primary_key=True,
+        comment="Date of the trading day",
+    )
+    rows_count: Mapped[int] = default_mapped_column(
+        Integer(),
+        comment="Number of trading results stored for the day",
+    )
+    ingested_on: Mapped[DateTime] = default_mapped_column(
+        DateTime(),
+        default=func.now(),
+        onupdate=func.now(),
+        comment="Timestamp of the last load for the day",
+    )
+
+
+class IngestJobState(StrEnum):
+    """Define states of a bulletin in the ingest job queue.
+
+    Attributes:
+        PENDING: Bulletin is discovered and waits for a worker.
+        DOWNLOADING: Bulletin is claimed by a worker and being downloaded.
+        PARSED: Bulletin is downloaded and parsed, but not saved yet.
+        LOADED: Bulletin data is saved to the database.
+        FAILED: Last attempt to process the bulletin failed.
+
+    """
+
+    PENDING = "pending"
+    DOWNLOADING = "downloading"
+    PARSED = "parsed"
+    LOADED = "loaded"
+    FAILED = "failed"
+
+
+class IngestJob(UuidMixin):
+    """Store SPIMEX bulletins discovered for ingestion.
+
+    Every Excel bulletin found on the SPIMEX website becomes a job, which is
+    claimed by parser workers with ``SELECT ... FOR UPDATE SKIP LOCKED``, so
+    several processes can share one backfill and a crash costs only the
+    in-flight files.
+
+    Attributes:
+        id (int): Primary key, automatically generated.
+        link (str): Unique URL of the Excel bulletin.
+        trade_date (Date): Date of the trading results in the bulletin.
+        state (str): Current state of the job, one of IngestJobState.
+        attempts (int): Number of times the job was claimed by workers,
+            identifies the current claim of the job.
+        error (str | None): Error of the last failed attempt.
+        started_on (DateTime | None): Timestamp of the last claim.
+        finished_on (DateTime | None): Timestamp of the successful load.
+        created_on (DateTime): Record creation timestamp, auto-set to now.
+        updated_on (DateTime): Last update timestamp, auto-set to now.
+
+    Table:
+        spimex_ingest_jobs: Stores the ingest job queue.
+
+    """
+
+    __tablename__ = "spimex_ingest_jobs"
+
+    link: Mapped[str] = default_mapped_column(
+        String(512),
+        unique=True,
+        comment="Unique URL of the Excel bulletin.",
+    )
+    trade_date: Mapped[Date] = default_mapped_column(
+        Date(),
+        comment="Date of the trading results in the bulletin",
+    )
+    state: Mapped[str] = default_mapped_column(
+        String(11),
+        default=IngestJobState.PENDING,
+        index=True,
+        comment="Current state of the job",
+    )
+    attempts: Mapped[int] = default_mapped_column(
+        Integer(),
+        default=0,
+        comment="Number of times the job was claimed by workers",
+    )
+    error: Mapped[str | None] = mapped_column(
+        Text(),
+        comment="Error of the last failed attempt",
+    )
+    started_on: Mapped[DateTime | None] = mapped_column(
+        DateTime(),
+        comment="Timestamp of the last claim",
+    )
+    finished_on: Mapped[DateTime | None] = mapped_column(
+        DateTime(),
+        comment="Timestamp of the successful load",
+    )
+    created_on: Mapped[DateTime] = default_mapped_column(
+        DateTime(),
+        default=func.now(),
+        comment="Record creation timestamp, auto-set to now",
+    )
+    updated_on: Mapped[DateTime] = default_mapped_column(
+        DateTime(),
+        default=func.now(),
+        onupdate=func.now(),
+        comment="Last update timestamp, auto-set to now",
+    )
+
+
+class IngestDiscovery(Base):
+    """Store progress of the discovery of bulletins on listing pages.
+
+    The table has a single row. Listing pages are fetched newest bulletins
+    first, so a crawl which reached the start date or the last page has
+    discovered every bulletin up to the newest one it saw. Later crawls
+    stop at bulletins older than that, and an interrupted crawl is resumed
+    from the page it stopped at instead of stopping at known bulletins.
+
+    Attributes:
+        id (int): Primary key, always 1.
+        discovered_until (Date | None): Newest bulletin date of the last
+            completed crawl, all older bulletins are discovered.
+        crawl_until (Date | None): Newest bulletin date of the crawl in
+            progress.
+        next_page (int | None): Listing page to resume the crawl in
+            progress from, None if no crawl is in progress.
+        updated_on (DateTime): Last update timestamp, auto-set to now.
+
+    Table:
+        spimex_ingest_discovery: Stores the progress of the discovery.
+
+    """
+
+    __tablename__ = "spimex_ingest_discovery"
+
+    id: Mapped[int] = mapped_column(
+        Integer(),
+        primary_key=True,
+        autoincrement=False,
+        comment="Primary key, always 1",
+    )
+    discovered_until: Mapped[Date | None] = mapped_column(
+        Date(),
+        comment="Newest bulletin date of the last completed crawl",
+    )
+    crawl_until: Mapped[Date | None] = mapped_column(
+        Date(),
+        comment="Newest bulletin date of the crawl in progress",
+    )
+    next_page: Mapped[int | None] = mapped_column(
+        Integer(),
+        comment="Listing page to resume the crawl in progress from",
+    )
+    updated_on: Mapped[DateTime] = default_mapped_column(
+        DateTime(),
+        default=func.now(),
+        onupdate=func.now(),
+        comment="Last update timestamp, auto-set to now",
+    )
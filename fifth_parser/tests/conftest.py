@@ -2,7 +2,7 @@
 
 Provides fixtures for:
     - Database connection and session management
-    - Redis cache initialization and cleanup
+    - Cache initialization and cleanup, with any configured cache backend
     - HTTP client setup
     - Test data generation through mixer
     - Date utilities for testing
@@ -16,6 +16,7 @@ from typing import Callable
 
 import pytest
 from asgi_lifespan import LifespanManager
+from fastapi_cache import FastAPICache
 from httpx import ASGITransport, AsyncClient
 from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import (
@@ -30,7 +31,13 @@ from starlette.types import ASGIApp
 from termcolor import colored
 
 from fifth_parser.api.app import app
-from fifth_parser.config import get_db_url, get_redis_url
+from fifth_parser.api.compression import get_compressed_body_cache
+from fifth_parser.config import (
+    CacheBackendType,
+    get_db_url,
+    get_redis_url,
+    get_settings,
+)
 from fifth_parser.models import Base
 from fifth_parser.tests.async_mixer import AsyncMixer
 
@@ -56,10 +63,14 @@ def async_engine() -> AsyncEngine:
 def redis_engine() -> Redis:
     """Create Redis engine instance for test cache.
 
+    Tests using it are skipped if the cache backend isn't Redis.
+
     Returns:
         Redis: Configured Redis client instance.
 
     """
+    if get_settings().CACHE_BACKEND is not CacheBackendType.REDIS:
+        pytest.skip("Cache backend isn't Redis")
     logging.info(
         colored(
             f"Creating redis engine from this redis url: {get_redis_url()}",
@@ -102,14 +113,12 @@ async def async_app(anyio_backend: str) -> ASGIApp:
 async def client(
     anyio_backend: str,
     async_app: ASGIApp,
-    redis_engine: Redis,
 ) -> AsyncClient:
     """Create HTTP test client for making requests to the application.
 
     Args:
         anyio_backend: AnyIO backend configuration.
         async_app: ASGI application instance.
-        redis_engine: Redis client for cache management.
 
     Returns:
         AsyncClient: Configured HTTP test client.
@@ -122,9 +131,10 @@ async def client(
     ) as test_client:
         yield test_client
     logging.info(
-        colored("Clearing redis cache after reaching endpoints", "yellow"),
+        colored("Clearing cache after reaching endpoints", "yellow"),
     )
-    await redis_engine.flushdb()
+    await FastAPICache.clear()
+    get_compressed_body_cache().clear()
 
 
 @pytest.fixture
@@ -223,20 +233,18 @@ async def init_db(anyio_backend: str, async_engine: AsyncEngine) -> Generator:
 
 
 @pytest.fixture(scope="session", autouse=True)
-async def clear_cache(anyio_backend: str, redis_engine: Redis) -> None:
-    """Clear Redis cache before test session starts.
+async def clear_cache(anyio_backend: str, async_app: ASGIApp) -> None:
+    """Clear cache before test session starts.
 
     Args:
         anyio_backend: AnyIO backend configuration.
-        redis_engine: Redis client instance.
+        async_app: ASGI application instance, which initializes the cache.
 
     """
-    result: bool = await redis_engine.flushdb()
     logging.info(
         colored(
-            "Clear cache on startup in case if something was there and "
-            "check that it's successful",
+            "Clear cache on startup in case if something was there",
             "light_cyan",
         ),
     )
-    assert result
+    await FastAPICache.clear()
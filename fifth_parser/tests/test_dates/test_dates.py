@@ -7,12 +7,14 @@ import pytest
 from fastapi import status
 
 from fifth_parser.api.urls import dates
-from fifth_parser.models import SpimexTradingResults
+from fifth_parser.models import TradingDay
 
 pytestmark = [pytest.mark.anyio]
 
 
 if TYPE_CHECKING:
+    from datetime import date
+
     from httpx import Response
 
 
@@ -26,7 +28,7 @@ async def test_get_default_dates(client, mixer, acceptable_dates):
 
     """
     random_date = secrets.choice(tuple(acceptable_dates()))
-    await mixer.async_blend(SpimexTradingResults, date=random_date)
+    await mixer.async_blend(TradingDay, date=random_date)
 
     response: Response = await client.get(dates.url_path_for("get_dates"))
 
@@ -46,9 +48,14 @@ async def test_get_dates(client, mixer, acceptable_dates) -> None:
 
     """
     # if we will use parametrize, it will trigger TRUNCATE after each test, so
+    blended_dates: set[date] = set()
     for count, day in enumerate((1, 125, 365), start=1):
-        random_date = secrets.choice(tuple(acceptable_dates(day)))
-        await mixer.async_blend(SpimexTradingResults, date=random_date)
+        # every trading day is stored once, so dates must not repeat
+        random_date = secrets.choice(
+            tuple(set(acceptable_dates(day)) - blended_dates),
+        )
+        blended_dates.add(random_date)
+        await mixer.async_blend(TradingDay, date=random_date)
 
         response: Response = await client.get(
             dates.url_path_for("get_dates"),
@@ -7,9 +7,12 @@ Fixtures:
     - dataframe_setup: Creates mock Excel files and DataFrames
     - excel_mock_date: Provides a fixed test date
     - mock_aiohttp_session: Sets up mock HTTP client sessions
+    - clean_trading_results: Truncates trading results loaded by a test
+    - clean_ingest_jobs: Truncates ingest jobs and discovery progress
 """
 
 import logging
+from collections.abc import AsyncGenerator
 from datetime import date
 from io import BytesIO
 from typing import Callable
@@ -17,6 +20,8 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from pandas import DataFrame
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
 from termcolor import colored
 
 from fifth_parser.config import NeededColumns, get_settings
@@ -116,3 +121,45 @@ def mock_aiohttp_session(mocker) -> Callable[[BytesIO, str], NotImplemented]:
         mock_response.read = AsyncMock(return_value=bytes_of_file.getvalue())
 
     return wrapper
+
+
+@pytest.fixture
+async def clean_trading_results(
+    session: AsyncSession,
+) -> AsyncGenerator[None]:
+    """Truncate trading results and trading days loaded by a test.
+
+    Data added with DBManager isn't tracked by mixer, so it's removed here.
+
+    Args:
+        session: Active database session.
+
+    """
+    yield
+    logging.info(
+        colored("Truncating loaded trading results", "yellow"),
+    )
+    await session.execute(
+        text("TRUNCATE spimex_trading_results, spimex_trading_days"),
+    )
+    await session.commit()
+
+
+@pytest.fixture
+async def clean_ingest_jobs(
+    session: AsyncSession,
+) -> AsyncGenerator[None]:
+    """Truncate ingest jobs and discovery progress saved by a test.
+
+    Args:
+        session: Active database session.
+
+    """
+    yield
+    logging.info(
+        colored("Truncating ingest jobs", "yellow"),
+    )
+    await session.execute(
+        text("TRUNCATE spimex_ingest_jobs, spimex_ingest_discovery"),
+    )
+    await session.commit()
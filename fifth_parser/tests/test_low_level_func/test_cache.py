@@ -1,6 +1,17 @@
 """Test caching functionality using a Redis engine."""
 
-from fifth_parser.api.urls import dates, trades
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import status
+from fastapi_cache import FastAPICache
+
+from fifth_parser.api.redis_pool import FairConnectionPool
+from fifth_parser.api.urls import cache_metrics, dates, trades
+from fifth_parser.config import get_settings
+
+if TYPE_CHECKING:
+    from httpx import Response
 
 
 async def test_cache(client, redis_engine):
@@ -25,3 +36,81 @@ async def test_cache(client, redis_engine):
     )
     all_redis_keys: list[str] = await redis_engine.keys("*")
     assert len(all_redis_keys) == 2  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("client")
+async def test_cache_many_keys():
+    """Test reading and writing several cache entries at once."""
+    backend = FastAPICache.get_backend()
+    first, second, missing = (
+        f"{FastAPICache.get_prefix()}:{name}"
+        for name in ("first", "second", "missing")
+    )
+    await backend.set_many({first: b"1", second: b"2"}, expire=60)
+
+    assert await backend.get_many([second, missing, first]) == [
+        b"2",
+        None,
+        b"1",
+    ]
+    ttl, value = await backend.get_with_ttl(first)
+    assert value == b"1"
+    assert 0 < ttl <= 60  # noqa: PLR2004
+    assert await backend.get_many([]) == []
+
+
+@pytest.mark.usefixtures("redis_engine")
+async def test_redis_pool_metrics(client):
+    """Test metrics of the Redis connection pool.
+
+    Args:
+        client: An HTTP client for making requests.
+
+    """
+    await client.get(trades.url_path_for("get_trading_results"))
+
+    response: Response = await client.get(
+        cache_metrics.url_path_for("get_redis_pool_metrics"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    metrics: dict = response.json()
+    assert metrics["max_connections"] == get_settings().REDIS_MAX_CONNECTIONS
+    assert metrics["acquired"] > 0
+    assert 0 < metrics["created_connections"] <= metrics["max_connections"]
+    assert metrics["in_use_connections"] == 0
+
+
+@pytest.mark.parametrize(
+    "failing_method",
+    ["make_connection", "can_read_destructive"],
+)
+async def test_redis_pool_frees_slot_of_failed_connection(
+    mocker,
+    failing_method,
+):
+    """Free the slot of a connection which failed to be acquired.
+
+    Args:
+        mocker: pytest mocker fixture.
+        failing_method: Method failing before or after the pool took
+            the connection.
+
+    """
+    pool = FairConnectionPool(max_connections=1, timeout=0.1)
+    connection = mocker.AsyncMock()
+    connection.can_read_destructive.return_value = False
+    mocker.patch.object(pool, "make_connection", return_value=connection)
+    failing = (
+        pool.make_connection
+        if failing_method == "make_connection"
+        else connection.can_read_destructive
+    )
+    failing.side_effect = OSError("Connection refused")
+
+    with pytest.raises(OSError, match="Connection refused"):
+        await pool.get_connection("GET")
+
+    failing.side_effect = None
+    assert await pool.get_connection("GET") is connection
+    await pool.release(connection)
+    assert await pool.get_connection("GET") is connection
@@ -0,0 +1,97 @@
+"""Test cache backends which don't need a Redis server."""
+
+import pytest
+
+from fifth_parser.api import cache_backends
+from fifth_parser.api.cache_backends import MemoryBackend, SQLiteBackend
+
+pytestmark = [pytest.mark.anyio]
+
+
+async def test_memory_backend_expiration(mocker):
+    """Test that entries of the memory backend expire after their TTL.
+
+    Args:
+        mocker: pytest-mock fixture.
+
+    """
+    clock = mocker.patch.object(cache_backends, "monotonic", return_value=0)
+    backend = MemoryBackend(max_size=100)
+    await backend.set("cache:key", b"value", expire=10)
+    await backend.set("cache:forever", b"value")
+
+    assert await backend.get_with_ttl("cache:key") == (10, b"value")
+    assert await backend.get_with_ttl("cache:forever") == (-1, b"value")
+    clock.return_value = 10
+    assert await backend.get_with_ttl("cache:key") == (0, None)
+    assert await backend.get("cache:forever") == b"value"
+    assert backend.size == len(b"value")
+
+
+async def test_memory_backend_eviction():
+    """Test that the least recently used entries are evicted over the cap."""
+    backend = MemoryBackend(max_size=10)
+    await backend.set_many({"cache:first": b"1234", "cache:second": b"1234"})
+    # reading makes the first entry the most recently used one
+    assert await backend.get("cache:first") == b"1234"
+    await backend.set("cache:third", b"1234")
+    await backend.set("cache:too_large", b"12345678901")
+
+    assert await backend.get_many(
+        ["cache:first", "cache:second", "cache:third", "cache:too_large"],
+    ) == [b"1234", None, b"1234", None]
+    assert backend.size == 8  # noqa: PLR2004
+
+    assert await backend.clear(namespace="cache") == 2  # noqa: PLR2004
+    assert backend.size == 0
+
+
+async def test_sqlite_backend_is_shared(tmp_path):
+    """Test that backends of several workers share the SQLite database.
+
+    Args:
+        tmp_path: pytest fixture with a temporary directory.
+
+    """
+    first_worker = SQLiteBackend(tmp_path / "cache.db")
+    second_worker = SQLiteBackend(tmp_path / "cache.db")
+    try:
+        await first_worker.set_many(
+            {"cache:first": b"1", "cache:second": b"2"},
+            expire=60,
+        )
+        await first_worker.set("other:key", b"3")
+
+        assert await second_worker.get_many(
+            ["cache:second", "cache:missing", "cache:first"],
+        ) == [b"2", None, b"1"]
+        ttl, value = await second_worker.get_with_ttl("cache:first")
+        assert value == b"1"
+        assert 0 < ttl <= 60  # noqa: PLR2004
+        assert await second_worker.get_with_ttl("other:key") == (-1, b"3")
+
+        assert await second_worker.clear(namespace="cache") == 2  # noqa: PLR2004
+        assert await first_worker.get("cache:first") is None
+        assert await first_worker.get("other:key") == b"3"
+    finally:
+        await first_worker.close()
+        await second_worker.close()
+
+
+async def test_sqlite_backend_expiration(tmp_path, mocker):
+    """Test that expired entries of the SQLite backend are not returned.
+
+    Args:
+        tmp_path: pytest fixture with a temporary directory.
+        mocker: pytest-mock fixture.
+
+    """
+    clock = mocker.patch.object(cache_backends, "time", return_value=0)
+    backend = SQLiteBackend(tmp_path / "cache.db")
+    try:
+        await backend.set("cache:key", b"value", expire=10)
+        assert await backend.get("cache:key") == b"value"
+        clock.return_value = 10
+        assert await backend.get_with_ttl("cache:key") == (0, None)
+    finally:
+        await backend.close()
@@ -0,0 +1,16 @@
+"""Test cold start of the API process."""
+
+from fifth_parser.benchmarks.cold_start import (
+    APP_MODULE,
+    PARSER_ONLY_MODULES,
+    measure_import_time,
+)
+
+
+def test_api_doesnt_import_parser_modules():
+    """Test that the API doesn't import modules used only by the parser."""
+    import_times = measure_import_time()
+
+    assert APP_MODULE in import_times
+    for module in PARSER_ONLY_MODULES:
+        assert module not in import_times
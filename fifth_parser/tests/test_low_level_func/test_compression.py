@@ -0,0 +1,124 @@
+"""Test compression of API responses."""
+
+from gzip import decompress
+
+import pytest
+from anyio import to_thread
+
+from fifth_parser.api.compression import (
+    SUPPORTED_ENCODINGS,
+    CompressedBodyCache,
+    choose_encoding,
+    compress,
+    get_compressed_body_cache,
+)
+from fifth_parser.api.urls import trades
+from fifth_parser.config import get_settings
+from fifth_parser.models import SpimexTradingResults
+
+pytestmark = [pytest.mark.anyio]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0, deflate", None),
+        ("identity", None),
+        ("", None),
+        ("*", SUPPORTED_ENCODINGS[0]),
+    ],
+)
+def test_choose_encoding(accept_encoding, encoding):
+    """Test choosing of the encoding from the Accept-Encoding header.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding header.
+        encoding: Expected content encoding.
+
+    """
+    assert choose_encoding(accept_encoding) == encoding
+
+
+def test_compressed_body_cache_evicts_least_recently_used():
+    """Test that the cache stays within its size limit."""
+    cache = CompressedBodyCache(max_size=10)
+    cache.set('"first"', "gzip", b"12345")
+    cache.set('"second"', "gzip", b"12345")
+    assert cache.get('"first"', "gzip") == b"12345"
+
+    cache.set('"third"', "gzip", b"12345")
+    assert cache.get('"second"', "gzip") is None
+    assert cache.get('"first"', "gzip") == b"12345"
+    assert cache.size == 10  # noqa: PLR2004
+
+
+async def test_compressed_trading_results(client, mixer, acceptable_dates):
+    """Test that large responses are compressed and cached compressed.
+
+    Args:
+        client: An HTTP client for making requests.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+
+    """
+    for trade_date in tuple(acceptable_dates())[:10]:
+        await mixer.async_blend(SpimexTradingResults, date=trade_date)
+
+    response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert response.headers.get("ETag").startswith("W/")
+    assert "Accept-Encoding" in response.headers.get("Vary")
+    assert len(response.json().get("trades")) == 10  # noqa: PLR2004
+    assert get_compressed_body_cache().size > 0
+
+    cached_response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert cached_response.content == response.content
+
+    plain_response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "Content-Encoding" not in plain_response.headers
+    assert decompress(compress(plain_response.content, "gzip")) == (
+        plain_response.content
+    )
+
+
+async def test_large_bodies_compressed_in_thread(
+    client,
+    mixer,
+    mocker,
+    acceptable_dates,
+):
+    """Test that bodies above the threshold are compressed off the loop.
+
+    Args:
+        client: An HTTP client for making requests.
+        mixer: pytest-mixer fixture.
+        mocker: pytest mocker fixture.
+        acceptable_dates: Fixture for acceptable dates.
+
+    """
+    for trade_date in tuple(acceptable_dates())[:10]:
+        await mixer.async_blend(SpimexTradingResults, date=trade_date)
+    mocker.patch.object(get_settings(), "COMPRESSION_THREAD_MIN_SIZE", 0)
+    run_sync = mocker.patch(
+        "fifth_parser.api.compression.run_sync",
+        side_effect=to_thread.run_sync,
+    )
+
+    response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert len(response.json().get("trades")) == 10  # noqa: PLR2004
+    run_sync.assert_awaited_once()
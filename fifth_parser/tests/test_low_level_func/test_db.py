@@ -1,13 +1,21 @@
 """Test low-level database functions."""
 
 import secrets
+from asyncio import gather
 
 import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql import text
 
 from fifth_parser.config import AdditionalColumns
 from fifth_parser.db import DBManager
 from fifth_parser.models import (
+    ExchangeProductName,
+    IngestJob,
+    IngestJobState,
     SpimexTradingResults,
+    TradingDay,
 )
 
 pytestmark = [pytest.mark.anyio]
@@ -32,6 +40,7 @@ async def test_check_if_data_exists(async_engine, mixer, acceptable_dates):
     assert await DBManager(async_engine).check_if_data_exists()
 
 
+@pytest.mark.usefixtures("clean_trading_results")
 async def test_add_new_data_and_get(
     async_engine,
     acceptable_dates,
@@ -60,6 +69,366 @@ async def test_add_new_data_and_get(
     )
     await DBManager(async_engine).add_new_data(df)
     assert await DBManager(async_engine).check_if_data_exists()
-    assert len(
-        await DBManager(async_engine).get_spimex_trading_results(),
-    ) == len(test_rows)
+    trading_results = await DBManager(
+        async_engine,
+    ).get_spimex_trading_results()
+    assert len(trading_results) == len(test_rows)
+    assert {row["exchange_product_name"] for row in trading_results} == set(
+        test_rows,
+    )
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_updates_trading_days(
+    async_engine,
+    session,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Count rows of every loaded trading day in the calendar.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    first_df, _ = dataframe_setup(["1457843", "8894849"])
+    second_df, _ = dataframe_setup(["2683303"])
+    for df in (first_df, second_df):
+        df.loc[:, AdditionalColumns.DATE.value] = trade_date
+
+    db_manager = DBManager(async_engine)
+    await db_manager.add_new_data(first_df)
+    await db_manager.add_new_data(second_df)
+
+    trading_day = await session.get(TradingDay, trade_date)
+    assert trading_day.rows_count == len(first_df) + len(second_df)
+    assert await db_manager.get_trading_days(trade_date) == [
+        {"date": trade_date},
+    ]
+
+
+async def blend_parsed_jobs(session, mixer, trade_dates):
+    """Create parsed ingest jobs of bulletins of trading dates.
+
+    Args:
+        session: Async SQLAlchemy session.
+        mixer: pytest-mixer fixture.
+        trade_dates: Trading dates of the bulletins.
+
+    Returns:
+        list[RowMapping]: Claimed jobs with their IDs and attempts.
+
+    """
+    links = [f"file{number}.xls" for number in range(len(trade_dates))]
+    for link, trade_date in zip(links, trade_dates, strict=True):
+        await mixer.async_blend(
+            IngestJob,
+            link=link,
+            trade_date=trade_date,
+            state=IngestJobState.PARSED,
+            attempts=1,
+        )
+    jobs = await session.execute(
+        select(IngestJob.id, IngestJob.attempts)
+        .where(IngestJob.link.in_(links))
+        .order_by(IngestJob.link),
+    )
+    return list(jobs.mappings())
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_batch(
+    async_engine,
+    session,
+    mixer,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Load several bulletins and mark their jobs as loaded at once.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    first_df, _ = dataframe_setup(["1457843", "8894849"])
+    second_df, _ = dataframe_setup(["2683303"])
+    for df in (first_df, second_df):
+        df.loc[:, AdditionalColumns.DATE.value] = trade_date
+    jobs = await blend_parsed_jobs(session, mixer, [trade_date, trade_date])
+    job_ids = [job["id"] for job in jobs]
+
+    await DBManager(async_engine).add_new_data_batch(
+        list(zip((first_df, second_df), jobs, strict=True)),
+    )
+
+    rows_count = await session.scalar(
+        select(func.count()).select_from(SpimexTradingResults),
+    )
+    assert rows_count == len(first_df) + len(second_df)
+    states = await session.scalars(
+        select(IngestJob.state).where(IngestJob.id.in_(job_ids)),
+    )
+    assert set(states) == {IngestJobState.LOADED}
+    trading_day = await session.get(TradingDay, trade_date)
+    assert trading_day.rows_count == rows_count
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_batch_is_atomic(
+    async_engine,
+    session,
+    mixer,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Load nothing of a batch if one of its bulletins is broken.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    valid_df, _ = dataframe_setup(["1457843"])
+    # the volume doesn't fit its integer column
+    broken_df, _ = dataframe_setup(["9" * 20])
+    for df in (valid_df, broken_df):
+        df.loc[:, AdditionalColumns.DATE.value] = trade_date
+    jobs = await blend_parsed_jobs(session, mixer, [trade_date, trade_date])
+    job_ids = [job["id"] for job in jobs]
+
+    with pytest.raises(DBAPIError):
+        await DBManager(async_engine).add_new_data_batch(
+            list(zip((valid_df, broken_df), jobs, strict=True)),
+        )
+
+    assert await DBManager(async_engine).check_if_data_exists() is False
+    states = await session.scalars(
+        select(IngestJob.state).where(IngestJob.id.in_(job_ids)),
+    )
+    assert set(states) == {IngestJobState.PARSED}
+    assert await session.get(TradingDay, trade_date) is None
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_batch_skips_jobs_not_held(
+    async_engine,
+    session,
+    mixer,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Skip data of jobs which were reclaimed or are already loaded.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    reclaimed_df, _ = dataframe_setup(["1457843", "8894849"])
+    held_df, _ = dataframe_setup(["2683303"])
+    for df in (reclaimed_df, held_df):
+        df.loc[:, AdditionalColumns.DATE.value] = trade_date
+    reclaimed_job, held_job = await blend_parsed_jobs(
+        session,
+        mixer,
+        [trade_date, trade_date],
+    )
+    # another worker claimed the job again after the timeout
+    await session.execute(
+        update(IngestJob)
+        .where(IngestJob.id == reclaimed_job["id"])
+        .values(state=IngestJobState.DOWNLOADING, attempts=2),
+    )
+    await session.commit()
+
+    db_manager = DBManager(async_engine)
+    rows_count = await db_manager.add_new_data_batch(
+        [(reclaimed_df, reclaimed_job), (held_df, held_job)],
+    )
+    assert rows_count == len(held_df)
+    # the job is loaded already, e.g. by a worker which held it before
+    assert await db_manager.add_new_data(held_df, held_job) == 0
+
+    stored_rows_count = await session.scalar(
+        select(func.count()).select_from(SpimexTradingResults),
+    )
+    assert stored_rows_count == len(held_df)
+    reclaimed_state = await session.scalar(
+        select(IngestJob.state).where(IngestJob.id == reclaimed_job["id"]),
+    )
+    assert reclaimed_state == IngestJobState.DOWNLOADING
+    trading_day = await session.get(TradingDay, trade_date)
+    assert trading_day.rows_count == len(held_df)
+
+
+async def test_resolve_name_keys(async_engine):
+    """Add every name to its dictionary table only once.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+
+    """
+    db_manager = DBManager(async_engine)
+    name_keys = await db_manager.resolve_name_keys(
+        ExchangeProductName,
+        {"Product A", "Product B"},
+    )
+    assert name_keys["Product A"] != name_keys["Product B"]
+
+    # another process doesn't have the keys cached and reads existing ones
+    other_name_keys = await DBManager(async_engine).resolve_name_keys(
+        ExchangeProductName,
+        {"Product A", "Product C"},
+    )
+    assert other_name_keys["Product A"] == name_keys["Product A"]
+    assert other_name_keys["Product C"] not in name_keys.values()
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_creates_partition(
+    async_engine,
+    session,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Store new data in the monthly partition of its trading date.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    partition = f"spimex_trading_results_y{trade_date:%Y}m{trade_date:%m}"
+    df, _ = dataframe_setup(["1457843", "8894849"])
+    df.loc[:, AdditionalColumns.DATE.value] = trade_date
+
+    await DBManager(async_engine).add_new_data(df)
+
+    rows_count = await session.scalar(
+        text(f"SELECT count(*) FROM {partition}"),  # noqa: S608
+    )
+    assert rows_count == len(df)
+
+
+@pytest.mark.usefixtures("clean_trading_results")
+async def test_add_new_data_attaches_detached_partition(
+    async_engine,
+    session,
+    acceptable_dates,
+    dataframe_setup,
+):
+    """Attach back the partition of a month detached after it was created.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        session: Async SQLAlchemy session.
+        acceptable_dates: Fixture for acceptable dates.
+        dataframe_setup: Fixture for dataframe setup.
+
+    """
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    partition = f"spimex_trading_results_y{trade_date:%Y}m{trade_date:%m}"
+    first_df, _ = dataframe_setup(["1457843", "8894849"])
+    second_df, _ = dataframe_setup(["2683303"])
+    for df in (first_df, second_df):
+        df.loc[:, AdditionalColumns.DATE.value] = trade_date
+
+    db_manager = DBManager(async_engine)
+    await db_manager.add_new_data(first_df)
+    detach = f"ALTER TABLE spimex_trading_results DETACH PARTITION {partition}"
+    await session.execute(text(detach))
+    await session.commit()
+    await db_manager.add_new_data(second_df)
+
+    rows_count = await session.scalar(
+        text(f"SELECT count(*) FROM {partition}"),  # noqa: S608
+    )
+    assert rows_count == len(first_df) + len(second_df)
+    default_rows_count = await session.scalar(
+        text("SELECT count(*) FROM spimex_trading_results_default"),
+    )
+    assert default_rows_count == 0
+
+
+async def test_add_ingest_jobs(async_engine, mixer, acceptable_dates):
+    """Add only new bulletins to the ingest job queue.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+
+    """
+    known_link = "known.xls"
+    trade_date = secrets.choice(tuple(acceptable_dates()))
+    await mixer.async_blend(
+        IngestJob,
+        link=known_link,
+        trade_date=trade_date,
+        state=IngestJobState.LOADED,
+        attempts=1,
+    )
+
+    added_jobs = await DBManager(async_engine).add_ingest_jobs(
+        [(known_link, trade_date), ("new.xls", trade_date)],
+    )
+    assert added_jobs == 1
+
+
+async def test_claim_ingest_job(async_engine, mixer, acceptable_dates):
+    """Claim every pending job exactly once by concurrent workers.
+
+    Args:
+        async_engine: Async SQLAlchemy engine.
+        mixer: pytest-mixer fixture.
+        acceptable_dates: Fixture for acceptable dates.
+
+    """
+    for link in ("file1.xls", "file2.xls"):
+        await mixer.async_blend(
+            IngestJob,
+            link=link,
+            trade_date=secrets.choice(tuple(acceptable_dates())),
+            state=IngestJobState.PENDING,
+            attempts=0,
+        )
+
+    db_manager = DBManager(async_engine)
+    first_job, second_job = await gather(
+        db_manager.claim_ingest_job(),
+        db_manager.claim_ingest_job(),
+    )
+    assert first_job is not None
+    assert second_job is not None
+    assert first_job["id"] != second_job["id"]
+    assert await db_manager.claim_ingest_job() is None
+    # a stale claim of the job can't move it anymore
+    stale_job = {"id": first_job["id"], "attempts": first_job["attempts"] - 1}
+    assert not await db_manager.set_ingest_job_state(
+        stale_job,
+        IngestJobState.FAILED,
+    )
+    assert await db_manager.set_ingest_job_state(
+        first_job,
+        IngestJobState.PARSED,
+    )
@@ -0,0 +1,418 @@
+"""Test stages of the ingest pipeline in fifth_parser.ingest."""
+
+from asyncio import Event, Queue, create_task, timeout, wait_for
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from bs4 import BeautifulSoup
+from pandas import DataFrame
+from sqlalchemy import func, select
+
+from fifth_parser.api.conditional import get_dataset_generation
+from fifth_parser.config import get_settings
+from fifth_parser.db import DBManager
+from fifth_parser.ingest import (
+    download_ingest_jobs,
+    get_page_links,
+    parse_ingest_jobs,
+    run_ingest,
+    write_ingest_jobs,
+)
+from fifth_parser.instrumentation import run_report
+from fifth_parser.models import IngestJob, IngestJobState
+
+pytestmark = [pytest.mark.anyio]
+
+
+# bulletins of listing pages by page numbers, newest ones first
+LISTING_PAGES = {
+    1: [("file6.xls", "06.02.2024"), ("file5.xls", "05.02.2024")],
+    2: [("file4.xls", "04.02.2024"), ("file3.xls", "03.02.2024")],
+    3: [("file2.xls", "02.02.2024"), ("file1.xls", "01.02.2024")],
+}
+
+
+@pytest.fixture
+def listing_pages(mocker, async_engine):
+    """Mock listing pages and save discovered bulletins to the test DB.
+
+    Args:
+        mocker: pytest mocker fixture.
+        async_engine: Async SQLAlchemy engine.
+
+    Returns:
+        Callable: Sets bulletins of pages and a page which fails to load,
+            returns the mocked getter of pages.
+
+    """
+    mocker.patch(
+        "fifth_parser.ingest.get_db_manager",
+        return_value=DBManager(async_engine),
+    )
+    mock_session = mocker.patch("fifth_parser.ingest.ClientSession")
+    mock_session = mock_session.return_value
+    mock_session.__aenter__.return_value = mock_session
+    mock_response = mock_session.get.return_value.__aenter__.return_value
+    mock_response.read = mocker.AsyncMock(return_value=b"")
+
+    def wrapper(pages: dict, failing_page: int | None = None) -> MagicMock:
+        def get_all_xls_links(_: object) -> list:
+            url = mock_session.get.call_args.args[0]
+            page = int(url.rsplit("-", 1)[1])
+            if page == failing_page:
+                message = "Listing page is unavailable"
+                raise ConnectionError(message)
+            html = "".join(
+                f'<div class="accordeon-inner__item"><a href="{link}"></a>'
+                f"<span>{trade_date}</span></div>"
+                for link, trade_date in pages.get(page, [])
+            )
+            return BeautifulSoup(html, "html.parser").select(
+                "div.accordeon-inner__item",
+            )
+
+        mocker.patch(
+            "fifth_parser.ingest.get_all_xls_links",
+            mocker.AsyncMock(side_effect=get_all_xls_links),
+        )
+        return mock_session.get
+
+    return wrapper
+
+
+def fetched_pages(get_page):
+    """Return numbers of fetched listing pages in order.
+
+    Args:
+        get_page: Mocked getter of listing pages.
+
+    Returns:
+        list[int]: Numbers of the pages.
+
+    """
+    return [
+        int(call.args[0].rsplit("-", 1)[1]) for call in get_page.call_args_list
+    ]
+
+
+async def count_ingest_jobs(session):
+    """Count jobs in the ingest job queue.
+
+    Args:
+        session: Async SQLAlchemy session.
+
+    Returns:
+        int: Number of jobs.
+
+    """
+    return await session.scalar(select(func.count()).select_from(IngestJob))
+
+
+@pytest.mark.usefixtures("clean_ingest_jobs")
+async def test_get_page_links_stops_at_discovered_bulletins(
+    session,
+    listing_pages,
+):
+    """Stop paging at bulletins discovered by a completed crawl.
+
+    Args:
+        session: Async SQLAlchemy session.
+        listing_pages: Fixture mocking listing pages.
+
+    """
+    get_page = listing_pages(LISTING_PAGES)
+    await get_page_links()
+    assert fetched_pages(get_page) == [1, 2, 3, 4]
+
+    # a new bulletin moves older ones to the next pages
+    get_page = listing_pages(
+        {
+            1: [("file7.xls", "07.02.2024"), ("file6.xls", "06.02.2024")],
+            2: [("file5.xls", "05.02.2024"), ("file4.xls", "04.02.2024")],
+        },
+    )
+    get_page.reset_mock()
+    await get_page_links()
+
+    assert fetched_pages(get_page) == [1, 2]
+    assert await count_ingest_jobs(session) == 7  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("clean_ingest_jobs")
+async def test_get_page_links_resumes_interrupted_crawl(
+    session,
+    listing_pages,
+):
+    """Continue an interrupted crawl from the page it stopped at.
+
+    Args:
+        session: Async SQLAlchemy session.
+        listing_pages: Fixture mocking listing pages.
+
+    """
+    get_page = listing_pages(LISTING_PAGES, failing_page=2)
+    with pytest.raises(ConnectionError):
+        await get_page_links()
+    assert await count_ingest_jobs(session) == 2  # noqa: PLR2004
+
+    # bulletins of the first page are known, but older ones aren't yet
+    get_page = listing_pages(LISTING_PAGES)
+    get_page.reset_mock()
+    await get_page_links()
+
+    assert fetched_pages(get_page) == [2, 3, 4]
+    assert await count_ingest_jobs(session) == 6  # noqa: PLR2004
+    get_page.reset_mock()
+    await get_page_links()
+    assert fetched_pages(get_page) == [1]
+
+
+@pytest.mark.usefixtures("clean_ingest_jobs")
+async def test_get_page_links_full_crawl(listing_pages):
+    """Fetch every page until the last one on a full crawl.
+
+    Args:
+        listing_pages: Fixture mocking listing pages.
+
+    """
+    get_page = listing_pages(LISTING_PAGES)
+    await get_page_links()
+    get_page.reset_mock()
+
+    await get_page_links(full_crawl=True)
+
+    assert fetched_pages(get_page) == [1, 2, 3, 4]
+
+
+@pytest.fixture
+def ingest_db(mocker):
+    """Mock the DB manager of the pipeline with five pending jobs.
+
+    Args:
+        mocker: pytest mocker fixture.
+
+    Returns:
+        MagicMock: Mocked DB manager.
+
+    """
+    mocker.patch.object(get_settings(), "INGEST_POLL_INTERVAL", 0)
+    jobs = [
+        {
+            "id": day,
+            "link": f"file{day}.xls",
+            "trade_date": date(2024, 1, day),
+            "attempts": 1,
+        }
+        for day in range(1, 6)
+    ]
+    db_manager = mocker.patch("fifth_parser.ingest.get_db_manager")
+    db_manager = db_manager.return_value
+    db_manager.claim_ingest_job = mocker.AsyncMock(
+        side_effect=lambda: jobs.pop(0) if jobs else None,
+    )
+    db_manager.set_ingest_job_state = mocker.AsyncMock(return_value=True)
+    db_manager.touch_ingest_jobs = mocker.AsyncMock()
+    db_manager.add_new_data_batch = mocker.AsyncMock(return_value=1)
+    db_manager.add_new_data = mocker.AsyncMock(return_value=1)
+    return db_manager
+
+
+@pytest.fixture
+def ingest_sources(mocker):
+    """Mock discovery, downloads and parsing of bulletins.
+
+    Args:
+        mocker: pytest mocker fixture.
+
+    """
+    mocker.patch("fifth_parser.ingest.get_page_links", mocker.AsyncMock())
+    mocker.patch(
+        "fifth_parser.ingest.download_excel_file",
+        mocker.AsyncMock(return_value=b"xls"),
+    )
+    mocker.patch(
+        "fifth_parser.ingest.parse_excel_content",
+        side_effect=lambda _, link, trade_date: DataFrame(
+            {"link": [link], "date": [trade_date]},
+        ),
+    )
+
+
+def parsed_item(job_id):
+    """Build a parsed job with a one-row DataFrame.
+
+    Args:
+        job_id: ID of the job.
+
+    Returns:
+        tuple[dict, DataFrame]: Job and its parsed DataFrame.
+
+    """
+    job = {"id": job_id, "link": f"file{job_id}.xls", "attempts": 1}
+    return job, DataFrame({"a": [1]})
+
+
+@pytest.mark.usefixtures("ingest_sources")
+async def test_run_ingest_loads_every_job(ingest_db):
+    """Download, parse and write every claimed job.
+
+    Args:
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    await run_ingest()
+
+    written = [
+        job["id"]
+        for call in ingest_db.add_new_data_batch.await_args_list
+        for _, job in call.args[0]
+    ]
+    assert sorted(written) == [1, 2, 3, 4, 5]
+    assert ingest_db.set_ingest_job_state.await_count == len(written)
+    for call in ingest_db.set_ingest_job_state.await_args_list:
+        assert call.args[1] is IngestJobState.PARSED
+
+
+@pytest.mark.usefixtures("ingest_sources")
+async def test_download_ingest_jobs_waits_for_parsers(ingest_db):
+    """Stop claiming jobs while the queue to the parsers is full.
+
+    Args:
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    # the discovery is still running, so downloaders keep claiming jobs
+    discovery = create_task(Event().wait())
+    downloaded = Queue(1)
+
+    with pytest.raises(TimeoutError):
+        await wait_for(download_ingest_jobs(discovery, downloaded), 0.1)
+    discovery.cancel()
+
+    # the second job waits for a free slot of the queue
+    assert ingest_db.claim_ingest_job.await_count == 2  # noqa: PLR2004
+    assert downloaded.full()
+
+
+@pytest.mark.usefixtures("ingest_sources")
+async def test_parse_ingest_jobs_drops_reclaimed_jobs(ingest_db):
+    """Don't pass jobs reclaimed by another worker to the writers.
+
+    Args:
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    ingest_db.set_ingest_job_state.side_effect = [True, False]
+    downloaded = Queue()
+    for job_id in (1, 2):
+        job, _ = parsed_item(job_id)
+        job["trade_date"] = date(2024, 1, job_id)
+        downloaded.put_nowait((job, b"xls"))
+    downloaded.put_nowait(None)
+    parsed = Queue()
+
+    await parse_ingest_jobs(downloaded, parsed)
+
+    assert parsed.qsize() == 1
+    job, _ = parsed.get_nowait()
+    assert job["id"] == 1
+    assert ingest_db.touch_ingest_jobs.await_count == 2  # noqa: PLR2004
+
+
+async def test_write_ingest_jobs_in_batches(mocker, ingest_db):
+    """Save waiting jobs in batches up to the batch size.
+
+    Args:
+        mocker: pytest mocker fixture.
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    mocker.patch.object(get_settings(), "INGEST_WRITE_BATCH_SIZE", 2)
+    invalidate = mocker.spy(get_dataset_generation(), "invalidate")
+    parsed = Queue()
+    for job_id in (1, 2, 3):
+        parsed.put_nowait(parsed_item(job_id))
+    parsed.put_nowait(None)
+
+    await write_ingest_jobs(parsed)
+
+    assert [
+        [job["id"] for _, job in call.args[0]]
+        for call in ingest_db.add_new_data_batch.await_args_list
+    ] == [[1, 2], [3]]
+    # written batches expire ETags of the API
+    assert invalidate.call_count == 2  # noqa: PLR2004
+
+
+async def test_write_ingest_jobs_falls_back_to_single_jobs(ingest_db):
+    """Save jobs of a failed batch one by one, failing only broken ones.
+
+    Args:
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    ingest_db.add_new_data_batch.side_effect = ValueError("broken batch")
+    ingest_db.add_new_data.side_effect = [1, ValueError("broken"), 1]
+    parsed = Queue()
+    for job_id in (1, 2, 3):
+        parsed.put_nowait(parsed_item(job_id))
+    parsed.put_nowait(None)
+
+    with run_report() as report:
+        await write_ingest_jobs(parsed)
+
+    assert ingest_db.add_new_data.await_count == 3  # noqa: PLR2004
+    ingest_db.set_ingest_job_state.assert_awaited_once()
+    job, state = ingest_db.set_ingest_job_state.await_args.args
+    assert (job["id"], state) == (2, IngestJobState.FAILED)
+    (span,) = report.spans
+    assert span.error == "ValueError('broken batch')"
+    assert span.attributes["rows"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("ingest_sources")
+async def test_run_ingest_cancels_stages_if_writer_fails(mocker, ingest_db):
+    """Raise the error of a dead writer instead of blocking the parsers.
+
+    Args:
+        mocker: pytest mocker fixture.
+        ingest_db: Fixture mocking the DB manager.
+
+    """
+    mocker.patch.object(get_settings(), "INGEST_QUEUE_SIZE", 1)
+    mocker.patch.object(get_settings(), "INGEST_WRITERS", 1)
+    ingest_db.add_new_data_batch.side_effect = ValueError("broken batch")
+    ingest_db.add_new_data.side_effect = ValueError("broken")
+
+    async def set_ingest_job_state(_, state, **__: str) -> bool:
+        if state is IngestJobState.FAILED:
+            message = "DB is down"
+            raise ConnectionError(message)
+        return True
+
+    ingest_db.set_ingest_job_state.side_effect = set_ingest_job_state
+
+    async with timeout(5):
+        with pytest.raises(ExceptionGroup) as error:
+            await run_ingest()
+    assert error.group_contains(ConnectionError)
+
+
+@pytest.mark.usefixtures("ingest_db", "ingest_sources")
+async def test_run_ingest_cancels_stages_if_discovery_fails(mocker):
+    """Raise the error of the discovery and cancel the other stages.
+
+    Args:
+        mocker: pytest mocker fixture.
+
+    """
+    mocker.patch(
+        "fifth_parser.ingest.get_page_links",
+        mocker.AsyncMock(side_effect=ConnectionError("site is down")),
+    )
+
+    async with timeout(5):
+        with pytest.raises(ExceptionGroup) as error:
+            await run_ingest()
+    assert error.group_contains(ConnectionError)
@@ -0,0 +1,60 @@
+"""Test instrumentation of the ingest pipeline stages."""
+
+import json
+
+import pytest
+
+from fifth_parser.instrumentation import IngestStage, run_report, stage
+
+
+def test_stage_records_spans_into_run_log(tmp_path):
+    """Test that stages are recorded into the report and the JSONL log.
+
+    Args:
+        tmp_path: pytest fixture with a temporary directory.
+
+    """
+    log_path = tmp_path / "run.jsonl"
+    with run_report(log_path) as report:
+        with stage(IngestStage.FILE_DOWNLOAD, "file1.xls") as span:
+            span["bytes"] = 1024
+        with stage(IngestStage.DB_INSERT, "file1.xls") as span:
+            span["rows"] = 5
+
+    assert [span.name for span in report.spans] == [
+        IngestStage.FILE_DOWNLOAD,
+        IngestStage.DB_INSERT,
+    ]
+    records = [
+        json.loads(line)
+        for line in log_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(records) == len(report.spans)
+    assert records[0]["trace_id"] == report.run_id
+    assert records[0]["attributes"] == {"bulletin": "file1.xls", "bytes": 1024}
+    assert records[1]["attributes"]["rows"] == 5  # noqa: PLR2004
+
+    summary = report.summary_table()
+    assert IngestStage.FILE_DOWNLOAD in summary
+    assert IngestStage.EXCEL_DECODE not in summary
+
+
+def test_stage_records_errors():
+    """Test that a failed stage is recorded with its error and re-raised."""
+    with (
+        run_report() as report,
+        pytest.raises(ValueError, match="broken"),
+        stage(IngestStage.EXCEL_DECODE, "file1.xls"),
+    ):
+        raise ValueError("broken")  # noqa: EM101
+
+    assert report.spans[0].error == "ValueError('broken')"
+
+
+def test_stage_without_run_report():
+    """Test that stages outside of a run report are not recorded."""
+    with run_report() as report:
+        pass
+    with stage(IngestStage.HTML_PARSE) as span:
+        span["rows"] = 1
+    assert report.spans == []
@@ -7,8 +7,11 @@ from typing import TYPE_CHECKING
 import pytest
 from fastapi import status
 
+from fifth_parser.api.conditional import get_dataset_generation
+from fifth_parser.api.trades.views import warm_up_dynamics_cache
 from fifth_parser.api.urls import trades
-from fifth_parser.models import SpimexTradingResults
+from fifth_parser.config import get_settings
+from fifth_parser.models import SpimexTradingResults, TradingDay
 
 pytestmark = [pytest.mark.anyio]
 
@@ -73,6 +76,53 @@ async def test_get_trading_results_oil_id(client, mixer, acceptable_dates):
         assert trade.get("oil_id") in all_tested_oils_ids
 
 
+@pytest.mark.parametrize(
+    "match_mode, oil_id, expected_oil_ids",
+    [
+        ("contains", "bc", {"ABCD", "ABCE", "XABC"}),
+        ("exact", "ABCD", {"ABCD"}),
+        ("prefix", "AB", {"ABCD", "ABCE"}),
+        ("prefix", "A%", set()),
+        ("prefix", "ab", set()),
+    ],
+)
+async def test_get_trading_results_match_mode(  # noqa: PLR0917
+    client,
+    mixer,
+    acceptable_dates,
+    match_mode,
+    oil_id,
+    expected_oil_ids,
+):
+    """Test get trading results filtered by oil_id with a match mode.
+
+    :param client: pytest fixture
+    :param mixer: pytest fixture
+    :param acceptable_dates: pytest fixture
+    :param match_mode: mode of matching the filter
+    :param oil_id: oil_id filter
+    :param expected_oil_ids: oil IDs of the expected trading results
+    :returns: None
+    """
+    for tested_oil_id in ("ABCD", "ABCE", "XABC"):
+        await mixer.async_blend(
+            SpimexTradingResults,
+            date=secrets.choice(tuple(acceptable_dates())),
+            oil_id=tested_oil_id,
+        )
+    response: Response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        params={
+            "oil_id": oil_id,
+            "match_mode": match_mode,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert {
+        trade.get("oil_id") for trade in response.json().get("trades")
+    } == expected_oil_ids
+
+
 async def test_get_trading_results_delivery_type_id(
     client,
     mixer,
@@ -189,6 +239,53 @@ async def test_get_trading_results_pagination(
     assert len(second_page_response.json().get("trades")) == 1
 
 
+async def test_get_trading_results_not_modified(
+    client,
+    mixer,
+    acceptable_dates,
+):
+    """Test conditional requests with ETag of the dataset generation.
+
+    :param client: pytest fixture
+    :param mixer: pytest fixture
+    :param acceptable_dates: pytest fixture
+    :returns: None
+    """
+    first_date, second_date = tuple(acceptable_dates())[:2]
+    await mixer.async_blend(TradingDay, date=second_date, rows_count=1)
+    get_dataset_generation().invalidate()
+
+    response: Response = await client.get(
+        trades.url_path_for("get_trading_results"),
+    )
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers.get("ETag")
+    assert "max-age" in response.headers.get("Cache-Control")
+
+    not_modified_response: Response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"If-None-Match": etag},
+    )
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.content == b""
+
+    other_query_response: Response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        params={"page": 2},
+        headers={"If-None-Match": etag},
+    )
+    assert other_query_response.status_code == status.HTTP_200_OK
+
+    await mixer.async_blend(TradingDay, date=first_date, rows_count=1)
+    get_dataset_generation().invalidate()
+    modified_response: Response = await client.get(
+        trades.url_path_for("get_trading_results"),
+        headers={"If-None-Match": etag},
+    )
+    assert modified_response.status_code == status.HTTP_200_OK
+    assert modified_response.headers.get("ETag") != etag
+
+
 @pytest.mark.parametrize(
     "param, value",
     [
@@ -196,6 +293,7 @@ async def test_get_trading_results_pagination(
         ("delivery_type_id", "FG"),
         ("delivery_basis_id", "HIJKL"),
         ("page", 0),
+        ("match_mode", "suffix"),
     ],
 )
 async def test_get_trading_results_invalid_params(client, param, value):
@@ -290,6 +388,188 @@ async def test_get_dynamics_end_date(client, mixer):
     assert len(full_response.json().get("trades")) == 3  # noqa: PLR2004
 
 
+@pytest.mark.parametrize(
+    "bucket, expected_buckets",
+    [
+        ("day", ["2024-01-01", "2024-01-02", "2024-01-08"]),
+        ("week", ["2024-01-01", "2024-01-08"]),
+        ("month", ["2024-01-01"]),
+    ],
+)
+async def test_get_dynamics_series(client, mixer, bucket, expected_buckets):
+    """Test get dynamics aggregated into day, week and month buckets.
+
+    :param client: pytest fixture
+    :param mixer: pytest fixture
+    :param bucket: size of the time buckets
+    :param expected_buckets: expected start dates of the buckets
+    :returns: None
+    """
+    volumes = (10, 20, 40)
+    for trade_date, volume in zip(
+        (date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 8)),
+        volumes,
+        strict=True,
+    ):
+        await mixer.async_blend(
+            SpimexTradingResults,
+            date=trade_date,
+            volume=volume,
+            oil_id="ABCD",
+        )
+    await mixer.async_blend(
+        SpimexTradingResults,
+        date=date(2024, 1, 3),
+        oil_id="EFGH",
+    )
+
+    response: Response = await client.get(
+        trades.url_path_for("get_dynamics_series"),
+        params={
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "bucket": bucket,
+            "oil_id": "ABCD",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    series = response.json().get("series")
+    assert [row.get("bucket") for row in series] == expected_buckets
+    assert sum(row.get("rows") for row in series) == len(volumes)
+    assert sum(row.get("volume_sum") for row in series) == sum(volumes)
+    assert max(row.get("volume_max") for row in series) == max(volumes)
+
+
+async def test_get_dynamics_series_invalid_bucket(client):
+    """Test get dynamics series with an unknown bucket.
+
+    :param client: pytest fixture
+    :returns: None
+    """
+    response = await client.get(
+        trades.url_path_for("get_dynamics_series"),
+        params={
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "bucket": "year",
+        },
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_get_batch_dynamics(client, mixer, redis_engine):
+    """Test batch of dynamics queries with separately cached results.
+
+    :param client: pytest fixture
+    :param mixer: pytest fixture
+    :param redis_engine: pytest fixture
+    :returns: None
+    """
+    for oil_id in ("ABCD", "ABCD", "EFGH"):
+        await mixer.async_blend(
+            SpimexTradingResults,
+            date=date(2024, 1, 1),
+            oil_id=oil_id,
+        )
+    queries = [
+        {
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-31",
+            "oil_id": oil_id,
+        }
+        for oil_id in ("ABCD", "EFGH", "IJKL", "ABCD")
+    ]
+
+    response: Response = await client.post(
+        trades.url_path_for("get_batch_dynamics"),
+        json={"queries": queries},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        len(result.get("trades")) for result in response.json().get("results")
+    ] == [2, 1, 0, 2]
+    assert len(await redis_engine.keys("*batch*")) == 3  # noqa: PLR2004
+
+    cached_response: Response = await client.post(
+        trades.url_path_for("get_batch_dynamics"),
+        json={"queries": queries[1:2]},
+    )
+    assert cached_response.json().get("results") == [
+        response.json().get("results")[1],
+    ]
+
+
+async def test_warm_up_dynamics_cache(
+    client,
+    mixer,
+    mocker,
+    acceptable_dates,
+    redis_engine,
+):
+    """Test preloading of the whole market dynamics into the batch cache.
+
+    :param client: pytest fixture
+    :param mixer: pytest fixture
+    :param mocker: pytest fixture
+    :param acceptable_dates: pytest fixture
+    :param redis_engine: pytest fixture
+    :returns: None
+    """
+    mocker.patch.object(get_settings(), "CACHE_WARMUP_PERIODS", [1, 7])
+    last_date = secrets.choice(tuple(acceptable_dates()))
+    await mixer.async_blend(SpimexTradingResults, date=last_date)
+    await mixer.async_blend(TradingDay, date=last_date, rows_count=1)
+    get_dataset_generation().invalidate()
+
+    assert await warm_up_dynamics_cache() == 2  # noqa: PLR2004
+    assert len(await redis_engine.keys("*batch*")) == 2  # noqa: PLR2004
+
+    # the preloaded result is served, rows of the same generation aren't read
+    await mixer.async_blend(SpimexTradingResults, date=last_date)
+    response: Response = await client.post(
+        trades.url_path_for("get_batch_dynamics"),
+        json={
+            "queries": [
+                {
+                    "start_date": str(last_date - timedelta(days=6)),
+                    "end_date": str(last_date),
+                },
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    (result,) = response.json().get("results")
+    assert len(result.get("trades")) == 1
+
+
+@pytest.mark.parametrize(
+    "queries",
+    [
+        [],
+        [{"start_date": "2024-01-01"}],
+        [
+            {
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-02",
+                "oil_id": "A" * 5,
+            },
+        ],
+    ],
+)
+async def test_get_batch_dynamics_invalid_queries(client, queries):
+    """Test batch of dynamics queries with invalid queries.
+
+    :param client: pytest fixture
+    :param queries: invalid queries of the batch
+    :returns: None
+    """
+    response = await client.post(
+        trades.url_path_for("get_batch_dynamics"),
+        json={"queries": queries},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.parametrize(
     "start_date, end_date, oil_id, delivery_type_id, delivery_basis_id",
     [
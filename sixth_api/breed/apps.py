@@ -6,6 +6,7 @@ application and any other configuration options as needed.
 """
 
 from django.apps import AppConfig
+from dog_api.cache import connect_cache_invalidation
 
 
 class BreedConfig(AppConfig):
@@ -17,3 +18,7 @@ class BreedConfig(AppConfig):
     """
 
     name = "breed"
+
+    def ready(self) -> None:
+        """Invalidate cached responses of the API on changes of breeds."""
+        connect_cache_invalidation(self.get_model("Breed"))
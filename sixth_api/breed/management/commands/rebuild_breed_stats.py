@@ -0,0 +1,50 @@
+"""Rebuild statistics of breeds from the dog table.
+
+Statistics are kept current by triggers on the dog table, the command is
+needed only if they could miss changes, e.g. after the dog table was
+truncated or the triggers were disabled. Writes to the dog table wait until
+the rebuild is committed, so no changes are lost meanwhile. Cached responses
+with the old statistics are invalidated after the commit.
+
+Usage:
+    python manage.py rebuild_breed_stats
+"""
+
+from breed.models import BreedStats
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from dog.models import Dog
+from dog_api.cache import invalidate_cache
+
+
+class Command(BaseCommand):
+    """Recompute statistics of all breeds."""
+
+    help = __doc__.splitlines()[0]
+
+    def handle(self, *_: object, **__: object) -> None:
+        """Replace statistics of breeds with ones aggregated from dogs."""
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # SHARE mode allows reads of dogs but blocks their writes
+                cursor.execute(
+                    f"LOCK TABLE {Dog._meta.db_table} IN SHARE MODE",  # noqa: SLF001
+                )
+            BreedStats.objects.all().delete()
+            stats: list[BreedStats] = BreedStats.objects.bulk_create(
+                BreedStats(
+                    breed_id=row["breed_id"],
+                    dog_count=row["dog_count"],
+                    sum_age=row["sum_age"],
+                )
+                for row in Dog.objects.order_by()
+                .values("breed_id")
+                .annotate(dog_count=Count("*"), sum_age=Sum("age"))
+            )
+            # statistics are read by responses of dogs and breeds, both of
+            # which depend on the version of dogs
+            invalidate_cache(Dog)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics of {len(stats)} breeds"),
+        )
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:43
+
+import django.db.models.deletion
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+# Statistics are maintained by statement level triggers, so a bulk insert,
+# update or delete of dogs changes every affected row of statistics once.
+# Transition tables of a trigger can't be shared by several events, so there
+# is a trigger per event, all of them calling the same function.
+CREATE_TRIGGERS = '''
+CREATE FUNCTION breed_stats_apply_dog_changes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO breed_breedstats AS stats (breed_id, dog_count, sum_age)
+        SELECT breed_id, count(*), sum(age)
+        FROM new_dogs
+        GROUP BY breed_id
+        ON CONFLICT (breed_id) DO UPDATE
+        SET dog_count = stats.dog_count + excluded.dog_count,
+            sum_age = stats.sum_age + excluded.sum_age;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- only dogs moved to another breed or with another age count
+        INSERT INTO breed_breedstats AS stats (breed_id, dog_count, sum_age)
+        SELECT breed_id, sum(dog_count), sum(sum_age)
+        FROM (
+            SELECT new_dogs.breed_id, 1 AS dog_count, new_dogs.age AS sum_age
+            FROM new_dogs JOIN old_dogs USING (id)
+            WHERE (new_dogs.breed_id, new_dogs.age)
+                IS DISTINCT FROM (old_dogs.breed_id, old_dogs.age)
+            UNION ALL
+            SELECT old_dogs.breed_id, -1, -old_dogs.age
+            FROM new_dogs JOIN old_dogs USING (id)
+            WHERE (new_dogs.breed_id, new_dogs.age)
+                IS DISTINCT FROM (old_dogs.breed_id, old_dogs.age)
+        ) AS changes
+        GROUP BY breed_id
+        ON CONFLICT (breed_id) DO UPDATE
+        SET dog_count = stats.dog_count + excluded.dog_count,
+            sum_age = stats.sum_age + excluded.sum_age;
+    ELSE
+        -- statistics of a deleted breed may be deleted before its dogs,
+        -- so they are only updated and never created again
+        UPDATE breed_breedstats AS stats
+        SET dog_count = stats.dog_count - deleted.dog_count,
+            sum_age = stats.sum_age - deleted.sum_age
+        FROM (
+            SELECT breed_id, count(*) AS dog_count, sum(age) AS sum_age
+            FROM old_dogs
+            GROUP BY breed_id
+        ) AS deleted
+        WHERE stats.breed_id = deleted.breed_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER breed_stats_dog_insert AFTER INSERT ON dog_dog
+REFERENCING NEW TABLE AS new_dogs
+FOR EACH STATEMENT EXECUTE FUNCTION breed_stats_apply_dog_changes();
+
+CREATE TRIGGER breed_stats_dog_update AFTER UPDATE ON dog_dog
+REFERENCING OLD TABLE AS old_dogs NEW TABLE AS new_dogs
+FOR EACH STATEMENT EXECUTE FUNCTION breed_stats_apply_dog_changes();
+
+CREATE TRIGGER breed_stats_dog_delete AFTER DELETE ON dog_dog
+REFERENCING OLD TABLE AS old_dogs
+FOR EACH STATEMENT EXECUTE FUNCTION breed_stats_apply_dog_changes();
+'''
+
+DROP_TRIGGERS = '''
+DROP TRIGGER breed_stats_dog_delete ON dog_dog;
+DROP TRIGGER breed_stats_dog_update ON dog_dog;
+DROP TRIGGER breed_stats_dog_insert ON dog_dog;
+DROP FUNCTION breed_stats_apply_dog_changes();
+'''
+
+# Triggers are created first, they lock the dog table until the migration is
+# committed, so no dogs are changed between the backfill and the triggers.
+BACKFILL_STATS = '''
+INSERT INTO breed_breedstats (breed_id, dog_count, sum_age)
+SELECT breed_id, count(*), sum(age)
+FROM dog_dog
+GROUP BY breed_id;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('breed', '0002_exchanged_fields_comments'),
+        ('dog', '0002_exchanged_fields_comments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BreedStats',
+            fields=[
+                ('breed', models.OneToOneField(db_comment='ID of the breed of the statistics', help_text='Breed statistics must belong to a valid breed ID.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='breed.breed', verbose_name='Breed')),
+                ('dog_count', models.IntegerField(db_comment='Number of dogs of the breed', default=0, help_text='Number of dogs of the breed, maintained by triggers.', verbose_name='Dog Count')),
+                ('sum_age', models.BigIntegerField(db_comment='Sum of ages of dogs of the breed', default=0, help_text='Sum of ages of dogs of the breed, maintained by triggers.', verbose_name='Sum of Ages')),
+                ('avg_age', models.GeneratedField(db_comment='Average age of dogs of the breed', db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('sum_age', models.FloatField()), '/', django.db.models.functions.comparison.NullIf('dog_count', 0)), help_text='Average age of dogs of the breed, null without dogs.', output_field=models.FloatField(), verbose_name='Average Age')),
+            ],
+            options={
+                'verbose_name': 'Breed Statistics',
+                'verbose_name_plural': 'Breed Statistics',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='breed',
+            options={'verbose_name': 'Breed', 'verbose_name_plural': 'Breeds'},
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL_STATS, migrations.RunSQL.noop),
+    ]
@@ -2,11 +2,13 @@
 
 This module contains the Breed model, which represents different dog breeds
 with attributes such as name, size, friendliness, trainability, shedding
-amount, and exercise needs.
+amount, and exercise needs, and the BreedStats model with precomputed
+statistics of dogs of every breed.
 """
 
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Cast, NullIf
 
 
 class Breed(models.Model):
@@ -105,3 +107,68 @@ class Breed(models.Model):
     def __str__(self) -> str:
         """Return the string representation of the breed."""
         return self.name
+
+
+class BreedStats(models.Model):
+    """Represent precomputed statistics of dogs of a breed.
+
+    Rows are kept current by Postgres triggers on the dog table, created in
+    the ``0003_breedstats`` migration, and can be recomputed with the
+    ``rebuild_breed_stats`` management command. Breeds without dogs may
+    have no statistics.
+
+    Attributes:
+        breed (Breed): The breed of the statistics.
+        dog_count (int): The number of dogs of the breed.
+        sum_age (int): The sum of ages of dogs of the breed.
+        avg_age (float): The average age of dogs of the breed, None if the
+            breed has no dogs.
+
+    """
+
+    class Meta:
+        """Define the Meta class for the BreedStats model.
+
+        Attributes:
+            verbose_name (str): The verbose name of the model.
+            verbose_name_plural (str): The verbose name of the model in plural.
+
+        """
+
+        verbose_name = "Breed Statistics"
+        verbose_name_plural = "Breed Statistics"
+
+    breed: Breed = models.OneToOneField(
+        Breed,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        db_comment="ID of the breed of the statistics",
+        verbose_name="Breed",
+        help_text="Breed statistics must belong to a valid breed ID.",
+    )
+    dog_count: int = models.IntegerField(
+        default=0,
+        db_comment="Number of dogs of the breed",
+        verbose_name="Dog Count",
+        help_text="Number of dogs of the breed, maintained by triggers.",
+    )
+    sum_age: int = models.BigIntegerField(
+        default=0,
+        db_comment="Sum of ages of dogs of the breed",
+        verbose_name="Sum of Ages",
+        help_text="Sum of ages of dogs of the breed, maintained by triggers.",
+    )
+    avg_age: float = models.GeneratedField(
+        expression=Cast("sum_age", models.FloatField())
+        / NullIf("dog_count", 0),
+        output_field=models.FloatField(),
+        db_persist=True,
+        db_comment="Average age of dogs of the breed",
+        verbose_name="Average Age",
+        help_text="Average age of dogs of the breed, null without dogs.",
+    )
+
+    def __str__(self) -> str:
+        """Return the string representation of the breed statistics."""
+        return f"Statistics of {self.breed_id}"
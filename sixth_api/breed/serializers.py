@@ -7,6 +7,7 @@ the Breed model instances for API responses.
 from typing import ClassVar
 
 from breed.models import Breed
+from dog_api.bulk import BulkListSerializer
 from rest_framework import serializers
 
 
@@ -21,9 +22,13 @@ class BreedSerializer(serializers.ModelSerializer):
     dog_count = serializers.IntegerField(read_only=True)
 
     class Meta:
-        """Define model and fields for serialization using 'Breed' model."""
+        """Define model and fields for serialization using 'Breed' model.
+
+        Lists of breeds are validated and written in bulk.
+        """
 
         model = Breed
+        list_serializer_class = BulkListSerializer
         fields: ClassVar[list[str]] = [
             "id",
             "name",
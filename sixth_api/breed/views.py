@@ -1,41 +1,76 @@
 """Define API views for managing breeds.
 
 This module contains the BreedViewSet for handling breed-related API
-requests.
+requests and its read-only async variant BreedAsyncView.
 """
 
+from typing import ClassVar
+
 from breed.models import Breed
 from breed.serializers import BreedSerializer
-from django.db.models import Count, OuterRef, QuerySet, Subquery
+from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
 from dog.models import Dog
+from dog_api.async_views import AsyncReadOnlyView
+from dog_api.bulk import BulkModelMixin, bulk_request_schema
+from dog_api.cache import CacheResponseMixin
+from dog_api.fast_read import FastListMixin
+from drf_spectacular.utils import extend_schema_view
 from rest_framework import viewsets
 
 
-class BreedViewSet(viewsets.ModelViewSet):
+@extend_schema_view(bulk=bulk_request_schema(BreedSerializer))
+class BreedViewSet(
+    CacheResponseMixin,
+    FastListMixin,
+    BulkModelMixin,
+    viewsets.ModelViewSet,
+):
     """Manage breeds in the API.
 
     Attributes:
         serializer_class: The serializer class for breed representation.
+        cache_models: Models cached responses depend on, dogs change dog
+            counts of breeds.
+        query_budgets: Maximum numbers of queries of actions, checked by
+            the ``check_query_budgets`` command.
 
     """
 
     serializer_class = BreedSerializer
+    cache_models = (Breed, Dog)
+    # destroy isn't budgeted, dogs of the breed are loaded in batches for
+    # their delete signals, so its queries grow with the number of dogs
+    query_budgets: ClassVar[dict[str, int]] = {
+        "list": 1,
+        "retrieve": 1,
+        "partial_update": 2,
+    }
 
     def get_queryset(self) -> QuerySet:
         """Retrieve the queryset of breeds.
 
         Returns:
             QuerySet: A queryset of breeds, annotated with the count of
-            associated dogs if the action is 'list'.
+            associated dogs from precomputed ``BreedStats`` if the action is
+            'list'.
 
         """
         if self.action == "list":
+            # breeds without dogs may have no statistics yet
             return Breed.objects.annotate(
-                dog_count=Subquery(
-                    Dog.objects.filter(breed_id=OuterRef("id"))
-                    .values("breed_id")
-                    .annotate(count=Count("*"))
-                    .values("count"),
-                ),
+                dog_count=Coalesce("stats__dog_count", 0),
             )
         return Breed.objects.all()
+
+
+class BreedAsyncView(AsyncReadOnlyView):
+    """List and retrieve breeds with the async ORM.
+
+    Attributes:
+        serializer_class: The serializer class for breed representation.
+
+    """
+
+    serializer_class = BreedSerializer
+    get_queryset = BreedViewSet.get_queryset
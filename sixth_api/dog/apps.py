@@ -6,6 +6,7 @@ configuration.
 """
 
 from django.apps import AppConfig
+from dog_api.cache import connect_cache_invalidation
 
 
 class DogConfig(AppConfig):
@@ -17,3 +18,7 @@ class DogConfig(AppConfig):
     """
 
     name = "dog"
+
+    def ready(self) -> None:
+        """Invalidate cached responses of the API on changes of dogs."""
+        connect_cache_invalidation(self.get_model("Dog"))
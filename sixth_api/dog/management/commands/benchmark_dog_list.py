@@ -0,0 +1,162 @@
+"""Benchmark queries of the dog list with and without correlated subqueries.
+
+Dogs are seeded inside a transaction which is rolled back at the end, so
+the database is left as it was. For the first and a deep page of the list,
+the command prints number of queries, their time and EXPLAIN ANALYZE plans
+of the old query, with breed average age in a correlated subquery for every
+dog, and of the current one, with breed average age joined from statistics
+maintained by triggers. Time of seeding includes the triggers.
+
+Usage:
+    python manage.py benchmark_dog_list --dogs 1000000
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Avg, F, OuterRef, QuerySet, Subquery
+from django.test.utils import CaptureQueriesContext
+from dog.models import Dog
+from rest_framework.settings import api_settings
+
+
+class Command(BaseCommand):
+    """Compare old and current queries of the dog list."""
+
+    help = __doc__.splitlines()[0]
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add options of the benchmark.
+
+        Args:
+            parser (ArgumentParser): Parser of the command arguments.
+
+        """
+        parser.add_argument("--dogs", type=int, default=1_000_000)
+        parser.add_argument("--breeds", type=int, default=200)
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=api_settings.PAGE_SIZE,
+        )
+
+    def handle(self, *_: object, **options: object) -> None:
+        """Seed dogs, run the benchmark and roll everything back.
+
+        Args:
+            **options: Options of the command.
+
+        """
+        with transaction.atomic():
+            self.seed(options["dogs"], options["breeds"])
+            pages: dict[str, int] = {
+                "first page": 0,
+                "deep page": Dog.objects.order_by("-id")
+                .values_list("id", flat=True)
+                .first()
+                - options["page_size"],
+            }
+            for page_name, after_id in pages.items():
+                page: QuerySet = (
+                    Dog.objects.select_related("breed")
+                    .filter(id__gt=after_id)
+                    .order_by("id")[: options["page_size"]]
+                )
+                self.stdout.write(self.style.MIGRATE_HEADING(page_name))
+                self.measure_old(page)
+                self.measure_current(page)
+            transaction.set_rollback(True)
+
+    def seed(self, dogs: int, breeds: int) -> None:
+        """Insert breeds and dogs with random breeds and ages.
+
+        Args:
+            dogs (int): Number of dogs to insert.
+            breeds (int): Number of breeds to insert.
+
+        """
+        start: float = perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO breed_breed (name, size, friendliness, "
+                "trainability, shedding_amount, exercise_needs) "
+                "SELECT 'benchmark breed ' || g, 'Medium', 3, 3, 3, 3 "
+                "FROM generate_series(1, %s) AS g RETURNING id",
+                [breeds],
+            )
+            breed_ids: list[int] = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                "INSERT INTO dog_dog (name, age, breed_id, gender, color, "
+                "favorite_food, favorite_toy) "
+                "SELECT 'dog ' || g, (random() * 15)::int, "
+                "(%s::bigint[])[1 + (random() * (%s - 1))::int], 'Male', "
+                "'brown', 'meat', 'ball' FROM generate_series(1, %s) AS g",
+                [breed_ids, len(breed_ids), dogs],
+            )
+            cursor.execute("ANALYZE breed_breed, breed_breedstats, dog_dog")
+        self.stdout.write(
+            f"Seeded {dogs} dogs of {breeds} breeds in "
+            f"{perf_counter() - start:.1f} s",
+        )
+
+    def measure_old(self, page: QuerySet) -> None:
+        """Measure the page with a correlated subquery for every dog.
+
+        Args:
+            page (QuerySet): Query of the page of dogs.
+
+        """
+        old_page: QuerySet = page.annotate(
+            breed_avg_age=Subquery(
+                Dog.objects.filter(breed_id=OuterRef("breed_id"))
+                .values("breed_id")
+                .annotate(avg_age=Avg("age"))
+                .values("avg_age"),
+            ),
+        )
+        with CaptureQueriesContext(connection) as context:
+            start: float = perf_counter()
+            list(old_page)
+            elapsed: float = perf_counter() - start
+        self.report("correlated subquery", context, elapsed)
+        self.stdout.write(old_page.explain(analyze=True))
+
+    def measure_current(self, page: QuerySet) -> None:
+        """Measure the page with breed average age from breed statistics.
+
+        Args:
+            page (QuerySet): Query of the page of dogs.
+
+        """
+        current_page: QuerySet = page.annotate(
+            breed_avg_age=F("breed__stats__avg_age"),
+        )
+        with CaptureQueriesContext(connection) as context:
+            start: float = perf_counter()
+            list(current_page)
+            elapsed: float = perf_counter() - start
+        self.report("breed statistics", context, elapsed)
+        self.stdout.write(current_page.explain(analyze=True))
+
+    def report(
+        self,
+        name: str,
+        context: CaptureQueriesContext,
+        elapsed: float,
+    ) -> None:
+        """Print number of queries and time of a variant.
+
+        Args:
+            name (str): Name of the variant.
+            context (CaptureQueriesContext): Captured queries of the variant.
+            elapsed (float): Wall time of the variant in seconds.
+
+        """
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: {len(context.captured_queries)} queries, "
+                f"{elapsed * 1000:.1f} ms",
+            ),
+        )
@@ -0,0 +1,250 @@
+"""Benchmark the sync WSGI and the async ASGI deployment under load.
+
+For every mode the command starts Gunicorn with ``gunicorn.conf.py`` on a
+local port, sends requests to the dog list from a growing number of
+concurrent clients and prints throughput, latency percentiles, errors and
+memory per worker. The sync mode serves ``/api/dogs/`` with sync workers,
+the async mode serves ``/api/async/dogs/`` with uvicorn workers. Response
+caching is disabled in both, so every request reaches Postgres.
+
+Usage:
+    python manage.py benchmark_server --concurrency 1 16 64 256
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter, sleep
+
+import aiohttp
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MODES: dict[str, str] = {
+    "wsgi": "/api/dogs/",
+    "asgi": "/api/async/dogs/",
+}
+
+
+def get_workers_rss(master_pid: int) -> list[int]:
+    """Read resident memory of worker processes of a Gunicorn master.
+
+    Args:
+        master_pid (int): PID of the Gunicorn master process.
+
+    Returns:
+        list[int]: Resident memory of every worker in bytes.
+
+    """
+    rss: list[int] = []
+    for status_path in Path("/proc").glob("[0-9]*/status"):
+        try:
+            fields: dict[str, str] = dict(
+                line.split(":", 1)
+                for line in status_path.read_text().splitlines()
+                if ":" in line
+            )
+        except OSError:
+            continue
+        if int(fields["PPid"]) == master_pid and "VmRSS" in fields:
+            rss.append(int(fields["VmRSS"].split()[0]) * 1024)
+    return rss
+
+
+async def fetch_status(url: str) -> int | None:
+    """Request a URL once.
+
+    Args:
+        url (str): URL of the request.
+
+    Returns:
+        int | None: HTTP status, None if the server didn't respond.
+
+    """
+    try:
+        async with (
+            aiohttp.ClientSession() as session,
+            session.get(url) as response,
+        ):
+            return response.status
+    except aiohttp.ClientError:
+        return None
+
+
+async def measure(
+    url: str,
+    concurrency: int,
+    requests: int,
+) -> tuple[float, float, float, int]:
+    """Send requests from concurrent clients.
+
+    Args:
+        url (str): URL of the requests.
+        concurrency (int): Number of concurrent clients.
+        requests (int): Number of requests of every client.
+
+    Returns:
+        tuple[float, float, float, int]: Requests per second, median and
+        99th percentile latency in milliseconds and number of errors.
+
+    """
+    latencies: list[float] = []
+    errors: int = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        nonlocal errors
+        for _ in range(requests):
+            start: float = perf_counter()
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    if response.status != 200:  # noqa: PLR2004
+                        errors += 1
+            except (aiohttp.ClientError, TimeoutError):
+                errors += 1
+            latencies.append(perf_counter() - start)
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+    ) as session:
+        start: float = perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed: float = perf_counter() - start
+    percentiles: list[float] = quantiles(latencies, n=100)
+    return (
+        len(latencies) / elapsed,
+        percentiles[49] * 1000,
+        percentiles[98] * 1000,
+        errors,
+    )
+
+
+class Command(BaseCommand):
+    """Compare sync and async deployments under concurrent load."""
+
+    help = __doc__.splitlines()[0]
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add options of the benchmark.
+
+        Args:
+            parser (ArgumentParser): Parser of the command arguments.
+
+        """
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 16, 64, 256],
+        )
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Workers of both modes, defaults of gunicorn.conf.py if "
+            "not set.",
+        )
+
+    def handle(self, *_: object, **options: object) -> None:
+        """Run the benchmark for both modes and print the results.
+
+        Args:
+            **options: Options of the command.
+
+        """
+        self.stdout.write(
+            f"{'mode':>6}{'workers':>9}{'clients':>9}{'req/s':>9}"
+            f"{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'MB/worker':>11}",
+        )
+        for mode, path in MODES.items():
+            server: subprocess.Popen = self.start_server(
+                mode,
+                options["port"],
+                options["workers"],
+            )
+            try:
+                url: str = (
+                    f"http://127.0.0.1:{options['port']}{path}"
+                    f"?page_size={options['page_size']}"
+                )
+                self.wait_for_server(url, server)
+                for concurrency in options["concurrency"]:
+                    throughput, median, p99, errors = asyncio.run(
+                        measure(url, concurrency, options["requests"]),
+                    )
+                    rss: list[int] = get_workers_rss(server.pid)
+                    self.stdout.write(
+                        f"{mode:>6}{len(rss):>9}{concurrency:>9}"
+                        f"{throughput:>9.0f}{median:>9.1f}{p99:>9.1f}"
+                        f"{errors:>8}"
+                        f"{sum(rss) / max(len(rss), 1) / 2**20:>11.1f}",
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start_server(
+        self,
+        mode: str,
+        port: int,
+        workers: int | None,
+    ) -> subprocess.Popen:
+        """Start Gunicorn in a mode without response caching.
+
+        Args:
+            mode (str): ``wsgi`` or ``asgi``.
+            port (int): Local port of the server.
+            workers (int | None): Number of workers, default if None.
+
+        Returns:
+            subprocess.Popen: Gunicorn master process.
+
+        """
+        command: list[str] = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+        ]
+        if workers:
+            command += ["--workers", str(workers)]
+        return subprocess.Popen(  # noqa: S603
+            command,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "API_SERVER": mode, "API_CACHE_TIMEOUT": "0"},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def wait_for_server(self, url: str, server: subprocess.Popen) -> None:
+        """Wait until the server responds.
+
+        Args:
+            url (str): URL to request.
+            server (subprocess.Popen): Gunicorn master process.
+
+        Raises:
+            CommandError: If the server exits or doesn't respond in time.
+
+        """
+        for _ in range(100):
+            if server.poll() is not None:
+                msg = "Gunicorn exited, run it manually to see the error."
+                raise CommandError(msg)
+            if asyncio.run(fetch_status(url)) == 200:  # noqa: PLR2004
+                return
+            sleep(0.2)
+        msg = "Gunicorn didn't respond in time."
+        raise CommandError(msg)
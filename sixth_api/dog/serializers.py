@@ -7,18 +7,25 @@ serializing Dog model instances to and from JSON format.
 from typing import ClassVar
 
 from dog.models import Dog
+from dog_api.bulk import BulkListSerializer, PrefetchedPrimaryKeyRelatedField
 from rest_framework import serializers
 
 
 class DogSerializer(serializers.ModelSerializer):
     """Serialize Dog model instances.
 
+    Lists of dogs are validated and written in bulk, with breeds of all
+    dogs looked up with a single query.
+
     Attributes:
         breed_avg_age (float): Average age of the breed, read-only.
         breed_count (int): Count of dogs of the breed, read-only.
+        serializer_related_field (type): Field class of the breed.
 
     """
 
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     breed_avg_age = serializers.FloatField(read_only=True)
     breed_count = serializers.IntegerField(read_only=True)
 
@@ -28,9 +35,11 @@ class DogSerializer(serializers.ModelSerializer):
         Fields:
             model (Dog): The model to serialize.
             fields (list[str]): List of fields to include in serialization.
+            list_serializer_class (type): Serializer of lists of dogs.
         """
 
         model = Dog
+        list_serializer_class = BulkListSerializer
         fields: ClassVar[list[str]] = [
             "id",
             "name",
@@ -1,50 +1,68 @@
 """Handle API views for Dog objects.
 
 This module provides the DogViewSet class to manage dog-related
-operations, including listing and retrieving dog instances.
+operations, including listing and retrieving dog instances, and its
+read-only async variant DogAsyncView.
 """
 
-from django.db.models import Avg, Count, OuterRef, QuerySet, Subquery
+from typing import ClassVar
+
+from django.db.models import F, QuerySet
 from dog.models import Dog
 from dog.serializers import DogSerializer
+from dog_api.async_views import AsyncReadOnlyView
+from dog_api.bulk import BulkModelMixin, bulk_request_schema
+from dog_api.cache import CacheResponseMixin
+from dog_api.fast_read import FastListMixin
+from drf_spectacular.utils import extend_schema_view
 from rest_framework import viewsets
 
 
-class DogViewSet(viewsets.ModelViewSet):
+@extend_schema_view(bulk=bulk_request_schema(DogSerializer))
+class DogViewSet(
+    CacheResponseMixin,
+    FastListMixin,
+    BulkModelMixin,
+    viewsets.ModelViewSet,
+):
     """Manage CRUD operations for Dog instances.
 
     Attributes:
         serializer_class: The serializer used for Dog instances.
+        cache_models: Models cached responses depend on, breed statistics
+            change only with dogs.
+        query_budgets: Maximum numbers of queries of actions, checked by
+            the ``check_query_budgets`` command.
 
     """
 
     serializer_class = DogSerializer
+    cache_models = (Dog,)
+    query_budgets: ClassVar[dict[str, int]] = {
+        "list": 1,
+        "retrieve": 1,
+        "partial_update": 2,
+        "destroy": 2,
+    }
 
     def get_queryset(self) -> QuerySet:
         """Retrieve the queryset of Dog instances based on the action.
 
+        Breed statistics are precomputed in ``BreedStats``, so they are
+        joined instead of aggregating the dog table.
+
         Returns:
-            QuerySet: A queryset of Dog instances, annotated with
-            breed average age or breed count based on the action.
+            QuerySet: A queryset of Dog instances, annotated with breed
+            average age on list or breed count on retrieve.
 
         """
         if self.action == "list":
             queryset = Dog.objects.annotate(
-                breed_avg_age=Subquery(
-                    Dog.objects.filter(breed_id=OuterRef("breed_id"))
-                    .values("breed_id")
-                    .annotate(avg_age=Avg("age"))
-                    .values("avg_age"),
-                ),
+                breed_avg_age=F("breed__stats__avg_age"),
             )
         elif self.action == "retrieve":
             queryset = Dog.objects.annotate(
-                breed_count=Subquery(
-                    Dog.objects.filter(breed_id=OuterRef("breed_id"))
-                    .values("breed_id")
-                    .annotate(count=Count("*"))
-                    .values("count"),
-                ),
+                breed_count=F("breed__stats__dog_count"),
             )
         else:
             queryset = Dog.objects.all()
@@ -52,3 +70,15 @@ class DogViewSet(viewsets.ModelViewSet):
         # because of the breed name in the serializer, we don`t want to make
         # another query in the breed table there just for a name
         return queryset.select_related("breed")
+
+
+class DogAsyncView(AsyncReadOnlyView):
+    """List and retrieve Dog instances with the async ORM.
+
+    Attributes:
+        serializer_class: The serializer used for Dog instances.
+
+    """
+
+    serializer_class = DogSerializer
+    get_queryset = DogViewSet.get_queryset
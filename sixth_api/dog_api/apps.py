@@ -0,0 +1,25 @@
+"""Configure the dog_api project as a Django application.
+
+This module defines the configuration of the project package, which sets up
+logging of database queries for the whole API.
+"""
+
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from dog_api.log import install_query_logging, is_query_logging_enabled
+
+
+class DogApiConfig(AppConfig):
+    """Configure the dog_api application.
+
+    Attributes:
+        name (str): The name of the application, set to "dog_api".
+
+    """
+
+    name = "dog_api"
+
+    def ready(self) -> None:
+        """Log sampled and slow queries of every connection, if enabled."""
+        if is_query_logging_enabled():
+            connection_created.connect(install_query_logging)
@@ -0,0 +1,134 @@
+"""Serve read-only variants of viewsets with the async ORM.
+
+Under the ASGI server (``API_SERVER=asgi`` in ``gunicorn.conf.py``), these
+views wait for Postgres with ``aget`` and ``async for`` without blocking the
+event loop of a worker, while sync viewsets run one at a time in the thread
+the worker keeps for sync code. Lists are paginated by the primary key with
+the ``after`` and ``page_size`` query parameters.
+"""
+
+from collections.abc import Callable
+from typing import ClassVar
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Model, QuerySet
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
+
+
+class AsyncReadOnlyView(View):
+    """Return a page of objects or a single object with the async ORM.
+
+    Subclasses reuse ``get_queryset`` of their viewset, which can depend on
+    ``action``, set to ``list`` or ``retrieve`` before it's called.
+
+    Attributes:
+        serializer_class (type[serializers.Serializer]): Serializer of the
+            objects.
+        get_queryset (Callable[..., QuerySet]): Returns the queryset of the
+            action, usually ``get_queryset`` of the viewset.
+        http_method_names (list[str]): Only reads are supported.
+        action (str): Action of the request, ``list`` or ``retrieve``.
+
+    """
+
+    serializer_class: type[serializers.Serializer]
+    get_queryset: Callable[..., QuerySet]
+    http_method_names: ClassVar[list[str]] = ["get", "head", "options"]
+    action: str = "list"
+
+    async def get(
+        self,
+        request: HttpRequest,
+        pk: int | None = None,
+    ) -> JsonResponse:
+        """Return the object with the primary key, or a page of objects.
+
+        Args:
+            request (HttpRequest): Request of the object or the list.
+            pk (int | None): Primary key of the object, None for the list.
+
+        Returns:
+            JsonResponse: Serialized object or page of objects.
+
+        """
+        if pk is not None:
+            return await self.retrieve(pk)
+        return await self.list(request)
+
+    async def retrieve(self, pk: int) -> JsonResponse:
+        """Return the object with the primary key.
+
+        Args:
+            pk (int): Primary key of the object.
+
+        Returns:
+            JsonResponse: Serialized object, or 404 if it doesn't exist.
+
+        """
+        self.action = "retrieve"
+        queryset: QuerySet = self.get_queryset()
+        try:
+            obj: Model = await queryset.aget(pk=pk)
+        except ObjectDoesNotExist:
+            return JsonResponse(
+                {
+                    "detail": (
+                        f"No {queryset.model._meta.object_name} "  # noqa: SLF001
+                        "matches the given query."
+                    ),
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return JsonResponse(self.serializer_class(obj).data)
+
+    async def list(self, request: HttpRequest) -> JsonResponse:
+        """Return a page of objects after the ``after`` primary key.
+
+        Args:
+            request (HttpRequest): Request with pagination query parameters.
+
+        Returns:
+            JsonResponse: Link to the next page and objects of the page, or
+            404 if ``after`` isn't a primary key.
+
+        """
+        self.action = "list"
+        try:
+            after: int = int(request.GET.get("after", "0"))
+        except ValueError:
+            return JsonResponse(
+                {"detail": "Invalid cursor"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            page_size: int = int(request.GET["page_size"])
+        except (KeyError, ValueError):
+            page_size = api_settings.PAGE_SIZE
+        if page_size <= 0:
+            page_size = api_settings.PAGE_SIZE
+        page_size = min(page_size, settings.MAX_PAGE_SIZE)
+        # one more object tells whether there is a next page
+        objects: list[Model] = [
+            obj
+            async for obj in self.get_queryset()
+            .filter(pk__gt=after)
+            .order_by("pk")[: page_size + 1]
+        ]
+        next_url: str | None = None
+        if len(objects) > page_size:
+            objects = objects[:page_size]
+            query = request.GET.copy()
+            query["after"] = str(objects[-1].pk)
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}",
+            )
+        return JsonResponse(
+            {
+                "next": next_url,
+                "results": self.serializer_class(objects, many=True).data,
+            },
+        )
@@ -0,0 +1,616 @@
+"""Provide bulk create, update and delete of objects for viewsets.
+
+Objects are sent to the ``bulk`` action of a viewset as a JSON array, or as
+NDJSON with an object per line. Items are validated together by
+``BulkListSerializer``: related objects of all items are fetched with a
+single query per relation, and invalid items are reported without failing
+the valid ones. Valid items are written with ``bulk_create`` or
+``bulk_update`` in batches of ``BULK_BATCH_SIZE`` objects, every batch in its
+own transaction. The response lists status of every item in order of the
+request.
+"""
+
+from collections.abc import Callable, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Model, QuerySet
+from dog_api.cache import invalidate_cache
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils import json
+
+
+def to_primary_key(model: type[Model], value: object) -> object | None:
+    """Convert a value from a request to a primary key of a model.
+
+    Args:
+        model (type[Model]): Model of the primary key.
+        value (object): Value from the request, e.g. an int or a str.
+
+    Returns:
+        object | None: Primary key, or None if the value can't be one.
+
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return model._meta.pk.to_python(value)  # noqa: SLF001
+    except (TypeError, DjangoValidationError):
+        return None
+
+
+class NDJSONParser(BaseParser):
+    """Parse newline delimited JSON into a list of values.
+
+    Attributes:
+        media_type (str): Media type of the parsed requests.
+
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(
+        self,
+        stream: object,
+        media_type: str | None = None,  # noqa: ARG002
+        parser_context: dict | None = None,
+    ) -> list:
+        """Parse every non-empty line of the stream as a JSON value.
+
+        Args:
+            stream (object): Stream of the request body, read by lines.
+            media_type (str | None): Media type of the request.
+            parser_context (dict | None): Context of the request.
+
+        Returns:
+            list: Values of the lines in their order.
+
+        Raises:
+            ParseError: If a line isn't valid JSON.
+
+        """
+        encoding: str = (parser_context or {}).get(
+            "encoding",
+            settings.DEFAULT_CHARSET,
+        )
+        values: list = []
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                values.append(
+                    json.loads(
+                        line.decode(encoding),
+                        parse_constant=json.strict_constant,
+                    ),
+                )
+            except ValueError as exc:
+                msg = f"NDJSON parse error on line {number} - {exc}"
+                raise ParseError(msg) from exc
+        return values
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Look up related objects among ones prefetched for a bulk request.
+
+    Without prefetched objects, every value is looked up with a query as by
+    PrimaryKeyRelatedField.
+
+    Attributes:
+        prefetched (dict | None): Related objects by their primary keys,
+            set by ``BulkListSerializer`` while it validates a list.
+
+    """
+
+    def __init__(self, **kwargs: object) -> None:
+        """Initialize the field without prefetched objects.
+
+        Args:
+            **kwargs: Arguments of PrimaryKeyRelatedField.
+
+        """
+        super().__init__(**kwargs)
+        self.prefetched: dict | None = None
+
+    def to_internal_value(self, data: object) -> Model:
+        """Return the related object with the primary key.
+
+        Args:
+            data (object): Primary key of the related object.
+
+        Returns:
+            Model: Related object.
+
+        """
+        if self.prefetched is None:
+            return super().to_internal_value(data)
+        primary_key: object | None = to_primary_key(
+            self.get_queryset().model,
+            data,
+        )
+        if primary_key is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if primary_key not in self.prefetched:
+            self.fail("does_not_exist", pk_value=data)
+        return self.prefetched[primary_key]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Validate and write a list of objects in bulk.
+
+    Items are validated one by one, as by ListSerializer, but errors of
+    invalid items are collected in ``failures`` instead of failing the whole
+    list, so the valid items are still written. To update objects, the
+    serializer is created with the queryset of objects which can be updated
+    as ``instance``, and every item has to contain ``id`` of its object.
+
+    Attributes:
+        failures (dict[int, tuple[int, object]]): HTTP status and errors of
+            failed items by their indexes in the request.
+        indexes (list[int]): Indexes in the request of validated items.
+        objects (list[Model]): Objects to update of validated items.
+
+    """
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        """Initialize the serializer, limiting the number of items.
+
+        Args:
+            *args: Arguments of ListSerializer.
+            **kwargs: Keyword arguments of ListSerializer.
+
+        """
+        kwargs.setdefault("max_length", settings.BULK_MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+        self.failures: dict[int, tuple[int, object]] = {}
+        self.indexes: list[int] = []
+        self.objects: list[Model] = []
+
+    def prefetch_related_objects(self, data: list) -> None:
+        """Fetch related objects of all items with a query per relation.
+
+        Args:
+            data (list): Items of the request.
+
+        """
+        for name, field in self.child.fields.items():
+            if field.read_only or not isinstance(
+                field,
+                PrefetchedPrimaryKeyRelatedField,
+            ):
+                continue
+            model: type[Model] = field.get_queryset().model
+            primary_keys: set = {
+                to_primary_key(model, item.get(name))
+                for item in data
+                if isinstance(item, dict)
+            }
+            primary_keys.discard(None)
+            field.prefetched = field.get_queryset().in_bulk(primary_keys)
+
+    def fetch_objects(self, data: list) -> dict[int, Model]:
+        """Fetch objects to update with a single query.
+
+        Args:
+            data (list): Items of the request.
+
+        Returns:
+            dict[int, Model]: Objects by indexes of items with their IDs.
+
+        """
+        model: type[Model] = self.child.Meta.model
+        primary_keys: dict[int, object] = {}
+        for index, item in enumerate(data):
+            if isinstance(item, dict):
+                primary_keys[index] = to_primary_key(model, item.get("id"))
+        objects: dict = self.instance.in_bulk(
+            {key for key in primary_keys.values() if key is not None},
+        )
+        return {
+            index: objects[key]
+            for index, key in primary_keys.items()
+            if key in objects
+        }
+
+    def to_internal_value(self, data: object) -> list[dict]:
+        """Validate items, collecting errors of the invalid ones.
+
+        Args:
+            data (object): List of items of the request.
+
+        Returns:
+            list[dict]: Validated data of the valid items.
+
+        Raises:
+            ValidationError: If the data isn't a list or has too many items.
+
+        """
+        if not isinstance(data, list):
+            message: str = self.error_messages["not_a_list"].format(
+                input_type=type(data).__name__,
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                code="not_a_list",
+            )
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages["max_length"].format(
+                max_length=self.max_length,
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                code="max_length",
+            )
+        self.prefetch_related_objects(data)
+        objects: dict[int, Model] = (
+            self.fetch_objects(data) if self.instance is not None else {}
+        )
+        updated: set = set()
+        validated_data: list[dict] = []
+        for index, item in enumerate(data):
+            if self.instance is not None:
+                if index not in objects:
+                    self.failures[index] = (
+                        status.HTTP_404_NOT_FOUND,
+                        {"id": ["Not found."]},
+                    )
+                    continue
+                if objects[index].pk in updated:
+                    self.failures[index] = (
+                        status.HTTP_400_BAD_REQUEST,
+                        {"id": ["Duplicate ID in the request."]},
+                    )
+                    continue
+                updated.add(objects[index].pk)
+                # unique validators exclude the object being updated
+                self.child.instance = objects[index]
+            try:
+                validated_data.append(self.child.run_validation(item))
+            except serializers.ValidationError as exc:
+                self.failures[index] = (
+                    status.HTTP_400_BAD_REQUEST,
+                    exc.detail,
+                )
+            else:
+                self.indexes.append(index)
+                if self.instance is not None:
+                    self.objects.append(objects[index])
+        self.child.instance = None
+        return validated_data
+
+    def write_in_batches(
+        self,
+        objects: list[Model],
+        write_batch: Callable[[list[Model]], object],
+        write_object: Callable[[Model], object],
+    ) -> None:
+        """Write objects in batches, every batch in its own transaction.
+
+        If a batch violates a constraint, e.g. a unique name is repeated in
+        the request, its objects are written one by one to find and report
+        the conflicting ones.
+
+        Args:
+            objects (list[Model]): Objects of the validated items.
+            write_batch (Callable[[list[Model]], object]): Writes a batch.
+            write_object (Callable[[Model], object]): Writes a single object.
+
+        """
+        batch_size: int = settings.BULK_BATCH_SIZE
+        for start in range(0, len(objects), batch_size):
+            batch: list[Model] = objects[start : start + batch_size]
+            try:
+                with transaction.atomic():
+                    write_batch(batch)
+            except IntegrityError:
+                for offset, obj in enumerate(batch):
+                    try:
+                        with transaction.atomic():
+                            write_object(obj)
+                    except IntegrityError:
+                        self.failures[self.indexes[start + offset]] = (
+                            status.HTTP_409_CONFLICT,
+                            {
+                                api_settings.NON_FIELD_ERRORS_KEY: [
+                                    "Conflicts with an existing object.",
+                                ],
+                            },
+                        )
+
+    def create(self, validated_data: list[dict]) -> list[Model]:
+        """Create objects of the validated items.
+
+        Args:
+            validated_data (list[dict]): Validated data of the items.
+
+        Returns:
+            list[Model]: Created objects in order of the items.
+
+        """
+        model: type[Model] = self.child.Meta.model
+        objects: list[Model] = [model(**attrs) for attrs in validated_data]
+        self.write_in_batches(
+            objects,
+            model._default_manager.bulk_create,  # noqa: SLF001
+            lambda obj: obj.save(force_insert=True),
+        )
+        # bulk_create doesn't send post_save signals
+        invalidate_cache(model)
+        return objects
+
+    def update(
+        self,
+        instance: QuerySet,  # noqa: ARG002
+        validated_data: list[dict],
+    ) -> list[Model]:
+        """Update objects of the validated items.
+
+        Args:
+            instance (QuerySet): Objects which can be updated.
+            validated_data (list[dict]): Validated data of the items.
+
+        Returns:
+            list[Model]: Updated objects in order of the items.
+
+        """
+        model: type[Model] = self.child.Meta.model
+        fields: set[str] = set()
+        for obj, attrs in zip(self.objects, validated_data, strict=True):
+            fields.update(attrs)
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+        if fields:
+            self.write_in_batches(
+                self.objects,
+                lambda batch: model._default_manager.bulk_update(  # noqa: SLF001
+                    batch,
+                    fields,
+                ),
+                lambda obj: obj.save(update_fields=fields),
+            )
+            # bulk_update doesn't send post_save signals
+            invalidate_cache(model)
+        return self.objects
+
+    def get_statuses(self, success_status: int) -> list[dict]:
+        """Return status of every item of the request after saving.
+
+        Args:
+            success_status (int): HTTP status of written items.
+
+        Returns:
+            list[dict]: Statuses in order of the items, with ID of the
+            object for written items or errors for failed ones.
+
+        """
+        statuses: dict[int, dict] = {
+            index: {"index": index, "status": code, "errors": errors}
+            for index, (code, errors) in self.failures.items()
+        }
+        for index, obj in zip(self.indexes, self.instance, strict=True):
+            statuses.setdefault(
+                index,
+                {"index": index, "status": success_status, "id": obj.pk},
+            )
+        return [statuses[index] for index in sorted(statuses)]
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """Describe status of an item of a bulk request in the schema.
+
+    Attributes:
+        index (int): Index of the item in the request.
+        status (int): HTTP status of the item.
+        id (int): ID of the written object, for successful items.
+        errors (dict): Errors of the item, for failed items.
+
+    """
+
+    index = serializers.IntegerField()
+    status = serializers.IntegerField()
+    id = serializers.IntegerField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+def bulk_response(statuses: Sequence[dict], success_status: int) -> Response:
+    """Return statuses of items of a bulk request.
+
+    Args:
+        statuses (Sequence[dict]): Status of every item of the request.
+        success_status (int): HTTP status of the response if all items
+            succeeded.
+
+    Returns:
+        Response: Statuses with the success status, or Multi-Status if some
+        items failed.
+
+    """
+    failed: bool = any("errors" in item for item in statuses)
+    return Response(
+        statuses,
+        status=status.HTTP_207_MULTI_STATUS if failed else success_status,
+    )
+
+
+def bulk_request_schema(
+    serializer_class: type[serializers.Serializer],
+) -> Callable:
+    """Declare items of the bulk action of a viewset in the schema.
+
+    Args:
+        serializer_class (type[serializers.Serializer]): Serializer of the
+            items.
+
+    Returns:
+        Callable: ``extend_schema`` of the action for ``extend_schema_view``.
+
+    """
+    return extend_schema(
+        methods=["POST", "PATCH"],
+        request=serializer_class(many=True),
+    )
+
+
+class BulkModelMixin:
+    """Add the ``bulk`` action to create, update and delete objects.
+
+    ``POST`` creates objects of a list of items, ``PATCH`` updates objects
+    of items with their ``id`` and ``DELETE`` deletes objects of a list of
+    IDs. The serializer of the viewset has to use ``BulkListSerializer`` as
+    its list serializer. Items of the action aren't known to the mixin, so
+    viewsets declare them in the schema with ``bulk_request_schema``.
+    """
+
+    @extend_schema(
+        methods=["POST"],
+        responses={
+            status.HTTP_201_CREATED: BulkStatusSerializer(many=True),
+            status.HTTP_207_MULTI_STATUS: OpenApiResponse(
+                BulkStatusSerializer(many=True),
+                description="Some items failed.",
+            ),
+        },
+    )
+    @extend_schema(
+        methods=["PATCH"],
+        responses={
+            status.HTTP_200_OK: BulkStatusSerializer(many=True),
+            status.HTTP_207_MULTI_STATUS: OpenApiResponse(
+                BulkStatusSerializer(many=True),
+                description="Some items failed.",
+            ),
+        },
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        responses={
+            status.HTTP_200_OK: BulkStatusSerializer(many=True),
+            status.HTTP_207_MULTI_STATUS: OpenApiResponse(
+                BulkStatusSerializer(many=True),
+                description="Some items failed.",
+            ),
+        },
+    )
+    @extend_schema(
+        description=(
+            "Create (POST), update (PATCH) or delete (DELETE) objects of a "
+            "JSON array or NDJSON stream, returning status of every item. "
+            "Items of DELETE are IDs of the objects."
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["post", "patch", "delete"],
+        parser_classes=[JSONParser, NDJSONParser],
+        pagination_class=None,
+    )
+    def bulk(self, request: Request) -> Response:
+        """Create, update or delete objects in bulk.
+
+        Args:
+            request (Request): Request with a list of items.
+
+        Returns:
+            Response: Status of every item of the request.
+
+        """
+        if request.method == "DELETE":
+            return self.bulk_destroy(request)
+        updating: bool = request.method == "PATCH"
+        serializer: BulkListSerializer = self.get_serializer(
+            self.get_queryset() if updating else None,
+            data=request.data,
+            many=True,
+            partial=updating,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        success_status: int = (
+            status.HTTP_200_OK if updating else status.HTTP_201_CREATED
+        )
+        return bulk_response(
+            serializer.get_statuses(success_status),
+            success_status,
+        )
+
+    def bulk_destroy(self, request: Request) -> Response:
+        """Delete objects of a list of IDs in batches.
+
+        Args:
+            request (Request): Request with a list of IDs, or of items with
+                ``id``.
+
+        Returns:
+            Response: Status of every ID of the request.
+
+        Raises:
+            ValidationError: If the data isn't a list or has too many items.
+
+        """
+        if not isinstance(request.data, list):
+            msg = "Expected a list of IDs."
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [msg]},
+            )
+        if len(request.data) > settings.BULK_MAX_ITEMS:
+            msg = f"Ensure there are no more than {settings.BULK_MAX_ITEMS}."
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [msg]},
+            )
+        queryset: QuerySet = self.get_queryset()
+        primary_keys: list = [
+            to_primary_key(
+                queryset.model,
+                item.get("id") if isinstance(item, dict) else item,
+            )
+            for item in request.data
+        ]
+        existing: set = set(
+            queryset.filter(
+                pk__in={key for key in primary_keys if key is not None},
+            ).values_list("pk", flat=True),
+        )
+        deleted: list = sorted(existing)
+        batch_size: int = settings.BULK_BATCH_SIZE
+        for start in range(0, len(deleted), batch_size):
+            with transaction.atomic():
+                queryset.filter(
+                    pk__in=deleted[start : start + batch_size],
+                ).delete()
+        statuses: list[dict] = []
+        for index, key in enumerate(primary_keys):
+            if key is None:
+                statuses.append(
+                    {
+                        "index": index,
+                        "status": status.HTTP_400_BAD_REQUEST,
+                        "errors": {"id": ["Incorrect type."]},
+                    },
+                )
+            elif key in existing:
+                existing.discard(key)
+                statuses.append(
+                    {
+                        "index": index,
+                        "status": status.HTTP_204_NO_CONTENT,
+                        "id": key,
+                    },
+                )
+            else:
+                statuses.append(
+                    {
+                        "index": index,
+                        "status": status.HTTP_404_NOT_FOUND,
+                        "errors": {"id": ["Not found."]},
+                    },
+                )
+        # a response with 204 status can't have a body with the statuses
+        return bulk_response(statuses, status.HTTP_200_OK)
@@ -0,0 +1,363 @@
+"""Cache responses of list and retrieve actions of viewsets.
+
+Responses are cached with the Django cache framework, in local memory or in
+Redis, under keys made of the viewset, the action, the URL with sorted query
+parameters and versions of models the responses depend on. A version of a
+model is bumped when its objects are saved or deleted, after the transaction
+is committed. The version is read before the response is computed, so a
+response computed during a write is cached under the old, unused version.
+Versions in Redis are shared by all workers, so their cached responses are
+never served stale and can live long. Local memory is a cache of a single
+worker, which doesn't see bumps of other workers or of management commands,
+so its responses may be stale until they expire after a short
+``API_CACHE_TIMEOUT``. Hits and misses are counted per viewset in the memory
+of a worker process, so counting them costs no round trip to the cache.
+"""
+
+from functools import partial
+from hashlib import sha256
+from os import getpid
+from threading import Lock
+from time import time_ns
+from typing import ClassVar
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+CACHE_PREFIX: str = "api"
+
+
+def get_version_key(label: str) -> str:
+    """Return the cache key of the version of a model.
+
+    Args:
+        label (str): Label of the model, e.g. ``dog.dog``.
+
+    Returns:
+        str: Key of the version.
+
+    """
+    return f"{CACHE_PREFIX}:version:{label}"
+
+
+def bump_version(label: str) -> None:
+    """Bump the version of a model, so its cached responses are unused.
+
+    Args:
+        label (str): Label of the model.
+
+    """
+    key: str = get_version_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # a new version never matches versions of cached responses, even
+        # if the version was evicted from the cache
+        cache.add(key, time_ns(), timeout=None)
+
+
+def get_versions(labels: list[str]) -> list[int]:
+    """Get current versions of models, creating missing ones.
+
+    Args:
+        labels (list[str]): Labels of the models.
+
+    Returns:
+        list[int]: Versions in order of the labels.
+
+    """
+    keys: list[str] = [get_version_key(label) for label in labels]
+    versions: dict = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate_cache(model: type[Model]) -> None:
+    """Bump the version of a model when the transaction is committed.
+
+    Inside a transaction, the version is bumped once, however many objects
+    are changed, e.g. by a bulk delete.
+
+    Args:
+        model (type[Model]): Model with changed objects.
+
+    """
+    callback: partial = partial(bump_version, model._meta.label_lower)  # noqa: SLF001
+    if connection.in_atomic_block and any(
+        isinstance(func, partial)
+        and func.func is bump_version
+        and func.args == callback.args
+        for _, func, _ in connection.run_on_commit
+    ):
+        return
+    transaction.on_commit(callback)
+
+
+def invalidate_on_change(sender: type[Model], **_: object) -> None:
+    """Invalidate cached responses on save or delete of an object.
+
+    Args:
+        sender (type[Model]): Model of the saved or deleted object.
+
+    """
+    invalidate_cache(sender)
+
+
+def connect_cache_invalidation(model: type[Model]) -> None:
+    """Invalidate cached responses depending on a model on its changes.
+
+    Writes which don't send signals, like ``bulk_create``, have to call
+    ``invalidate_cache`` themselves.
+
+    Args:
+        model (type[Model]): Model cached responses depend on.
+
+    """
+    post_save.connect(invalidate_on_change, sender=model)
+    post_delete.connect(invalidate_on_change, sender=model)
+
+
+class CacheStats:
+    """Count cache hits and misses of responses per viewset.
+
+    Counters are kept in the memory of a worker process, every worker has
+    its own ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self._lock: Lock = Lock()
+        self._viewsets: dict[str, dict[str, int]] = {}
+
+    def record(self, basename: str, *, hit: bool) -> None:
+        """Count a response of a viewset.
+
+        Args:
+            basename (str): Base name of the viewset.
+            hit (bool): Whether the response was served from the cache.
+
+        """
+        with self._lock:
+            counters: dict[str, int] = self._viewsets.setdefault(
+                basename,
+                dict.fromkeys(("hits", "misses"), 0),
+            )
+            counters["hits" if hit else "misses"] += 1
+
+    def snapshot(self, basenames: tuple[str, ...]) -> list[dict[str, object]]:
+        """Return counters of viewsets.
+
+        Args:
+            basenames (tuple[str, ...]): Base names of the viewsets.
+
+        Returns:
+            list[dict[str, object]]: Hits and misses of every viewset, in
+                order of the base names.
+
+        """
+        with self._lock:
+            return [
+                {
+                    "viewset": basename,
+                    **self._viewsets.get(
+                        basename,
+                        dict.fromkeys(("hits", "misses"), 0),
+                    ),
+                }
+                for basename in basenames
+            ]
+
+
+cache_stats: CacheStats = CacheStats()
+
+
+class CacheResponseMixin:
+    """Cache responses of list and retrieve actions of a viewset.
+
+    Cached responses have the ``X-Cache: HIT`` header, computed ones have
+    ``X-Cache: MISS``. Only successful responses are cached.
+
+    Attributes:
+        cache_models (tuple[type[Model], ...]): Models responses depend on,
+            their changes invalidate cached responses.
+
+    """
+
+    cache_models: tuple[type[Model], ...] = ()
+
+    def get_cache_key(self, request: Request) -> str:
+        """Return the key of the response to the request.
+
+        Args:
+            request (Request): Request of a cached action.
+
+        Returns:
+            str: Key with current versions of models of the viewset.
+
+        """
+        versions: list[int] = get_versions(
+            [model._meta.label_lower for model in self.cache_models],  # noqa: SLF001
+        )
+        # links of pages are absolute, so the host is a part of the key
+        url: str = (
+            f"{request.get_host()}{request.path}?"
+            f"{urlencode(sorted(request.query_params.lists()), doseq=True)}"
+        )
+        return ":".join(
+            (
+                CACHE_PREFIX,
+                self.basename,
+                self.action,
+                ".".join(map(str, versions)),
+                sha256(url.encode()).hexdigest(),
+            ),
+        )
+
+    def get_cached_response(
+        self,
+        handler: object,
+        request: Request,
+        *args: object,
+        **kwargs: object,
+    ) -> Response:
+        """Return the cached response, or compute and cache it.
+
+        Args:
+            handler (object): Action computing the response.
+            request (Request): Request of the action.
+            *args: Arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: Cached or computed response.
+
+        """
+        key: str = self.get_cache_key(request)
+        data: object = cache.get(key)
+        cache_stats.record(self.basename, hit=data is not None)
+        if data is not None:
+            response: Response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(
+        self,
+        request: Request,
+        *args: object,
+        **kwargs: object,
+    ) -> Response:
+        """Return the cached list of objects.
+
+        Args:
+            request (Request): Request of the list.
+            *args: Arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: Page of objects.
+
+        """
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(
+        self,
+        request: Request,
+        *args: object,
+        **kwargs: object,
+    ) -> Response:
+        """Return the cached object.
+
+        Args:
+            request (Request): Request of the object.
+            *args: Arguments of the action.
+            **kwargs: Keyword arguments of the action.
+
+        Returns:
+            Response: The object.
+
+        """
+        return self.get_cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+
+class CacheStatsSerializer(serializers.Serializer):
+    """Serialize hit and miss counters of a cached viewset.
+
+    Attributes:
+        viewset (str): Base name of the viewset.
+        hits (int): Number of responses served from the cache.
+        misses (int): Number of responses computed and cached.
+
+    """
+
+    viewset = serializers.CharField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+
+
+class WorkerCacheStatsSerializer(serializers.Serializer):
+    """Serialize hit and miss counters of cached viewsets of a worker.
+
+    Attributes:
+        pid (int): Process ID of the worker.
+        viewsets (list): Counters of cached viewsets.
+
+    """
+
+    pid = serializers.IntegerField()
+    viewsets = CacheStatsSerializer(many=True)
+
+
+class CacheStatsView(APIView):
+    """Show hit and miss counters of cached viewsets of the worker to admins.
+
+    Attributes:
+        permission_classes (list): Only staff users can see the counters.
+        basenames (tuple[str, ...]): Base names of cached viewsets.
+
+    """
+
+    permission_classes: ClassVar[list] = [IsAdminUser]
+    basenames: tuple[str, ...] = ()
+
+    @extend_schema(responses=WorkerCacheStatsSerializer)
+    def get(self, request: Request) -> Response:  # noqa: ARG002
+        """Return counters of every cached viewset.
+
+        Args:
+            request (Request): Request of the counters.
+
+        Returns:
+            Response: PID of the worker and hits and misses by viewsets.
+
+        """
+        return Response(
+            WorkerCacheStatsSerializer(
+                {
+                    "pid": getpid(),
+                    "viewsets": cache_stats.snapshot(self.basenames),
+                },
+            ).data,
+        )
@@ -0,0 +1,151 @@
+"""Provide logging of the API for production.
+
+Records are formatted as JSON lines and written by a background thread, so
+a request only puts records into a queue. Queries are timed by an execute
+wrapper installed on every database connection: a sample of them is logged
+to the ``dog_api.sql`` logger and the ones slower than ``SLOW_QUERY_MS`` to
+the ``dog_api.sql.slow`` logger, without Django's debug cursor, which logs
+every query only with ``DEBUG``. The wrapper is installed only if sampling
+or slow query logging is enabled, otherwise queries aren't timed at all.
+"""
+
+import atexit
+import json
+import logging
+import sys
+from collections.abc import Callable
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from math import isfinite
+from queue import SimpleQueue
+from random import random
+from time import perf_counter
+from typing import TextIO
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+# attributes of every record, the others are extra fields of a message
+RECORD_ATTRIBUTES: frozenset[str] = frozenset(
+    (*logging.makeLogRecord({}).__dict__, "message", "asctime"),
+)
+
+sql_logger: logging.Logger = logging.getLogger("dog_api.sql")
+slow_sql_logger: logging.Logger = logging.getLogger("dog_api.sql.slow")
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as JSON objects on a single line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record with its extra fields.
+
+        Args:
+            record (logging.LogRecord): Record to format.
+
+        Returns:
+            str: JSON object of the record.
+
+        """
+        data: dict[str, object] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        data.update(
+            (name, value)
+            for name, value in record.__dict__.items()
+            if name not in RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class QueueStreamHandler(QueueHandler):
+    """Write records as JSON to a stream from a background thread.
+
+    Attributes:
+        listener (QueueListener): Thread which formats and writes records.
+
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """Start the thread writing records to the stream.
+
+        Args:
+            stream (TextIO | None): Stream of records, stderr if None.
+
+        """
+        queue: SimpleQueue = SimpleQueue()
+        super().__init__(queue)
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(JSONFormatter())
+        self.listener: QueueListener = QueueListener(queue, handler)
+        self.listener.start()
+        # records left in the queue are written on exit
+        atexit.register(self.listener.stop)
+
+
+def log_query(
+    execute: Callable,
+    sql: str,
+    params: object,
+    many: bool,  # noqa: FBT001
+    context: dict,
+) -> object:
+    """Execute a query and log it if it's sampled or slow.
+
+    Args:
+        execute (Callable): Next wrapper or the execution of the query.
+        sql (str): SQL of the query.
+        params (object): Parameters of the query, never logged.
+        many (bool): Whether the query is executed for many parameters.
+        context (dict): Connection and cursor of the query.
+
+    Returns:
+        object: Result of the execution.
+
+    """
+    start: float = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration: float = (perf_counter() - start) * 1000
+        if duration >= settings.SLOW_QUERY_MS:
+            slow_sql_logger.warning(
+                "Slow query",
+                extra={"sql": sql, "duration_ms": round(duration, 2)},
+            )
+        elif random() < settings.SQL_LOG_SAMPLE_RATE:  # noqa: S311
+            sql_logger.info(
+                "Query",
+                extra={"sql": sql, "duration_ms": round(duration, 2)},
+            )
+
+
+def is_query_logging_enabled() -> bool:
+    """Check whether sampled or slow queries are logged.
+
+    Returns:
+        bool: True if ``SQL_LOG_SAMPLE_RATE`` is above zero or
+            ``SLOW_QUERY_MS`` is set.
+
+    """
+    return settings.SQL_LOG_SAMPLE_RATE > 0 or isfinite(settings.SLOW_QUERY_MS)
+
+
+def install_query_logging(
+    connection: BaseDatabaseWrapper,
+    **_: object,
+) -> None:
+    """Install the query logging wrapper on a new database connection.
+
+    Args:
+        connection (BaseDatabaseWrapper): Connection which was created.
+
+    """
+    if log_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_query)
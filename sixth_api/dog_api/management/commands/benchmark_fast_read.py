@@ -0,0 +1,127 @@
+"""Benchmark rows per second of lists read by serializers and from values.
+
+For every viewset registered in the API router, the command walks pages of
+its list through the whole request path in this process, once with
+``FAST_READ`` disabled, serializing model instances and rendering with the
+json module, and once with it enabled, mapping ``values()`` rows and
+rendering with orjson. The response cache is disabled, so every page is
+read from Postgres. A single process is a single sync worker, so rows per
+second are per worker. Time of queries is shown separately, as the rest
+is the CPU the read path costs. The command fails if both paths don't
+render the same bytes.
+
+Usage:
+    python manage.py benchmark_fast_read --rows 100000 --page-size 1000
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from dog_api.queries import QueryInspector
+from dog_api.urls import router
+from rest_framework.test import APIClient
+
+# values of the FAST_READ setting by names of read paths
+READ_PATHS: dict[str, bool] = {"serializer": False, "values": True}
+
+
+class Command(BaseCommand):
+    """Compare read paths of lists of registered viewsets."""
+
+    help = __doc__.splitlines()[0]
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add options of the benchmark.
+
+        Args:
+            parser (ArgumentParser): Parser of the command arguments.
+
+        """
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=settings.MAX_PAGE_SIZE,
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *_: object, **options: object) -> None:
+        """Run the benchmark for every viewset and print the results.
+
+        Args:
+            **options: Options of the command.
+
+        Raises:
+            CommandError: If the read paths render different responses.
+
+        """
+        self.stdout.write(
+            f"{'viewset':<10}{'path':>12}{'rows':>9}{'pages':>7}"
+            f"{'db ms':>9}{'total ms':>10}{'rows/s':>10}",
+        )
+        with override_settings(API_CACHE_TIMEOUT=0):
+            for prefix, _viewset, basename in router.registry:
+                url: str = f"/api/{prefix}/?page_size={options['page_size']}"
+                bodies: dict[str, bytes] = {}
+                for name, fast_read in READ_PATHS.items():
+                    with override_settings(FAST_READ=fast_read):
+                        # the best run has the least noise of other processes
+                        rows, pages, db_time, total, bodies[name] = min(
+                            (
+                                self.walk(url, options["rows"])
+                                for _ in range(options["repeat"])
+                            ),
+                            key=lambda result: result[3],
+                        )
+                    self.stdout.write(
+                        f"{basename:<10}{name:>12}{rows:>9}{pages:>7}"
+                        f"{db_time:>9.0f}{total:>10.0f}"
+                        f"{rows / total * 1000:>10.0f}",
+                    )
+                if len(set(bodies.values())) > 1:
+                    msg = f"Read paths of {basename} render different pages."
+                    raise CommandError(msg)
+
+    def walk(
+        self,
+        url: str,
+        limit: int,
+    ) -> tuple[int, int, float, float, bytes]:
+        """Request pages of a list until ``limit`` rows are read.
+
+        Args:
+            url (str): URL of the first page.
+            limit (int): Number of rows to read at least, if there are.
+
+        Returns:
+            tuple[int, int, float, float, bytes]: Number of rows and pages,
+            time of queries and of requests in milliseconds and the body of
+            the first page.
+
+        """
+        client = APIClient()
+        rows: int = 0
+        pages: int = 0
+        total: float = 0.0
+        first_page: bytes = b""
+        inspector = QueryInspector()
+        path: str | None = url
+        while path and rows < limit:
+            start: float = perf_counter()
+            with connection.execute_wrapper(inspector):
+                response = client.get(path)
+            total += (perf_counter() - start) * 1000
+            if response.status_code != 200:  # noqa: PLR2004
+                msg = f"{path} failed with {response.status_code}."
+                raise CommandError(msg)
+            first_page = first_page or response.content
+            # parsing of the page by the client isn't timed
+            data: dict = response.json()
+            rows += len(data["results"])
+            pages += 1
+            path = data["next"]
+        return rows, pages, inspector.duration, total, first_page
@@ -0,0 +1,116 @@
+"""Check numbers of queries of actions of viewsets against their budgets.
+
+Every viewset registered in the API router declares the maximum number of
+queries of its actions in ``query_budgets``. The command sends a request of
+every action through the whole middleware stack with the response cache
+disabled, on the first object of the viewset, inside a transaction which is
+rolled back, so writes and deletes leave the database as it was. It fails if
+any action runs more queries than its budget or doesn't succeed, e.g. in CI.
+
+Usage:
+    python manage.py check_query_budgets
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from dog_api.queries import QueryBudgetExceededError, assert_query_budget
+from dog_api.urls import router
+from rest_framework.test import APIClient
+
+# methods and whether the URL is of a single object, by actions
+ACTIONS: dict[str, tuple[str, bool]] = {
+    "list": ("get", False),
+    "retrieve": ("get", True),
+    "partial_update": ("patch", True),
+    "destroy": ("delete", True),
+}
+
+
+class Command(BaseCommand):
+    """Fail if an action of a viewset exceeds its query budget."""
+
+    help = __doc__.splitlines()[0]
+
+    def handle(self, *_: object, **__: object) -> None:
+        """Check every budgeted action of every registered viewset.
+
+        Raises:
+            CommandError: If an action exceeds its budget or fails.
+
+        """
+        failures: list[str] = []
+        self.stdout.write(f"{'action':<24}{'queries':>9}{'budget':>8}")
+        # a fresh cache with nothing stored makes every request compute
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "query-budgets",
+                },
+            },
+            API_CACHE_TIMEOUT=0,
+        ):
+            for prefix, viewset, basename in router.registry:
+                obj = viewset.serializer_class.Meta.model.objects.order_by(
+                    "pk",
+                ).first()
+                for action, budget in viewset.query_budgets.items():
+                    if ACTIONS[action][1] and obj is None:
+                        failures.append(
+                            f"{basename} has no object for {action}",
+                        )
+                        continue
+                    failure: str | None = self.check_action(
+                        f"{basename}.{action}",
+                        action,
+                        f"/api/{prefix}/{obj.pk}/"
+                        if ACTIONS[action][1]
+                        else f"/api/{prefix}/",
+                        budget,
+                    )
+                    if failure:
+                        failures.append(failure)
+        if failures:
+            raise CommandError("\n".join(failures))
+
+    def check_action(
+        self,
+        label: str,
+        action: str,
+        path: str,
+        budget: int,
+    ) -> str | None:
+        """Send a request of an action and roll back its changes.
+
+        Args:
+            label (str): Name of the action in the output.
+            action (str): Action of the viewset.
+            path (str): Path of the list or of the object.
+            budget (int): Maximum number of queries of the action.
+
+        Returns:
+            str | None: Why the check failed, None if it passed.
+
+        """
+        client = APIClient()
+        failure: str | None = None
+        with transaction.atomic():
+            try:
+                with assert_query_budget(budget, label) as inspector:
+                    response = (
+                        client.patch(path, {}, format="json")
+                        if action == "partial_update"
+                        else getattr(client, ACTIONS[action][0])(path)
+                    )
+            except QueryBudgetExceededError as error:
+                failure = str(error)
+            else:
+                if response.status_code >= 300:  # noqa: PLR2004
+                    failure = (
+                        f"{label} failed with {response.status_code}: "
+                        f"{response.content.decode()}"
+                    )
+            transaction.set_rollback(True)
+        self.stdout.write(f"{label:<24}{inspector.count:>9}{budget:>8}")
+        return failure
@@ -0,0 +1,182 @@
+"""Provide pagination for list endpoints of the API.
+
+Lists are paginated with a cursor over the primary key by default, so every
+page is a range scan of the primary key index which costs the same for the
+first and the last page. Clients which need random access can be allowed to
+use limit/offset pagination instead, by passing the ``limit`` or ``offset``
+query parameters.
+"""
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class IdCursorPagination(CursorPagination):
+    """Paginate a list with a cursor over IDs of objects.
+
+    Attributes:
+        ordering (str): Field the list is ordered by, must be unique.
+        page_size_query_param (str): Query parameter with the page size.
+        max_page_size (int): Maximum page size which can be requested.
+
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class IdLimitOffsetPagination(LimitOffsetPagination):
+    """Paginate a list ordered by IDs with limit and offset.
+
+    Attributes:
+        max_limit (int): Maximum limit which can be requested.
+
+    """
+
+    max_limit = settings.MAX_PAGE_SIZE
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list | None:
+        """Paginate the queryset ordered by IDs, so pages are stable.
+
+        Args:
+            queryset (QuerySet): Queryset to paginate.
+            request (Request): Request with pagination query parameters.
+            view (APIView | None): View which paginates the queryset.
+
+        Returns:
+            list | None: Objects of the page.
+
+        """
+        return super().paginate_queryset(
+            queryset.order_by(IdCursorPagination.ordering),
+            request,
+            view,
+        )
+
+
+class CursorPaginationWithOffsetFallback(BasePagination):
+    """Paginate with a cursor, or with limit/offset if it's requested.
+
+    Limit/offset pagination is used only if it's enabled with the
+    ``OFFSET_PAGINATION`` setting and the request has its query parameters,
+    otherwise the cursor pagination is used.
+
+    Attributes:
+        cursor_paginator (IdCursorPagination): Default paginator.
+        offset_paginator (IdLimitOffsetPagination): Fallback paginator.
+        paginator (BasePagination): Paginator chosen for the request.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize both paginators, the cursor one is used by default."""
+        self.cursor_paginator = IdCursorPagination()
+        self.offset_paginator = IdLimitOffsetPagination()
+        self.paginator = self.cursor_paginator
+
+    @property
+    def display_page_controls(self) -> bool:
+        """Whether the browsable API shows controls of the chosen paginator.
+
+        Returns:
+            bool: True if the chosen paginator has page controls to show.
+
+        """
+        return self.paginator.display_page_controls
+
+    def to_html(self) -> str:
+        """Render page controls of the chosen paginator.
+
+        Returns:
+            str: HTML of page controls for the browsable API.
+
+        """
+        return self.paginator.to_html()
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list | None:
+        """Choose the paginator for the request and paginate the queryset.
+
+        Args:
+            queryset (QuerySet): Queryset to paginate.
+            request (Request): Request with pagination query parameters.
+            view (APIView | None): View which paginates the queryset.
+
+        Returns:
+            list | None: Objects of the page.
+
+        """
+        offset_requested: bool = any(
+            parameter in request.query_params
+            for parameter in (
+                self.offset_paginator.limit_query_param,
+                self.offset_paginator.offset_query_param,
+            )
+        )
+        self.paginator = (
+            self.offset_paginator
+            if settings.OFFSET_PAGINATION and offset_requested
+            else self.cursor_paginator
+        )
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """Return the page with links to the next and previous pages.
+
+        Args:
+            data (list): Serialized objects of the page.
+
+        Returns:
+            Response: Paginated response of the chosen paginator.
+
+        """
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """Return the schema of the paginated response.
+
+        Args:
+            schema (dict): Schema of the list of objects.
+
+        Returns:
+            dict: Schema of the cursor paginated response.
+
+        """
+        return self.cursor_paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict]:
+        """Return query parameters of the pagination for the schema.
+
+        Args:
+            view (APIView): View which paginates its list.
+
+        Returns:
+            list[dict]: Query parameters of the enabled paginators.
+
+        """
+        paginators: list[BasePagination] = [self.cursor_paginator]
+        if settings.OFFSET_PAGINATION:
+            paginators.append(self.offset_paginator)
+        return [
+            parameter
+            for paginator in paginators
+            for parameter in paginator.get_schema_operation_parameters(view)
+        ]
@@ -0,0 +1,444 @@
+"""Inspect database queries of every request of the API.
+
+``QueryInspectorMiddleware`` counts and times queries of a request with an
+execute wrapper, adds them to the ``Server-Timing`` header and logs queries
+of the same shape repeated at least ``N_PLUS_ONE_THRESHOLD`` times, which
+usually means a query per object of a list. Statistics per endpoint are
+aggregated in the memory of a worker process and shown to admins by
+``QueryStatsView``. ``assert_query_budget`` checks the number of queries of
+a block of code, e.g. of an action of a viewset.
+"""
+
+import logging
+import re
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from os import getpid
+from threading import Lock
+from time import perf_counter
+from typing import ClassVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger: logging.Logger = logging.getLogger("dog_api.queries")
+
+# placeholders of a list of parameters, e.g. of an IN lookup
+PARAMETERS_LIST: re.Pattern = re.compile(r"\((?:%s, )+%s\)")
+# savepoints are repeated by design, e.g. by bulk writes of single objects
+SAVEPOINT_PREFIXES: tuple[str, ...] = (
+    "SAVEPOINT",
+    "RELEASE SAVEPOINT",
+    "ROLLBACK TO SAVEPOINT",
+)
+
+
+class QueryInspector:
+    """Count and time queries executed while it wraps a connection.
+
+    Attributes:
+        count (int): Number of executed queries.
+        duration (float): Total time of the queries in milliseconds.
+        shapes (Counter[str]): Number of queries of every shape, SQL with
+            lists of parameters collapsed.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.count: int = 0
+        self.duration: float = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: object,
+        many: bool,  # noqa: FBT001
+        context: dict,
+    ) -> object:
+        """Execute a query and count it.
+
+        Args:
+            execute (Callable): Next wrapper or the execution of the query.
+            sql (str): SQL of the query.
+            params (object): Parameters of the query.
+            many (bool): Whether the query is executed for many parameters.
+            context (dict): Connection and cursor of the query.
+
+        Returns:
+            object: Result of the execution.
+
+        """
+        start: float = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += (perf_counter() - start) * 1000
+            self.count += 1
+            self.shapes[PARAMETERS_LIST.sub("(...)", sql)] += 1
+
+    def get_repeated_shapes(self, threshold: int) -> dict[str, int]:
+        """Return shapes of queries repeated at least ``threshold`` times.
+
+        Args:
+            threshold (int): Minimum number of queries of a shape.
+
+        Returns:
+            dict[str, int]: Number of queries by their shapes.
+
+        """
+        return {
+            shape: count
+            for shape, count in self.shapes.items()
+            if count >= threshold and not shape.startswith(SAVEPOINT_PREFIXES)
+        }
+
+
+class QueryStats:
+    """Aggregate query statistics of requests per endpoint.
+
+    Statistics are kept in the memory of a worker process, every worker
+    has its own ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._lock: Lock = Lock()
+        self._endpoints: dict[str, dict[str, float]] = {}
+
+    def record(
+        self,
+        endpoint: str,
+        inspector: QueryInspector,
+        *,
+        repeated: bool,
+    ) -> None:
+        """Add queries of a request to statistics of its endpoint.
+
+        Args:
+            endpoint (str): Method and URL name of the request.
+            inspector (QueryInspector): Queries of the request.
+            repeated (bool): Whether the request repeated a query shape.
+
+        """
+        with self._lock:
+            stats: dict[str, float] = self._endpoints.setdefault(
+                endpoint,
+                dict.fromkeys(
+                    (
+                        "requests",
+                        "queries",
+                        "queries_max",
+                        "db_time",
+                        "db_time_max",
+                        "n_plus_one",
+                    ),
+                    0,
+                ),
+            )
+            stats["requests"] += 1
+            stats["queries"] += inspector.count
+            stats["queries_max"] = max(stats["queries_max"], inspector.count)
+            stats["db_time"] += inspector.duration
+            stats["db_time_max"] = max(
+                stats["db_time_max"],
+                inspector.duration,
+            )
+            stats["n_plus_one"] += repeated
+
+    def snapshot(self) -> list[dict[str, object]]:
+        """Return statistics of endpoints, the slowest ones first.
+
+        Returns:
+            list[dict[str, object]]: Statistics of every endpoint.
+
+        """
+        with self._lock:
+            endpoints: list[tuple[str, dict[str, float]]] = [
+                (endpoint, dict(stats))
+                for endpoint, stats in self._endpoints.items()
+            ]
+        return sorted(
+            (
+                {
+                    "endpoint": endpoint,
+                    "requests": stats["requests"],
+                    "queries_avg": stats["queries"] / stats["requests"],
+                    "queries_max": stats["queries_max"],
+                    "db_time_avg": stats["db_time"] / stats["requests"],
+                    "db_time_max": stats["db_time_max"],
+                    "n_plus_one": stats["n_plus_one"],
+                }
+                for endpoint, stats in endpoints
+            ),
+            key=lambda stats: stats["db_time_avg"] * stats["requests"],
+            reverse=True,
+        )
+
+
+query_stats: QueryStats = QueryStats()
+
+
+def add_wrapper(inspector: QueryInspector) -> None:
+    """Wrap queries of the connection of the current thread.
+
+    Args:
+        inspector (QueryInspector): Wrapper to add.
+
+    """
+    connection.execute_wrappers.append(inspector)
+
+
+def remove_wrapper(inspector: QueryInspector) -> None:
+    """Stop wrapping queries of the connection of the current thread.
+
+    Args:
+        inspector (QueryInspector): Wrapper to remove.
+
+    """
+    connection.execute_wrappers.remove(inspector)
+
+
+class QueryInspectorMiddleware:
+    """Count, time and report database queries of every request.
+
+    The middleware supports both sync and async requests, so async views
+    of the ASGI mode aren't moved to a thread for it.
+
+    Attributes:
+        get_response (Callable): Next middleware or the view.
+        sync_capable (bool): The middleware handles sync requests.
+        async_capable (bool): The middleware handles async requests.
+
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware in the mode of the next one.
+
+        Args:
+            get_response (Callable): Next middleware or the view.
+
+        """
+        self.get_response: Callable = get_response
+        self._async: bool = iscoroutinefunction(get_response)
+        if self._async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Handle a request, inspecting its queries.
+
+        Args:
+            request (HttpRequest): Request to handle.
+
+        Returns:
+            HttpResponse: Response with the ``Server-Timing`` header, or a
+            coroutine returning it for async requests.
+
+        """
+        if self._async:
+            return self._acall(request)
+        inspector = QueryInspector()
+        start: float = perf_counter()
+        with connection.execute_wrapper(inspector):
+            response: HttpResponse = self.get_response(request)
+        self.report(request, response, inspector, start)
+        return response
+
+    async def _acall(self, request: HttpRequest) -> HttpResponse:
+        """Handle an async request, inspecting its queries.
+
+        Args:
+            request (HttpRequest): Request to handle.
+
+        Returns:
+            HttpResponse: Response with the ``Server-Timing`` header.
+
+        """
+        inspector = QueryInspector()
+        start: float = perf_counter()
+        # the async ORM runs queries in the thread of sync code of the
+        # request, which has its own connection
+        await sync_to_async(add_wrapper)(inspector)
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            await sync_to_async(remove_wrapper)(inspector)
+        self.report(request, response, inspector, start)
+        return response
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        inspector: QueryInspector,
+        start: float,
+    ) -> None:
+        """Add the timing header, log repeated queries and record stats.
+
+        Args:
+            request (HttpRequest): Handled request.
+            response (HttpResponse): Response to the request.
+            inspector (QueryInspector): Queries of the request.
+            start (float): Time the request started at.
+
+        """
+        total: float = (perf_counter() - start) * 1000
+        timing: str = (
+            f'db;desc="{inspector.count} queries";dur={inspector.duration:.2f}'
+            f", total;dur={total:.2f}"
+        )
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        endpoint: str = (
+            f"{request.method} {request.resolver_match.view_name}"
+            if request.resolver_match
+            else f"{request.method} unresolved"
+        )
+        repeated: dict[str, int] = inspector.get_repeated_shapes(
+            settings.N_PLUS_ONE_THRESHOLD,
+        )
+        if repeated:
+            logger.warning(
+                "Repeated queries, probably N+1",
+                extra={"endpoint": endpoint, "queries": repeated},
+            )
+        query_stats.record(endpoint, inspector, repeated=bool(repeated))
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raise this exception when a block runs more queries than allowed.
+
+    The exception message includes the number of queries, the budget and
+    shapes of the queries.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        inspector: QueryInspector,
+        budget: int,
+    ) -> None:
+        """Initialize the QueryBudgetExceededError.
+
+        Args:
+            label (str): Name of the checked block, e.g. an action.
+            inspector (QueryInspector): Queries of the block.
+            budget (int): Maximum number of queries.
+
+        """
+        shapes: str = "\n".join(
+            f"{count} x {shape}"
+            for shape, count in inspector.shapes.most_common()
+        )
+        super().__init__(
+            f"{label} ran {inspector.count} queries, the budget is "
+            f"{budget}:\n{shapes}",
+        )
+
+
+@contextmanager
+def assert_query_budget(
+    budget: int,
+    label: str = "Block",
+) -> Iterator[QueryInspector]:
+    """Check that a block runs at most ``budget`` queries.
+
+    Args:
+        budget (int): Maximum number of queries.
+        label (str): Name of the block in the error message.
+
+    Yields:
+        QueryInspector: Queries of the block.
+
+    Raises:
+        QueryBudgetExceededError: If the block runs more queries.
+
+    """
+    inspector = QueryInspector()
+    with connection.execute_wrapper(inspector):
+        yield inspector
+    if inspector.count > budget:
+        raise QueryBudgetExceededError(label, inspector, budget)
+
+
+class QueryStatsSerializer(serializers.Serializer):
+    """Serialize query statistics of an endpoint.
+
+    Attributes:
+        endpoint (str): Method and URL name of the endpoint.
+        requests (int): Number of requests of the endpoint.
+        queries_avg (float): Average number of queries per request.
+        queries_max (int): Maximum number of queries of a request.
+        db_time_avg (float): Average time of queries per request in ms.
+        db_time_max (float): Maximum time of queries of a request in ms.
+        n_plus_one (int): Number of requests with repeated queries.
+
+    """
+
+    endpoint = serializers.CharField()
+    requests = serializers.IntegerField()
+    queries_avg = serializers.FloatField()
+    queries_max = serializers.IntegerField()
+    db_time_avg = serializers.FloatField()
+    db_time_max = serializers.FloatField()
+    n_plus_one = serializers.IntegerField()
+
+
+class WorkerQueryStatsSerializer(serializers.Serializer):
+    """Serialize query statistics of endpoints of a worker.
+
+    Attributes:
+        pid (int): Process ID of the worker.
+        endpoints (list): Statistics of endpoints, the slowest ones first.
+
+    """
+
+    pid = serializers.IntegerField()
+    endpoints = QueryStatsSerializer(many=True)
+
+
+class QueryStatsView(APIView):
+    """Show query statistics of endpoints of the worker to admins.
+
+    Attributes:
+        permission_classes (list): Only staff users can see statistics.
+
+    """
+
+    permission_classes: ClassVar[list] = [IsAdminUser]
+
+    @extend_schema(responses=WorkerQueryStatsSerializer)
+    def get(self, request: Request) -> Response:  # noqa: ARG002
+        """Return statistics of endpoints, the slowest ones first.
+
+        Args:
+            request (Request): Request of the statistics.
+
+        Returns:
+            Response: PID of the worker and statistics of its endpoints.
+
+        """
+        return Response(
+            WorkerQueryStatsSerializer(
+                {"pid": getpid(), "endpoints": query_stats.snapshot()},
+            ).data,
+        )
@@ -6,6 +6,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.1/topics/settings/
 """
 
+from importlib.util import find_spec
 from os import getenv
 from pathlib import Path
 
@@ -19,7 +20,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = getenv("SECRET_KEY")
 
-DEBUG = getenv("DEBUG")
+DEBUG = getenv("DEBUG", "false").lower() == "true"
 
 ALLOWED_HOSTS = ["*"]
 
@@ -32,6 +33,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "dog_api",
     "user",
     "breed",
     "dog",
@@ -68,6 +70,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "dog_api.wsgi.application"
 
+# use connections of the psycopg 3 pool of a worker instead of persistent ones
+DB_POOL = getenv("API_DB_POOL", "false").lower() == "true"
+# the ASGI server runs sync code of requests in threads of an executor, which
+# aren't closed with their connections, so persistent ones would pile up
+ASGI_SERVER = getenv("API_SERVER", "wsgi").lower() == "asgi"
+# connect through pgbouncer in transaction pooling mode, which can run every
+# transaction of a connection on another server connection
+DB_PGBOUNCER = getenv("API_DB_PGBOUNCER", "false").lower() == "true"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -76,46 +87,109 @@ DATABASES = {
         "PASSWORD": getenv("POSTGRES_PASSWORD"),
         "PORT": getenv("POSTGRES_PORT"),
         "USER": getenv("POSTGRES_USER"),
+        # connections are kept open between requests and checked before
+        # reuse, pooled connections are returned to the pool instead, and
+        # under ASGI they are closed after every request
+        "CONN_MAX_AGE": (
+            0
+            if DB_POOL or ASGI_SERVER
+            else int(getenv("API_DB_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": (
+            getenv("API_DB_CONN_HEALTH_CHECKS", "true").lower() == "true"
+        ),
+        # server-side cursors don't survive the end of a transaction
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+        "OPTIONS": {},
     },
 }
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(getenv("API_DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(getenv("API_DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(getenv("API_DB_POOL_TIMEOUT", "10")),
+    }
+if DB_PGBOUNCER and find_spec("psycopg"):
+    # psycopg 3 prepares statements executed repeatedly, which would be
+    # missing on other server connections, psycopg2 never prepares them
+    DATABASES["default"]["OPTIONS"]["prepare_threshold"] = None
+
+# "dev" echoes every query in colour with DEBUG, "prod" writes JSON lines
+# from a background thread and logs only sampled and slow queries
+LOG_PROFILE = getenv("API_LOG_PROFILE", "dev" if DEBUG else "prod").lower()
+LOG_LEVEL = getenv("API_LOG_LEVEL", "INFO").upper()
+# share of queries logged to the "dog_api.sql" logger
+SQL_LOG_SAMPLE_RATE = float(getenv("API_SQL_LOG_SAMPLE_RATE", "0"))
+# queries slower than this are logged to the "dog_api.sql.slow" logger,
+# an empty value disables it
+SLOW_QUERY_MS = float(getenv("API_SLOW_QUERY_MS", "200") or "inf")
+
+# count and time queries of every request, outermost to see all of them,
+# on by default only with the "dev" profile, operators can enable it in prod
+QUERY_INSPECTOR = (
+    getenv("API_QUERY_INSPECTOR", str(LOG_PROFILE == "dev")).lower() == "true"
+)
+# queries of one shape repeated this many times in a request are logged
+N_PLUS_ONE_THRESHOLD = int(getenv("API_N_PLUS_ONE_THRESHOLD", "5"))
+if QUERY_INSPECTOR:
+    MIDDLEWARE.insert(0, "dog_api.queries.QueryInspectorMiddleware")
 
-LOGGING = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "verbose": {
-            "format": (
-                colored("{levelname}:", "light_magenta", attrs=["bold"])
-                + " At "
-                + colored("{asctime}", "light_cyan", attrs=["underline"])
-                + " in module - "
-                + colored('"{module}"', "light_green")
-                + " with message:\n"
-                + colored('"{message}".', "light_blue", attrs=["bold"])
-            ),
-            "style": "{",
+if LOG_PROFILE == "prod":
+    LOGGING = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {
+            "queue": {
+                "()": "dog_api.log.QueueStreamHandler",
+            },
         },
-    },
-    "filters": {
-        "require_debug_true": {
-            "()": "django.utils.log.RequireDebugTrue",
+        "root": {
+            "handlers": ["queue"],
+            "level": LOG_LEVEL,
         },
-    },
-    "handlers": {
-        "console": {
-            "level": "DEBUG",
-            "filters": ["require_debug_true"],
-            "class": "logging.StreamHandler",
-            "formatter": "verbose",
+    }
+else:
+    LOGGING = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "verbose": {
+                "format": (
+                    colored("{levelname}:", "light_magenta", attrs=["bold"])
+                    + " At "
+                    + colored("{asctime}", "light_cyan", attrs=["underline"])
+                    + " in module - "
+                    + colored('"{module}"', "light_green")
+                    + " with message:\n"
+                    + colored('"{message}".', "light_blue", attrs=["bold"])
+                ),
+                "style": "{",
+            },
         },
-    },
-    "loggers": {
-        "django.db.backends": {
-            "handlers": ["console"],
-            "level": "DEBUG",
+        "filters": {
+            "require_debug_true": {
+                "()": "django.utils.log.RequireDebugTrue",
+            },
         },
-    },
-}
+        "handlers": {
+            "console": {
+                "level": "DEBUG",
+                "filters": ["require_debug_true"],
+                "class": "logging.StreamHandler",
+                "formatter": "verbose",
+            },
+        },
+        "loggers": {
+            "django.db.backends": {
+                "handlers": ["console"],
+                "level": "DEBUG",
+            },
+            "dog_api": {
+                "handlers": ["console"],
+                "level": LOG_LEVEL,
+            },
+        },
+    }
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -151,7 +225,50 @@ AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": (
+        "dog_api.pagination.CursorPaginationWithOffsetFallback"
+    ),
+    "PAGE_SIZE": int(getenv("API_PAGE_SIZE", "100")),
+    "DEFAULT_RENDERER_CLASSES": (
+        "dog_api.fast_read.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+}
+# lists are read with values() and responses rendered with orjson
+FAST_READ = getenv("API_FAST_READ", "true").lower() == "true"
+# page size which can be requested by clients at most
+MAX_PAGE_SIZE = int(getenv("API_MAX_PAGE_SIZE", "1000"))
+# allow limit/offset pagination, deep offsets are slow on large tables
+OFFSET_PAGINATION = getenv("API_OFFSET_PAGINATION", "false").lower() == "true"
+# responses of lists and objects are cached in local memory of a worker by
+# default, set API_CACHE_REDIS_URL to share the cache between workers
+CACHE_REDIS_URL = getenv("API_CACHE_REDIS_URL")
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": "dog_api",
+        }
+        if CACHE_REDIS_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {
+                "MAX_ENTRIES": int(getenv("API_CACHE_MAX_ENTRIES", "10000")),
+            },
+        }
+    ),
 }
+# responses in Redis are invalidated for all workers, so they can live long,
+# local memory of a worker isn't invalidated by writes of other workers, so
+# its timeout bounds how long they serve stale responses
+API_CACHE_TIMEOUT = int(
+    getenv("API_CACHE_TIMEOUT", "86400" if CACHE_REDIS_URL else "5"),
+)
+# objects written by a bulk request in a single transaction
+BULK_BATCH_SIZE = int(getenv("API_BULK_BATCH_SIZE", "1000"))
+# items which can be sent in a single bulk request at most
+BULK_MAX_ITEMS = int(getenv("API_BULK_MAX_ITEMS", "50000"))
 
 SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": "api/",
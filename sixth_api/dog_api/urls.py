@@ -16,10 +16,12 @@ Including another URLconf
 
 """
 
-from breed.views import BreedViewSet
+from breed.views import BreedAsyncView, BreedViewSet
 from django.contrib import admin
 from django.urls import include, path
-from dog.views import DogViewSet
+from dog.views import DogAsyncView, DogViewSet
+from dog_api.cache import CacheStatsView
+from dog_api.queries import QueryStatsView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 
@@ -29,7 +31,25 @@ router.register(r"breeds", BreedViewSet, basename="breeds")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path(
+        "api/cache/stats/",
+        CacheStatsView.as_view(basenames=("dogs", "breeds")),
+        name="cache_stats",
+    ),
+    path("api/queries/stats/", QueryStatsView.as_view(), name="query_stats"),
     path("api/", include(router.urls)),
+    path("api/async/dogs/", DogAsyncView.as_view(), name="async_dogs"),
+    path(
+        "api/async/dogs/<int:pk>/",
+        DogAsyncView.as_view(),
+        name="async_dog",
+    ),
+    path("api/async/breeds/", BreedAsyncView.as_view(), name="async_breeds"),
+    path(
+        "api/async/breeds/<int:pk>/",
+        BreedAsyncView.as_view(),
+        name="async_breed",
+    ),
     path("api/swagger/", SpectacularSwaggerView.as_view(), name="swagger"),
     path("api/download_schema/", SpectacularAPIView.as_view(), name="schema"),
 ]
@@ -1,18 +1,31 @@
 """Configure Gunicorn server settings for the application.
 
+The server runs the WSGI application with sync workers by default. With
+``API_SERVER=asgi`` it runs the ASGI application with uvicorn workers, an
+event loop per CPU, which serve the async views without a process per
+request waiting on Postgres.
+
 Attributes:
-    wsgi_app (str): The WSGI application to run.
-    accesslog (str): Access log file; '-' means stdout.
-    loglevel (str): Logging level; 'debug' for detailed logs.
+    wsgi_app (str): The WSGI or ASGI application to run.
+    worker_class (str): Sync workers for WSGI, uvicorn workers for ASGI.
+    accesslog (str | None): Access log file; '-' means stdout, disabled if
+        ``API_ACCESS_LOG`` is empty.
+    loglevel (str): Logging level, ``API_LOG_LEVEL`` or 'info'.
     bind (str): Address to bind the server; '0.0.0.0:8000' for all interfaces.
     workers (int): Number of worker processes; calculated based on CPU count.
 
 """
 
-from os import cpu_count
+from os import cpu_count, getenv
 
-wsgi_app = "dog_api.wsgi:application"
-accesslog = "-"
-loglevel = "debug"
+if getenv("API_SERVER", "wsgi").lower() == "asgi":
+    wsgi_app = "dog_api.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    workers = cpu_count()
+else:
+    wsgi_app = "dog_api.wsgi:application"
+    worker_class = "sync"
+    workers = 2 * cpu_count()
+accesslog = getenv("API_ACCESS_LOG", "-") or None
+loglevel = getenv("API_LOG_LEVEL", "info").lower()
 bind = "0.0.0.0:8000"
-workers = 2 * cpu_count()